@@ -0,0 +1,468 @@
+"""
+Pruebas de Rendimiento para el Sistema de Gestión de Biblioteca
+==============================================================
+
+Este módulo contiene mediciones de memoria y tiempo para las estructuras
+de datos y los modelos del sistema de gestión de biblioteca. A diferencia
+de pruebas_sistema.py, no valida resultados: reporta cifras para comparar
+implementaciones.
+
+Uso:
+    python benchmarks.py [nombre ...] [--rapido]
+
+Sin nombres se ejecutan todas las mediciones. La opción --rapido usa
+tamaños reducidos para una verificación rápida.
+
+Autor: [Tu nombre]
+Fecha: 2024
+Curso: Estructuras de Datos - Unidad 1
+"""
+
+import argparse
+import gc
+import heapq
+import random
+import sys
+import os
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# Agregar el directorio actual al path para importaciones
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from estructuras_datos import (Nodo, Pila, Cola, ColaPrioridad, ArregloDinamico, IndiceTrigramas,
+                              TrieSugerencias, ArbolBK, distancia_edicion, IndiceOrdenado,
+                              CatalogoIndexado)
+from modelos import (Libro, Usuario, Prestamo, ArchivoPrestamos, ValoresCompartidos,
+                     REGISTRO_ARCHIVO, formatear_id_prestamo)
+
+# Copias de los modelos antes de __slots__, con __dict__ por instancia. No heredan de
+# las clases actuales: una subclase guardaría sus atributos en los slots heredados.
+class NodoConDict:
+    """Nodo con __dict__ por instancia (representación anterior)."""
+    
+    def __init__(self, dato):
+        self.dato = dato
+        self.siguiente = None
+
+class LibroConDict:
+    """Libro con __dict__ por instancia (representación anterior)."""
+    
+    def __init__(self, isbn, titulo, autor, categoria, año_publicacion):
+        self.isbn = isbn
+        self.titulo = titulo
+        self.autor = autor
+        self.categoria = categoria
+        self.año_publicacion = año_publicacion
+        self.disponible = True
+        self.fecha_registro = datetime.now()
+
+class UsuarioConDict:
+    """Usuario con __dict__ por instancia (representación anterior)."""
+    
+    def __init__(self, id_usuario, nombre, email, telefono):
+        self.id_usuario = id_usuario
+        self.nombre = nombre
+        self.email = email
+        self.telefono = telefono
+        self.fecha_registro = datetime.now()
+        self.prestamos_activos = 0
+        self.historial_prestamos = []
+
+class PrestamoConDict:
+    """Préstamo con __dict__ por instancia (representación anterior)."""
+    
+    def __init__(self, id_prestamo, isbn_libro, id_usuario, dias_prestamo=14):
+        self.id_prestamo = id_prestamo
+        self.isbn_libro = isbn_libro
+        self.id_usuario = id_usuario
+        self.fecha_prestamo = datetime.now()
+        self.fecha_vencimiento = self.fecha_prestamo + timedelta(days=dias_prestamo)
+        self.fecha_devolucion = None
+        self.estado = "activo"
+
+class PrestamoConFechas:
+    """Préstamo con tres datetime y estado en cadena (representación anterior)."""
+    __slots__ = ('id_prestamo', 'isbn_libro', 'id_usuario', 'fecha_prestamo',
+                 'fecha_vencimiento', 'fecha_devolucion', 'estado')
+    
+    def __init__(self, id_prestamo, isbn_libro, id_usuario, dias_prestamo=14):
+        self.id_prestamo = id_prestamo
+        self.isbn_libro = isbn_libro
+        self.id_usuario = id_usuario
+        self.fecha_prestamo = datetime.now()
+        self.fecha_vencimiento = self.fecha_prestamo + timedelta(days=dias_prestamo)
+        self.fecha_devolucion = None
+        self.estado = "activo"
+    
+    def devolver(self):
+        self.fecha_devolucion = datetime.now()
+        self.estado = "devuelto"
+
+class LibroSinCompartir:
+    """Libro con su propia copia de autor y categoría (representación anterior)."""
+    __slots__ = ('isbn', 'titulo', 'autor', 'categoria', 'año_publicacion',
+                 'disponible', 'fecha_registro')
+    
+    def __init__(self, isbn, titulo, autor, categoria, año_publicacion):
+        self.isbn = isbn
+        self.titulo = titulo
+        self.autor = autor
+        self.categoria = categoria
+        self.año_publicacion = año_publicacion
+        self.disponible = True
+        self.fecha_registro = datetime.now()
+
+def medir_bytes_por_objeto(fabrica, n):
+    """
+    Mide la memoria promedio que ocupa cada objeto creado por una fábrica.
+
+    Args:
+        fabrica: Función que recibe un entero y crea un objeto
+        n: Cantidad de objetos a crear
+
+    Returns:
+        Bytes promedio por objeto (sin contar la lista que los contiene)
+    """
+    gc.collect()
+    tracemalloc.start()
+    contenedor = [None] * n
+    base, _ = tracemalloc.get_traced_memory()
+    for i in range(n):
+        contenedor[i] = fabrica(i)
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del contenedor
+    gc.collect()
+    return (actual - base) / n
+
+def benchmark_memoria_modelos(tamaños):
+    """Compara bytes por libro, usuario, préstamo y nodo con y sin __slots__."""
+    print("\n=== MEMORIA POR OBJETO (__dict__ vs __slots__) ===")
+    casos = [
+        ("Libro", LibroConDict, Libro,
+         lambda cls, i: cls(f"978-{i:09d}", f"Título {i}", "Autor", "Categoría", 2000)),
+        ("Usuario", UsuarioConDict, Usuario,
+         lambda cls, i: cls(f"U{i:03d}", f"Nombre {i}", f"u{i}@email.com", "555-0000")),
+        ("Préstamo", PrestamoConDict, Prestamo,
+         lambda cls, i: cls(f"P{i:03d}", "978-84-376-0494-7", "U001")),
+        ("Nodo", NodoConDict, Nodo,
+         lambda cls, i: cls(None)),
+    ]
+    print(f"{'Objeto':<10} {'N':>9} {'Antes (B)':>11} {'Después (B)':>12} {'Ahorro':>8}")
+    for nombre, clase_antes, clase_despues, crear in casos:
+        for n in tamaños:
+            antes = medir_bytes_por_objeto(lambda i: crear(clase_antes, i), n)
+            despues = medir_bytes_por_objeto(lambda i: crear(clase_despues, i), n)
+            ahorro = 100 * (antes - despues) / antes
+            print(f"{nombre:<10} {n:>9} {antes:>11.1f} {despues:>12.1f} {ahorro:>7.1f}%")
+    print("Nota: Libro y Usuario actuales guardan además sus claves de búsqueda normalizadas")
+    print("(clave_*), una cadena más por campo, que las copias anteriores no tienen.")
+
+def benchmark_modelos_compactos(tamaños):
+    """Compara bytes por préstamo y por libro con la representación compacta."""
+    print("\n=== MODELOS COMPACTOS (campos empaquetados y valores compartidos) ===")
+    
+    def prestamo_devuelto(cls, i):
+        prestamo = cls(f"P{i:03d}", "978-84-376-0494-7", "U001")
+        prestamo.devolver()
+        return prestamo
+    
+    valores = ValoresCompartidos()  # Tabla de un manager, común a todas las mediciones
+    
+    def libro(cls, i):
+        nuevo = cls(f"978-{i:09d}", f"Título {i}", f"Autor {i % 1000}", f"Categoría {i % 50}", 2000)
+        if cls is Libro:
+            nuevo.compartir_valores(valores)  # Como al registrarlo en BibliotecaManager
+        return nuevo
+    
+    # Autores y categorías llegan como cadenas nuevas, como al leerlas de un formulario o archivo
+    casos = [
+        ("Préstamo activo", PrestamoConFechas, Prestamo,
+         lambda cls, i: cls(f"P{i:03d}", "978-84-376-0494-7", "U001")),
+        ("Préstamo devuelto", PrestamoConFechas, Prestamo, prestamo_devuelto),
+        ("Libro", LibroSinCompartir, Libro, libro),
+    ]
+    print(f"{'Objeto':<18} {'N':>9} {'Antes (B)':>11} {'Después (B)':>12} {'Ahorro':>8}")
+    for nombre, clase_antes, clase_despues, crear in casos:
+        for n in tamaños:
+            antes = medir_bytes_por_objeto(lambda i: crear(clase_antes, i), n)
+            despues = medir_bytes_por_objeto(lambda i: crear(clase_despues, i), n)
+            ahorro = 100 * (antes - despues) / antes
+            print(f"{nombre:<18} {n:>9} {antes:>11.1f} {despues:>12.1f} {ahorro:>7.1f}%")
+    print("Nota: las cifras incluyen el ID de cada préstamo (cadena antes, número empaquetado")
+    print("después) y el título e ISBN de cada libro, propios de cada registro.")
+
+def benchmark_archivo_prestamos(tamaños):
+    """Compara bytes por préstamo devuelto: objetos en Pila y listas por usuario vs archivo columnar."""
+    print("\n=== HISTORIAL DE PRÉSTAMOS DEVUELTOS: objetos vs archivo columnar ===")
+    isbns = [f"978-{i:09d}" for i in range(10000)]
+    ids_usuario = [f"U{i:03d}" for i in range(1000)]
+    
+    print(f"{'N':>9} {'Objetos (B)':>12} {'Archivo (B)':>12} {'Reducción':>10}")
+    for n in tamaños:
+        historial = Pila()
+        por_usuario = {id_usuario: [] for id_usuario in ids_usuario}
+        def con_objetos(i):
+            prestamo = Prestamo(formatear_id_prestamo(i + 1), isbns[i % len(isbns)],
+                                ids_usuario[i % len(ids_usuario)])
+            prestamo.devolver()
+            historial.apilar(prestamo)
+            por_usuario[prestamo.id_usuario].append(prestamo)
+        
+        archivo = ArchivoPrestamos()
+        def con_archivo(i):
+            prestamo = Prestamo(formatear_id_prestamo(i + 1), isbns[i % len(isbns)],
+                                ids_usuario[i % len(ids_usuario)])
+            archivo.registrar(prestamo)
+            prestamo.devolver()
+            archivo.cerrar(prestamo)
+        
+        antes = medir_bytes_por_objeto(con_objetos, n)
+        despues = medir_bytes_por_objeto(con_archivo, n)
+        print(f"{n:>9} {antes:>12.1f} {despues:>12.1f} {antes / despues:>9.1f}x")
+    print(f"Nota: el archivo conserva en memoria hasta {ArchivoPrestamos().filas_en_memoria} filas;")
+    print(f"las anteriores ocupan {REGISTRO_ARCHIVO.size} B cada una en su segmento en disco.")
+
+def generar_titulos(n, semilla=0):
+    """Genera n títulos sintéticos de 3 a 6 palabras."""
+    generador = random.Random(semilla)
+    silabas = [consonante + vocal for consonante in "bcdfgjlmnprstvz" for vocal in "aeiou"]
+    vocabulario = ["".join(generador.choices(silabas, k=generador.randint(2, 4)))
+                   for _ in range(5000)]
+    return [" ".join(generador.choices(vocabulario, k=generador.randint(3, 6))).capitalize()
+            for _ in range(n)]
+
+def benchmark_busqueda_subcadenas(tamaños):
+    """Compara la búsqueda de subcadenas por recorrido completo y por índice de trigramas."""
+    print("\n=== BÚSQUEDA POR SUBCADENA: recorrido vs índice de trigramas ===")
+    print(f"{'N':>9} {'Indexar (s)':>12} {'Recorrido (ms)':>15} {'Índice (ms)':>12} {'Resultados':>11}")
+    for n in tamaños:
+        titulos = generar_titulos(n)
+        consultas = [titulo.split()[1].lower() for titulo in titulos[:20]]
+        
+        inicio = time.perf_counter()
+        indice = IndiceTrigramas()
+        for clave, titulo in enumerate(titulos):
+            indice.agregar(clave, titulo.lower())
+        indexar = time.perf_counter() - inicio
+        
+        inicio = time.perf_counter()
+        for consulta in consultas:
+            encontrados = [titulo for titulo in titulos if consulta in titulo.lower()]
+        recorrido = (time.perf_counter() - inicio) / len(consultas)
+        
+        inicio = time.perf_counter()
+        resultados = 0
+        for consulta in consultas:
+            resultados += len(list(indice.buscar(consulta)))
+        por_indice = (time.perf_counter() - inicio) / len(consultas)
+        print(f"{n:>9} {indexar:>12.2f} {recorrido * 1000:>15.2f} {por_indice * 1000:>12.2f} "
+              f"{resultados // len(consultas):>11}")
+
+def benchmark_sugerencias(tamaños):
+    """Compara el autocompletado por recorrido y ordenamiento contra el trie de sugerencias."""
+    print("\n=== AUTOCOMPLETADO: recorrido vs trie de sugerencias ===")
+    print(f"{'N':>9} {'Indexar (s)':>12} {'Recorrido (ms)':>15} {'Trie (µs)':>10} {'Quitar (µs)':>12}")
+    generador = random.Random(1)
+    for n in tamaños:
+        titulos = generar_titulos(n)
+        pesos = [generador.randrange(100) for _ in titulos]
+        prefijos = [titulo.split()[0][:3].lower() for titulo in titulos[:20]]
+        
+        inicio = time.perf_counter()
+        trie = TrieSugerencias()
+        for titulo, peso in zip(titulos, pesos):
+            minusculas = titulo.lower()
+            trie.agregar(titulo, {minusculas, *minusculas.split()}, peso)
+        indexar = time.perf_counter() - inicio
+        
+        inicio = time.perf_counter()
+        for prefijo in prefijos:
+            candidatos = [(-peso, titulo) for titulo, peso in zip(titulos, pesos)
+                          if any(palabra.startswith(prefijo) for palabra in titulo.lower().split())]
+            heapq.nsmallest(5, candidatos)
+        recorrido = (time.perf_counter() - inicio) / len(prefijos)
+        
+        inicio = time.perf_counter()
+        for prefijo in prefijos:
+            trie.sugerir(prefijo, 5)
+        por_trie = (time.perf_counter() - inicio) / len(prefijos)
+        
+        quitados = titulos[:1000]
+        inicio = time.perf_counter()
+        for titulo in quitados:
+            trie.quitar(titulo)
+        quitar = (time.perf_counter() - inicio) / len(quitados)
+        print(f"{n:>9} {indexar:>12.2f} {recorrido * 1000:>15.2f} {por_trie * 1e6:>10.1f} "
+              f"{quitar * 1e6:>12.1f}")
+
+def generar_autores(n, semilla=0):
+    """Genera n nombres de autor distintos: un nombre y dos apellidos sintéticos."""
+    generador = random.Random(semilla)
+    silabas = [consonante + vocal for consonante in "bcdfgjlmnprstvz" for vocal in "aeiou"]
+    nombres = ["".join(generador.choices(silabas, k=generador.randint(2, 3))) for _ in range(500)]
+    autores = {}
+    while len(autores) < n:
+        apellidos = ["".join(generador.choices(silabas, k=generador.randint(2, 4))) for _ in range(2)]
+        autores[" ".join([generador.choice(nombres), *apellidos]).title()] = None
+    return list(autores)
+
+def benchmark_busqueda_aproximada(tamaños):
+    """Compara la búsqueda con errores de escritura por recorrido completo y por árbol BK."""
+    print("\n=== BÚSQUEDA APROXIMADA: recorrido vs árbol BK ===")
+    print(f"{'Autores':>9} {'Palabras':>9} {'Indexar (s)':>12} {'Distancia':>10} "
+          f"{'Recorrido (ms)':>15} {'Árbol BK (ms)':>14} {'Resultados':>11}")
+    generador = random.Random(2)
+    for n in tamaños:
+        autores = generar_autores(n)
+        palabras = list(dict.fromkeys(palabra for autor in autores for palabra in autor.lower().split()))
+        # Consultas: un apellido existente con una letra cambiada
+        consultas = []
+        for autor in generador.sample(autores, 20):
+            apellido = autor.lower().split()[-1]
+            posicion = generador.randrange(len(apellido))
+            consultas.append(apellido[:posicion] + generador.choice("aeioubcdr") + apellido[posicion + 1:])
+        
+        inicio = time.perf_counter()
+        arbol = ArbolBK()
+        for palabra in palabras:
+            arbol.agregar(palabra)
+        indexar = time.perf_counter() - inicio
+        
+        for distancia_maxima in (1, 2):
+            inicio = time.perf_counter()
+            for consulta in consultas:
+                encontradas = [palabra for palabra in palabras
+                               if distancia_edicion(consulta, palabra, distancia_maxima) <= distancia_maxima]
+            recorrido = (time.perf_counter() - inicio) / len(consultas)
+            
+            inicio = time.perf_counter()
+            resultados = 0
+            for consulta in consultas:
+                resultados += len(arbol.buscar(consulta, distancia_maxima))
+            por_arbol = (time.perf_counter() - inicio) / len(consultas)
+            print(f"{n:>9} {len(palabras):>9} {indexar:>12.2f} {distancia_maxima:>10} "
+                  f"{recorrido * 1000:>15.2f} {por_arbol * 1000:>14.2f} {resultados // len(consultas):>11}")
+
+def benchmark_rango_años(tamaños):
+    """Compara la búsqueda por rango de años recorriendo el catálogo y con el índice ordenado."""
+    print("\n=== BÚSQUEDA POR RANGO DE AÑOS: recorrido vs índice ordenado ===")
+    print(f"{'N':>9} {'Rango':>11} {'Indexar (s)':>12} {'Recorrido (ms)':>15} {'Índice (ms)':>12} "
+          f"{'Resultados':>11}")
+    generador = random.Random(3)
+    for n in tamaños:
+        catalogo = CatalogoIndexado(lambda libro: libro.isbn)
+        for i in range(n):
+            catalogo.insertar_al_final(Libro(f"978-{i:09d}", f"Título {i}", "Autor", "Categoría",
+                                             generador.randint(1500, 2024)))
+        
+        inicio = time.perf_counter()
+        indice = IndiceOrdenado()
+        for libro in catalogo:
+            indice.agregar(libro.año_publicacion, libro.isbn)
+        indexar = time.perf_counter() - inicio
+        
+        for desde, hasta in ((1967, 1967), (1940, 1970)):
+            inicio = time.perf_counter()
+            catalogo.buscar(lambda libro: desde <= libro.año_publicacion <= hasta)
+            recorrido = time.perf_counter() - inicio
+            
+            inicio = time.perf_counter()
+            encontrados = [catalogo.obtener(isbn) for isbn in indice.rango(desde, hasta)]
+            por_indice = time.perf_counter() - inicio
+            print(f"{n:>9} {f'{desde}-{hasta}':>11} {indexar:>12.2f} {recorrido * 1000:>15.2f} "
+                  f"{por_indice * 1000:>12.2f} {len(encontrados):>11}")
+
+def benchmark_crecimiento_arreglo(tamaños):
+    """Compara tiempo, redimensionamientos y holgura del arreglo según el factor de crecimiento."""
+    print("\n=== CRECIMIENTO DEL ARREGLO DINÁMICO ===")
+    print(f"{'Factor':<10} {'N':>9} {'Tiempo (s)':>11} {'Redim.':>7} {'Capacidad/N':>12}")
+    for factor in (1.25, 1.5, 2.0, 3.0, "reservar"):
+        for n in tamaños:
+            if factor == "reservar":
+                arreglo = ArregloDinamico()
+            else:
+                arreglo = ArregloDinamico(factor_crecimiento=factor, umbral_reduccion=None)
+            redimensionamientos = 0
+            inicio = time.perf_counter()
+            if factor == "reservar":
+                arreglo.reservar(n)
+            capacidad = arreglo.capacidad
+            for i in range(n):
+                arreglo.agregar(i)
+                if arreglo.capacidad != capacidad:
+                    capacidad = arreglo.capacidad
+                    redimensionamientos += 1
+            duracion = time.perf_counter() - inicio
+            print(f"{factor!s:<10} {n:>9} {duracion:>11.3f} {redimensionamientos:>7} "
+                  f"{arreglo.capacidad / n:>12.2f}")
+
+    print(f"\n{'Reducción':<10} {'N':>9} {'Tiempo (s)':>11} {'Capacidad final':>16}")
+    for umbral in (None, 0.25):
+        for n in tamaños:
+            arreglo = ArregloDinamico(umbral_reduccion=umbral)
+            for i in range(n):
+                arreglo.agregar(i)
+            inicio = time.perf_counter()
+            # Pico de carga seguido de una depuración del 99% de los elementos
+            while arreglo.obtener_tamaño() > n // 100:
+                arreglo.eliminar(arreglo.obtener_tamaño() - 1)
+            duracion = time.perf_counter() - inicio
+            print(f"{umbral!s:<10} {n:>9} {duracion:>11.3f} {arreglo.capacidad:>16}")
+
+def benchmark_cola_prioridad(tamaños):
+    """Compara encolar y desencolar n solicitudes en Cola (FIFO) y ColaPrioridad."""
+    print("\n=== COLA DE SOLICITUDES: Cola vs ColaPrioridad ===")
+    print(f"{'Estructura':<15} {'N':>9} {'Encolar (s)':>12} {'Desencolar (s)':>15}")
+    generador = random.Random(0)
+    for n in tamaños:
+        prioridades = [generador.randrange(3) for _ in range(n)]
+        for nombre in ("Cola", "ColaPrioridad"):
+            cola = Cola() if nombre == "Cola" else ColaPrioridad()
+            inicio = time.perf_counter()
+            if nombre == "Cola":
+                for i in range(n):
+                    cola.encolar(i)
+            else:
+                for i, prioridad in enumerate(prioridades):
+                    cola.encolar(i, prioridad)
+            medio = time.perf_counter()
+            while not cola.esta_vacia():
+                cola.desencolar()
+            fin = time.perf_counter()
+            print(f"{nombre:<15} {n:>9} {medio - inicio:>12.3f} {fin - medio:>15.3f}")
+    print("Nota: Cola solo atiende en orden de llegada; respetar prioridades con ella")
+    print("requiere recorrerla completa en cada atención (O(n) por solicitud).")
+
+BENCHMARKS = {
+    'memoria': benchmark_memoria_modelos,
+    'compacto': benchmark_modelos_compactos,
+    'archivo': benchmark_archivo_prestamos,
+    'busqueda': benchmark_busqueda_subcadenas,
+    'sugerencias': benchmark_sugerencias,
+    'aproximada': benchmark_busqueda_aproximada,
+    'rango': benchmark_rango_años,
+    'crecimiento': benchmark_crecimiento_arreglo,
+    'prioridad': benchmark_cola_prioridad,
+}
+
+def main():
+    """Función principal para ejecutar las mediciones."""
+    parser = argparse.ArgumentParser(description="Mediciones de rendimiento del sistema de biblioteca")
+    parser.add_argument('nombres', nargs='*',
+                        help=f"Mediciones a ejecutar: {', '.join(BENCHMARKS)} (por defecto todas)")
+    parser.add_argument('--rapido', action='store_true',
+                        help='Usar tamaños reducidos')
+    args = parser.parse_args()
+    desconocidos = [nombre for nombre in args.nombres if nombre not in BENCHMARKS]
+    if desconocidos:
+        parser.error(f"Mediciones desconocidas: {', '.join(desconocidos)}")
+
+    tamaños = (10**3, 10**4) if args.rapido else (10**5, 10**6)
+    for nombre in args.nombres or BENCHMARKS:
+        BENCHMARKS[nombre](tamaños)
+
+if __name__ == "__main__":
+    main()
@@ -5,15 +5,34 @@ Estructuras de Datos Lineales para Sistema de Gestión de Biblioteca
 Este módulo contiene las implementaciones de las estructuras de datos lineales
 utilizadas en el sistema de gestión de biblioteca:
 - Lista enlazada
+- Catálogo indexado (lista enlazada con índice hash por clave)
 - Pila (Stack)
+- Pila acotada (Stack con desborde a disco)
 - Cola (Queue)
+- Cola circular (Queue sobre arreglo con operaciones por lotes)
+- Montículo mínimo y cola de prioridad
+- Rueda de temporización jerárquica (tareas programadas en el tiempo)
+- Índice de trigramas (búsqueda de subcadenas)
+- Árbol BK (búsqueda aproximada por distancia de edición)
+- Trie de sugerencias (autocompletado por prefijo)
+- Índice ordenado (consultas por rango de clave)
 - Arreglo dinámico
+- Arreglo indexado (arreglo dinámico con índices hash por campo)
 
 Autor: [Tu nombre]
 Fecha: 2024
 Curso: Estructuras de Datos - Unidad 1
 """
 
+import heapq
+import os
+import struct
+import sys
+import tempfile
+import time
+from bisect import bisect_left, bisect_right
+from itertools import islice
+
 class Nodo:
     """
     Clase que representa un nodo para estructuras enlazadas.
@@ -22,20 +41,37 @@ class Nodo:
         dato: Información almacenada en el nodo
         siguiente: Referencia al siguiente nodo
     """
+    __slots__ = ('dato', 'siguiente')
+    
     def __init__(self, dato):
         self.dato = dato
         self.siguiente = None
 
+class NodoDoble(Nodo):
+    """
+    Nodo con referencia adicional al nodo anterior.
+    
+    Atributos:
+        anterior: Referencia al nodo anterior
+    """
+    __slots__ = ('anterior',)
+    
+    def __init__(self, dato):
+        super().__init__(dato)
+        self.anterior = None
+
 class ListaEnlazada:
     """
     Implementación de una lista enlazada simple.
     
     Esta estructura se utiliza para almacenar la información de libros
-    permitiendo inserciones y eliminaciones eficientes.
+    permitiendo inserciones y eliminaciones eficientes. Mantiene una
+    referencia al último nodo para insertar al final en O(1).
     """
     
     def __init__(self):
         self.cabeza = None
+        self.final = None
         self.tamaño = 0
     
     def insertar_al_inicio(self, dato):
@@ -43,6 +79,8 @@ class ListaEnlazada:
         nuevo_nodo = Nodo(dato)
         nuevo_nodo.siguiente = self.cabeza
         self.cabeza = nuevo_nodo
+        if self.final is None:
+            self.final = nuevo_nodo
         self.tamaño += 1
     
     def insertar_al_final(self, dato):
@@ -51,12 +89,39 @@ class ListaEnlazada:
         if not self.cabeza:
             self.cabeza = nuevo_nodo
         else:
-            actual = self.cabeza
-            while actual.siguiente:
-                actual = actual.siguiente
-            actual.siguiente = nuevo_nodo
+            self.final.siguiente = nuevo_nodo
+        self.final = nuevo_nodo
         self.tamaño += 1
     
+    def extender(self, elementos):
+        """
+        Inserta al final todos los elementos de un iterable.
+        
+        Los nodos del lote se enlazan entre sí en una sola pasada y
+        luego se conectan al final de la lista.
+        
+        Args:
+            elementos: Iterable con los elementos a insertar en orden
+        """
+        primero = ultimo = None
+        cantidad = 0
+        for dato in elementos:
+            nuevo_nodo = Nodo(dato)
+            if ultimo is None:
+                primero = nuevo_nodo
+            else:
+                ultimo.siguiente = nuevo_nodo
+            ultimo = nuevo_nodo
+            cantidad += 1
+        if primero is None:
+            return
+        if self.cabeza is None:
+            self.cabeza = primero
+        else:
+            self.final.siguiente = primero
+        self.final = ultimo
+        self.tamaño += cantidad
+    
     def buscar(self, criterio_busqueda):
         """
         Busca elementos en la lista basado en un criterio.
@@ -83,6 +148,8 @@ class ListaEnlazada:
         # Si el primer elemento cumple el criterio
         if criterio_eliminacion(self.cabeza.dato):
             self.cabeza = self.cabeza.siguiente
+            if self.cabeza is None:
+                self.final = None
             self.tamaño -= 1
             return True
         
@@ -91,19 +158,26 @@ class ListaEnlazada:
         while actual.siguiente:
             if criterio_eliminacion(actual.siguiente.dato):
                 actual.siguiente = actual.siguiente.siguiente
+                if actual.siguiente is None:  # Se eliminó el último nodo
+                    self.final = actual
                 self.tamaño -= 1
                 return True
             actual = actual.siguiente
         return False
     
-    def obtener_todos(self):
-        """Retorna todos los elementos de la lista."""
-        elementos = []
+    def __iter__(self):
+        """Recorre los elementos de la lista sin copiarlos."""
         actual = self.cabeza
         while actual:
-            elementos.append(actual.dato)
+            yield actual.dato
             actual = actual.siguiente
-        return elementos
+    
+    def __len__(self):
+        return self.tamaño
+    
+    def obtener_todos(self):
+        """Retorna todos los elementos de la lista."""
+        return list(self)
     
     def esta_vacia(self):
         """Verifica si la lista está vacía."""
@@ -113,6 +187,151 @@ class ListaEnlazada:
         """Retorna el tamaño de la lista."""
         return self.tamaño
 
+class CatalogoIndexado(ListaEnlazada):
+    """
+    Lista enlazada con un índice hash de clave a nodo.
+    
+    Conserva el orden de inserción de la lista enlazada y agrega un
+    diccionario que asocia la clave de cada elemento (por ejemplo, el ISBN
+    de un libro) con su nodo. Los nodos son doblemente enlazados para que
+    la eliminación por clave no necesite recorrer la lista.
+    
+    Complejidad:
+        obtener, contiene y eliminar_por_clave: O(1)
+    """
+    
+    def __init__(self, clave):
+        """
+        Args:
+            clave: Función que extrae la clave única de un elemento
+        """
+        super().__init__()
+        self.clave = clave
+        self.indice = {}
+    
+    def _registrar(self, dato):
+        """Crea el nodo del elemento y lo agrega al índice."""
+        clave = self.clave(dato)
+        if clave in self.indice:
+            raise ValueError(f"Clave duplicada: {clave}")
+        nodo = NodoDoble(dato)
+        self.indice[clave] = nodo
+        return nodo
+    
+    def _desenlazar(self, nodo):
+        """Retira un nodo de la lista y del índice."""
+        if nodo.anterior:
+            nodo.anterior.siguiente = nodo.siguiente
+        else:
+            self.cabeza = nodo.siguiente
+        if nodo.siguiente:
+            nodo.siguiente.anterior = nodo.anterior
+        else:
+            self.final = nodo.anterior
+        del self.indice[self.clave(nodo.dato)]
+        self.tamaño -= 1
+    
+    def insertar_al_inicio(self, dato):
+        """
+        Inserta un elemento al inicio de la lista.
+        
+        Raises:
+            ValueError: Si ya existe un elemento con la misma clave
+        """
+        nuevo_nodo = self._registrar(dato)
+        nuevo_nodo.siguiente = self.cabeza
+        if self.cabeza:
+            self.cabeza.anterior = nuevo_nodo
+        else:
+            self.final = nuevo_nodo
+        self.cabeza = nuevo_nodo
+        self.tamaño += 1
+    
+    def insertar_al_final(self, dato):
+        """
+        Inserta un elemento al final de la lista.
+        
+        Raises:
+            ValueError: Si ya existe un elemento con la misma clave
+        """
+        nuevo_nodo = self._registrar(dato)
+        if not self.cabeza:
+            self.cabeza = nuevo_nodo
+        else:
+            nuevo_nodo.anterior = self.final
+            self.final.siguiente = nuevo_nodo
+        self.final = nuevo_nodo
+        self.tamaño += 1
+    
+    def extender(self, elementos):
+        """
+        Inserta al final todos los elementos de un iterable.
+        
+        Si algún elemento tiene una clave repetida, o el iterable o la
+        función de clave lanzan cualquier excepción, no se inserta ningún
+        elemento del lote y el índice queda como estaba.
+        
+        Raises:
+            ValueError: Si alguna clave ya existe o se repite en el lote
+        """
+        nodos = []
+        try:
+            for dato in elementos:
+                nodos.append(self._registrar(dato))
+        except BaseException:
+            for nodo in nodos:
+                del self.indice[self.clave(nodo.dato)]
+            raise
+        if not nodos:
+            return
+        anterior = self.final
+        for nodo in nodos:
+            nodo.anterior = anterior
+            if anterior is None:
+                self.cabeza = nodo
+            else:
+                anterior.siguiente = nodo
+            anterior = nodo
+        self.final = anterior
+        self.tamaño += len(nodos)
+    
+    def eliminar(self, criterio_eliminacion):
+        """Elimina el primer elemento que cumpla con el criterio especificado."""
+        actual = self.cabeza
+        while actual:
+            if criterio_eliminacion(actual.dato):
+                self._desenlazar(actual)
+                return True
+            actual = actual.siguiente
+        return False
+    
+    def obtener(self, clave):
+        """
+        Obtiene el elemento asociado a una clave.
+        
+        Returns:
+            Elemento con la clave indicada o None si no existe
+        """
+        nodo = self.indice.get(clave)
+        return nodo.dato if nodo else None
+    
+    def contiene(self, clave):
+        """Verifica si existe un elemento con la clave indicada."""
+        return clave in self.indice
+    
+    def eliminar_por_clave(self, clave):
+        """
+        Elimina el elemento asociado a una clave.
+        
+        Returns:
+            True si se eliminó, False si la clave no existe
+        """
+        nodo = self.indice.get(clave)
+        if nodo is None:
+            return False
+        self._desenlazar(nodo)
+        return True
+
 class Pila:
     """
     Implementación de una pila (LIFO - Last In, First Out).
@@ -160,14 +379,179 @@ class Pila:
         """Retorna el tamaño de la pila."""
         return self.tamaño
     
-    def obtener_todos(self):
-        """Retorna todos los elementos de la pila (del tope hacia abajo)."""
-        elementos = []
+    def __iter__(self):
+        """Recorre los elementos de la pila del tope hacia abajo sin copiarlos."""
         actual = self.tope
         while actual:
-            elementos.append(actual.dato)
+            yield actual.dato
             actual = actual.siguiente
-        return elementos
+    
+    def __len__(self):
+        return self.tamaño
+    
+    def obtener_todos(self):
+        """Retorna todos los elementos de la pila (del tope hacia abajo)."""
+        return list(self)
+    
+    def obtener_pagina(self, limite, desplazamiento=0):
+        """
+        Retorna hasta `limite` elementos a partir de la posición
+        `desplazamiento`, contando desde el tope.
+        """
+        return list(islice(self, desplazamiento, desplazamiento + limite))
+
+class PilaAcotada:
+    """
+    Pila (LIFO) que conserva en memoria solo los elementos más recientes.
+    
+    Cuando se supera la capacidad en memoria, el elemento más antiguo se
+    agrega a un archivo de segmento en disco como un registro binario de
+    tamaño fijo, descrito por `formato` (ver el módulo struct). La posición
+    de cada registro se deduce de su índice, de modo que los elementos en
+    disco se consultan por páginas sin cargarlos ni guardar posiciones.
+    
+    Solo se admiten valores planos que el formato pueda empaquetar: un
+    número si el formato tiene un único campo, o una tupla de campos. El
+    segmento no contiene objetos serializados, así que abrir un archivo
+    existente solo lee números.
+    
+    Con un segmento propio (ruta_segmento), cerrar la pila agrega al archivo
+    los elementos que seguían en memoria, así que reabrirlo recupera la pila
+    completa. El segmento temporal por defecto se descarta al cerrar.
+    """
+    
+    def __init__(self, capacidad_memoria, ruta_segmento=None, formato='<q'):
+        """
+        Args:
+            capacidad_memoria: Número de elementos recientes que se mantienen en memoria
+            ruta_segmento: Archivo donde se agregan los elementos antiguos. Si ya
+                           existe, sus registros se recuperan como parte de la
+                           pila. Si es None se usa un archivo temporal.
+            formato: Formato struct de cada registro (un entero de 64 bits
+                     por defecto)
+            
+        Raises:
+            ValueError: Si el segmento existente no está formado por
+                        registros completos del formato
+        """
+        if capacidad_memoria < 1:
+            raise ValueError("La capacidad en memoria debe ser al menos 1")
+        self.capacidad_memoria = capacidad_memoria
+        self.recientes = ColaCircular(capacidad_memoria + 1)  # Del más antiguo al tope
+        self.registro = struct.Struct(formato)
+        self.campos = len(self.registro.unpack(bytes(self.registro.size)))
+        if ruta_segmento is None:
+            self.segmento = tempfile.TemporaryFile()
+        else:
+            self.segmento = open(ruta_segmento, 'a+b')
+        tamaño = self.segmento.seek(0, os.SEEK_END)
+        if tamaño % self.registro.size:
+            self.segmento.close()
+            raise ValueError("El segmento no contiene registros completos del formato")
+        self.en_disco = tamaño // self.registro.size  # Registros en el segmento
+        self.persistente = ruta_segmento is not None
+    
+    def _volcar(self, dato):
+        """Agrega un elemento al final del segmento en disco."""
+        self.segmento.seek(0, os.SEEK_END)
+        if self.campos == 1:
+            self.segmento.write(self.registro.pack(dato))
+        else:
+            self.segmento.write(self.registro.pack(*dato))
+        self.en_disco += 1
+    
+    def _leer(self, indice):
+        """Lee el registro en la posición indicada del segmento (0 = el más antiguo)."""
+        self.segmento.seek(indice * self.registro.size)
+        valores = self.registro.unpack(self.segmento.read(self.registro.size))
+        return valores[0] if self.campos == 1 else valores
+    
+    def apilar(self, dato):
+        """Agrega un elemento al tope de la pila."""
+        self.recientes.encolar(dato)
+        if self.recientes.obtener_tamaño() > self.capacidad_memoria:
+            self._volcar(self.recientes.desencolar())
+    
+    def desapilar(self):
+        """
+        Remueve y retorna el elemento del tope de la pila.
+        
+        Si no quedan elementos en memoria, se toma el último registro del
+        segmento y el archivo se trunca en esa posición.
+        
+        Returns:
+            Elemento del tope o None si la pila está vacía
+        """
+        if not self.recientes.esta_vacia():
+            return self.recientes.extraer_final()
+        if not self.en_disco:
+            return None
+        self.en_disco -= 1
+        dato = self._leer(self.en_disco)
+        self.segmento.truncate(self.en_disco * self.registro.size)
+        return dato
+    
+    def ver_tope(self):
+        """Retorna el elemento del tope sin removerlo."""
+        if not self.recientes.esta_vacia():
+            return self.recientes.obtener(self.recientes.obtener_tamaño() - 1)
+        if not self.en_disco:
+            return None
+        return self._leer(self.en_disco - 1)
+    
+    def esta_vacia(self):
+        """Verifica si la pila está vacía."""
+        return self.obtener_tamaño() == 0
+    
+    def obtener_tamaño(self):
+        """Retorna el tamaño total de la pila (memoria y disco)."""
+        return self.recientes.obtener_tamaño() + self.en_disco
+    
+    def __len__(self):
+        return self.obtener_tamaño()
+    
+    def __iter__(self):
+        """Recorre los elementos del tope hacia abajo, leyendo del disco solo al llegar a él."""
+        for i in range(self.recientes.obtener_tamaño() - 1, -1, -1):
+            yield self.recientes.obtener(i)
+        for i in range(self.en_disco - 1, -1, -1):
+            yield self._leer(i)
+    
+    def obtener_todos(self):
+        """Retorna todos los elementos de la pila (del tope hacia abajo)."""
+        return list(self)
+    
+    def obtener_pagina(self, limite, desplazamiento=0):
+        """
+        Retorna hasta `limite` elementos a partir de la posición
+        `desplazamiento`, contando desde el tope.
+        
+        Los elementos omitidos no se recorren: las páginas profundas se
+        leen directamente del segmento a partir de su posición.
+        """
+        en_memoria = self.recientes.obtener_tamaño()
+        pagina = []
+        posicion = desplazamiento
+        while len(pagina) < limite and posicion < en_memoria:
+            pagina.append(self.recientes.obtener(en_memoria - 1 - posicion))
+            posicion += 1
+        indice = self.en_disco - 1 - (posicion - en_memoria)
+        while len(pagina) < limite and indice >= 0:
+            pagina.append(self._leer(indice))
+            indice -= 1
+        return pagina
+    
+    def cerrar(self):
+        """
+        Cierra el archivo de segmento. Si es un archivo propio, antes le
+        agrega los elementos en memoria, del más antiguo al tope.
+        """
+        if self.segmento.closed:
+            return
+        if self.persistente:
+            while not self.recientes.esta_vacia():
+                self._volcar(self.recientes.desencolar())
+        self.segmento.close()
 
 class Cola:
     """
@@ -208,6 +592,17 @@ class Cola:
         self.tamaño -= 1
         return dato
     
+    def desencolar_lote(self, n):
+        """Remueve y retorna hasta n elementos del frente, en orden de llegada."""
+        lote = []
+        while len(lote) < n and self.frente is not None:
+            lote.append(self.frente.dato)
+            self.frente = self.frente.siguiente
+        if self.frente is None:
+            self.final = None
+        self.tamaño -= len(lote)
+        return lote
+    
     def ver_frente(self):
         """Retorna el elemento del frente sin removerlo."""
         if self.esta_vacia():
@@ -222,124 +617,1412 @@ class Cola:
         """Retorna el tamaño de la cola."""
         return self.tamaño
     
-    def obtener_todos(self):
-        """Retorna todos los elementos de la cola (del frente al final)."""
-        elementos = []
+    def __iter__(self):
+        """Recorre los elementos de la cola del frente al final sin copiarlos."""
         actual = self.frente
         while actual:
-            elementos.append(actual.dato)
+            yield actual.dato
             actual = actual.siguiente
-        return elementos
+    
+    def __len__(self):
+        return self.tamaño
+    
+    def obtener_todos(self):
+        """Retorna todos los elementos de la cola (del frente al final)."""
+        return list(self)
 
-class ArregloDinamico:
+class ColaCircular:
     """
-    Implementación de un arreglo dinámico.
+    Implementación de una cola (FIFO) sobre un arreglo circular.
     
-    Se utiliza para almacenar información de usuarios con acceso
-    indexado rápido y capacidad de crecimiento automático.
+    Ofrece la misma interfaz que Cola, pero almacena los elementos en un
+    arreglo que se reutiliza en forma circular en lugar de crear un nodo
+    por elemento. La capacidad se duplica automáticamente al llenarse.
+    Agrega operaciones por lotes para ráfagas de solicitudes.
     """
     
-    def __init__(self, capacidad_inicial=10):
-        self.capacidad = capacidad_inicial
-        self.tamaño = 0
+    def __init__(self, capacidad_inicial=16):
+        self.capacidad = max(1, capacidad_inicial)
         self.datos = [None] * self.capacidad
+        self.inicio = 0  # Posición del frente en el arreglo
+        self.tamaño = 0
     
-    def _redimensionar(self):
-        """Duplica la capacidad del arreglo cuando es necesario."""
-        nueva_capacidad = self.capacidad * 2
-        nuevo_arreglo = [None] * nueva_capacidad
-        for i in range(self.tamaño):
-            nuevo_arreglo[i] = self.datos[i]
-        self.datos = nuevo_arreglo
+    def _redimensionar(self, minimo):
+        """Aumenta la capacidad dejando los elementos en orden desde la posición 0."""
+        nueva_capacidad = self.capacidad
+        while nueva_capacidad < minimo:
+            nueva_capacidad *= 2
+        elementos = self._rebanadas(0, self.tamaño)
+        self.datos = elementos + [None] * (nueva_capacidad - self.tamaño)
         self.capacidad = nueva_capacidad
+        self.inicio = 0
     
-    def agregar(self, elemento):
-        """Agrega un elemento al final del arreglo."""
-        if self.tamaño >= self.capacidad:
-            self._redimensionar()
-        self.datos[self.tamaño] = elemento
+    def _rebanadas(self, desplazamiento, cantidad):
+        """Copia `cantidad` elementos a partir de `desplazamiento` respecto al frente."""
+        desde = (self.inicio + desplazamiento) % self.capacidad
+        hasta = desde + cantidad
+        if hasta <= self.capacidad:
+            return self.datos[desde:hasta]
+        return self.datos[desde:] + self.datos[:hasta - self.capacidad]
+    
+    def encolar(self, dato):
+        """Agrega un elemento al final de la cola."""
+        if self.tamaño == self.capacidad:
+            self._redimensionar(self.tamaño + 1)
+        self.datos[(self.inicio + self.tamaño) % self.capacidad] = dato
         self.tamaño += 1
     
-    def obtener(self, indice):
+    def encolar_lote(self, elementos):
         """
-        Obtiene el elemento en la posición especificada.
+        Agrega al final de la cola todos los elementos de un iterable.
         
         Args:
-            indice: Posición del elemento (0-indexado)
-            
+            elementos: Iterable con los elementos a encolar en orden
+        """
+        lote = list(elementos)
+        if self.tamaño + len(lote) > self.capacidad:
+            self._redimensionar(self.tamaño + len(lote))
+        desde = (self.inicio + self.tamaño) % self.capacidad
+        primer_tramo = min(len(lote), self.capacidad - desde)
+        self.datos[desde:desde + primer_tramo] = lote[:primer_tramo]
+        self.datos[:len(lote) - primer_tramo] = lote[primer_tramo:]
+        self.tamaño += len(lote)
+    
+    def desencolar(self):
+        """
+        Remueve y retorna el elemento del frente de la cola.
+        
         Returns:
-            Elemento en la posición especificada
-            
-        Raises:
-            IndexError: Si el índice está fuera de rango
+            Elemento del frente o None si la cola está vacía
         """
-        if 0 <= indice < self.tamaño:
-            return self.datos[indice]
-        raise IndexError("Índice fuera de rango")
+        if self.esta_vacia():
+            return None
+        dato = self.datos[self.inicio]
+        self.datos[self.inicio] = None
+        self.inicio = (self.inicio + 1) % self.capacidad
+        self.tamaño -= 1
+        return dato
     
-    def establecer(self, indice, elemento):
+    def desencolar_lote(self, n):
         """
-        Establece el valor en la posición especificada.
+        Remueve y retorna hasta n elementos del frente de la cola.
         
-        Args:
-            indice: Posición donde establecer el elemento
-            elemento: Nuevo elemento
-            
-        Raises:
-            IndexError: Si el índice está fuera de rango
+        Returns:
+            Lista con los elementos en orden de llegada (vacía si no hay)
         """
-        if 0 <= indice < self.tamaño:
-            self.datos[indice] = elemento
+        cantidad = min(max(n, 0), self.tamaño)
+        lote = self._rebanadas(0, cantidad)
+        hasta = self.inicio + cantidad
+        if hasta <= self.capacidad:
+            self.datos[self.inicio:hasta] = [None] * cantidad
         else:
-            raise IndexError("Índice fuera de rango")
+            self.datos[self.inicio:] = [None] * (self.capacidad - self.inicio)
+            self.datos[:hasta - self.capacidad] = [None] * (hasta - self.capacidad)
+        self.inicio = hasta % self.capacidad
+        self.tamaño -= cantidad
+        return lote
     
-    def buscar(self, criterio_busqueda):
+    def extraer_final(self):
         """
-        Busca elementos que cumplan con el criterio especificado.
+        Remueve y retorna el último elemento encolado.
         
-        Args:
-            criterio_busqueda: Función que evalúa si un elemento cumple la condición
-            
         Returns:
-            Lista de elementos que cumplen el criterio
+            Último elemento o None si la cola está vacía
         """
-        resultados = []
-        for i in range(self.tamaño):
-            if criterio_busqueda(self.datos[i]):
-                resultados.append(self.datos[i])
-        return resultados
+        if self.esta_vacia():
+            return None
+        posicion = (self.inicio + self.tamaño - 1) % self.capacidad
+        dato = self.datos[posicion]
+        self.datos[posicion] = None
+        self.tamaño -= 1
+        return dato
     
-    def eliminar(self, indice):
+    def ver_frente(self):
+        """Retorna el elemento del frente sin removerlo."""
+        if self.esta_vacia():
+            return None
+        return self.datos[self.inicio]
+    
+    def obtener(self, indice):
         """
-        Elimina el elemento en la posición especificada.
+        Obtiene el elemento en la posición indicada, contando desde el frente.
         
-        Args:
-            indice: Posición del elemento a eliminar
-            
-        Returns:
-            Elemento eliminado
-            
         Raises:
             IndexError: Si el índice está fuera de rango
         """
-        if not (0 <= indice < self.tamaño):
-            raise IndexError("Índice fuera de rango")
-        
-        elemento_eliminado = self.datos[indice]
-        # Desplazar elementos hacia la izquierda
-        for i in range(indice, self.tamaño - 1):
-            self.datos[i] = self.datos[i + 1]
-        self.tamaño -= 1
-        return elemento_eliminado
-    
-    def obtener_todos(self):
-        """Retorna todos los elementos del arreglo."""
-        return [self.datos[i] for i in range(self.tamaño)]
+        if 0 <= indice < self.tamaño:
+            return self.datos[(self.inicio + indice) % self.capacidad]
+        raise IndexError("Índice fuera de rango")
     
-    def esta_vacio(self):
-        """Verifica si el arreglo está vacío."""
+    def esta_vacia(self):
+        """Verifica si la cola está vacía."""
         return self.tamaño == 0
     
     def obtener_tamaño(self):
-        """Retorna el tamaño actual del arreglo."""
-        return self.tamaño
\ No newline at end of file
+        """Retorna el tamaño de la cola."""
+        return self.tamaño
+    
+    def __iter__(self):
+        """Recorre los elementos de la cola del frente al final sin copiarlos."""
+        for i in range(self.tamaño):
+            yield self.datos[(self.inicio + i) % self.capacidad]
+    
+    def __len__(self):
+        return self.tamaño
+    
+    def obtener_todos(self):
+        """Retorna todos los elementos de la cola (del frente al final)."""
+        return self._rebanadas(0, self.tamaño)
+
+class MonticuloMinimo:
+    """
+    Implementación de un montículo binario mínimo sobre una lista.
+    
+    El elemento menor (según la comparación de Python) siempre está en la
+    raíz. Se apoya en el módulo heapq para las operaciones de reordenamiento.
+    
+    Complejidad:
+        insertar y extraer: O(log n)
+        ver_minimo: O(1)
+    """
+    
+    def __init__(self):
+        self.datos = []
+    
+    def insertar(self, elemento):
+        """Agrega un elemento al montículo."""
+        heapq.heappush(self.datos, elemento)
+    
+    def extraer(self):
+        """
+        Remueve y retorna el elemento mínimo.
+        
+        Returns:
+            Elemento mínimo o None si el montículo está vacío
+        """
+        if not self.datos:
+            return None
+        return heapq.heappop(self.datos)
+    
+    def ver_minimo(self):
+        """Retorna el elemento mínimo sin removerlo."""
+        return self.datos[0] if self.datos else None
+    
+    def recorrer_hasta(self, limite, clave=None):
+        """
+        Recorre los elementos menores o iguales que un límite.
+        
+        Aprovecha la propiedad del montículo: si un nodo supera el límite,
+        ninguno de sus descendientes puede cumplirlo. El costo es
+        proporcional a la cantidad de elementos encontrados (no en orden).
+        
+        Args:
+            limite: Valor máximo a incluir
+            clave: Función opcional que extrae el valor a comparar
+        """
+        pendientes = [0] if self.datos else []
+        while pendientes:
+            i = pendientes.pop()
+            elemento = self.datos[i]
+            valor = clave(elemento) if clave else elemento
+            if valor > limite:
+                continue
+            yield elemento
+            for hijo in (2 * i + 1, 2 * i + 2):
+                if hijo < len(self.datos):
+                    pendientes.append(hijo)
+    
+    def filtrar(self, condicion):
+        """Conserva solo los elementos que cumplen la condición (O(n))."""
+        self.datos = [elemento for elemento in self.datos if condicion(elemento)]
+        heapq.heapify(self.datos)
+    
+    def esta_vacio(self):
+        """Verifica si el montículo está vacío."""
+        return not self.datos
+    
+    def obtener_tamaño(self):
+        """Retorna el número de elementos del montículo."""
+        return len(self.datos)
+    
+    def __len__(self):
+        return len(self.datos)
+    
+    def __iter__(self):
+        """Recorre los elementos en el orden interno del montículo (no ordenado)."""
+        return iter(self.datos)
+
+class ColaPrioridad:
+    """
+    Cola de prioridad estable sobre un montículo mínimo.
+    
+    Los elementos con menor valor de prioridad se atienden primero y,
+    dentro de una misma prioridad, en orden de llegada (FIFO). Ofrece la
+    misma interfaz que Cola, por lo que encolar sin prioridad usa la
+    prioridad por defecto.
+    
+    Complejidad:
+        encolar y desencolar: O(log n)
+    """
+    
+    def __init__(self, prioridad_por_defecto=0):
+        self.prioridad_por_defecto = prioridad_por_defecto
+        self.monticulo = MonticuloMinimo()
+        self.secuencia = 0  # Desempata por orden de llegada
+    
+    def encolar(self, dato, prioridad=None):
+        """
+        Agrega un elemento con la prioridad indicada.
+        
+        Args:
+            dato: Elemento a encolar
+            prioridad: Valor de prioridad (menor se atiende antes)
+        """
+        if prioridad is None:
+            prioridad = self.prioridad_por_defecto
+        self.monticulo.insertar((prioridad, self.secuencia, dato))
+        self.secuencia += 1
+    
+    def encolar_lote(self, elementos, prioridad=None):
+        """Agrega todos los elementos de un iterable con la misma prioridad."""
+        for dato in elementos:
+            self.encolar(dato, prioridad)
+    
+    def desencolar(self):
+        """
+        Remueve y retorna el elemento de mayor prioridad.
+        
+        Returns:
+            Elemento a atender o None si la cola está vacía
+        """
+        entrada = self.monticulo.extraer()
+        return None if entrada is None else entrada[2]
+    
+    def desencolar_lote(self, n):
+        """Remueve y retorna hasta n elementos en orden de atención."""
+        lote = []
+        while len(lote) < n and not self.monticulo.esta_vacio():
+            lote.append(self.monticulo.extraer()[2])
+        return lote
+    
+    def ver_frente(self):
+        """Retorna el siguiente elemento a atender sin removerlo."""
+        entrada = self.monticulo.ver_minimo()
+        return None if entrada is None else entrada[2]
+    
+    def esta_vacia(self):
+        """Verifica si la cola está vacía."""
+        return self.monticulo.esta_vacio()
+    
+    def obtener_tamaño(self):
+        """Retorna el tamaño de la cola."""
+        return self.monticulo.obtener_tamaño()
+    
+    def __len__(self):
+        return self.monticulo.obtener_tamaño()
+    
+    def __iter__(self):
+        """Recorre los elementos en orden de atención (ordena una copia: O(n log n))."""
+        for entrada in sorted(self.monticulo):
+            yield entrada[2]
+    
+    def obtener_todos(self):
+        """Retorna todos los elementos en orden de atención."""
+        return list(self)
+
+class RuedaTemporizacion:
+    """
+    Rueda de temporización jerárquica para programar tareas en el tiempo.
+    
+    El tiempo se divide en ticks de `resolucion` segundos. El nivel 0 tiene
+    una ranura por tick; cada nivel superior cubre `ranuras` veces más
+    tiempo por ranura. Al completar una vuelta de un nivel, las tareas de la
+    ranura correspondiente del nivel superior descienden (cascada) al nivel
+    que les toca según el tiempo que les falta.
+    
+    Las tareas se disparan en el primer tick posterior a su momento y las
+    de un mismo tick se entregan en lote: cada acción se invoca una sola vez
+    como accion(datos, momento), con la lista de datos de sus tareas y el
+    instante del tick.
+    
+    Complejidad:
+        programar y cancelar: O(1)
+        avanzar: O(ticks recorridos + tareas disparadas); los tramos sin
+        tareas en el nivel 0 se saltan hasta el siguiente límite de vuelta
+    """
+    
+    def __init__(self, reloj=time.time, resolucion=60, ranuras=64, niveles=4):
+        """
+        Args:
+            reloj: Función sin argumentos que retorna el momento actual en
+                   segundos (time.time por defecto; inyectable en pruebas)
+            resolucion: Segundos por tick
+            ranuras: Ranuras por nivel
+            niveles: Número de niveles de la rueda
+        """
+        self.reloj = reloj
+        self.resolucion = resolucion
+        self.ranuras = ranuras
+        self.niveles = [[{} for _ in range(ranuras)] for _ in range(niveles)]
+        self.cantidad_por_nivel = [0] * niveles
+        self.alcance = ranuras ** niveles  # Ticks cubiertos sin cascada
+        self.tick_actual = int(reloj() // resolucion)  # Siguiente tick a procesar
+        self.ubicaciones = {}  # id_tarea -> (nivel, ranura)
+        self.siguiente_id = 1
+    
+    def _ubicar(self, id_tarea, tarea):
+        """Coloca una tarea en la ranura que le corresponde según su tick."""
+        vence = tarea[0]
+        # Las tareas fuera del alcance esperan en la última ranura alcanzable
+        # y se reubican al llegar su cascada
+        tick = min(vence, self.tick_actual + self.alcance - 1)
+        delta = tick - self.tick_actual
+        nivel = 0
+        amplitud = self.ranuras
+        while delta >= amplitud:
+            nivel += 1
+            amplitud *= self.ranuras
+        ranura = self.niveles[nivel][(tick // (amplitud // self.ranuras)) % self.ranuras]
+        ranura[id_tarea] = tarea
+        self.ubicaciones[id_tarea] = (nivel, ranura)
+        self.cantidad_por_nivel[nivel] += 1
+    
+    def _cascada(self):
+        """Hace descender las tareas de los niveles que completan una vuelta."""
+        amplitud = 1
+        for nivel in range(1, len(self.niveles)):
+            amplitud *= self.ranuras
+            if self.tick_actual % amplitud:
+                break
+            ranura = self.niveles[nivel][(self.tick_actual // amplitud) % self.ranuras]
+            tareas = list(ranura.items())
+            ranura.clear()
+            self.cantidad_por_nivel[nivel] -= len(tareas)
+            for id_tarea, tarea in tareas:
+                self._ubicar(id_tarea, tarea)
+    
+    def programar(self, momento, accion, dato):
+        """
+        Programa una tarea.
+        
+        Args:
+            momento: Instante (en segundos del reloj) a partir del cual se dispara
+            accion: Función que recibe (datos, momento) al dispararse
+            dato: Valor que se entrega a la acción
+            
+        Returns:
+            ID de la tarea, para cancelarla
+        """
+        id_tarea = self.siguiente_id
+        self.siguiente_id += 1
+        vence = max(int(momento // self.resolucion) + 1, self.tick_actual)
+        self._ubicar(id_tarea, (vence, accion, dato))
+        return id_tarea
+    
+    def cancelar(self, id_tarea):
+        """
+        Cancela una tarea pendiente.
+        
+        Returns:
+            True si se canceló, False si no existía o ya se disparó
+        """
+        ubicacion = self.ubicaciones.pop(id_tarea, None)
+        if ubicacion is None:
+            return False
+        nivel, ranura = ubicacion
+        del ranura[id_tarea]
+        self.cantidad_por_nivel[nivel] -= 1
+        return True
+    
+    def avanzar(self, hasta=None):
+        """
+        Procesa los ticks transcurridos y dispara las tareas vencidas.
+        
+        Args:
+            hasta: Momento hasta el cual avanzar (por defecto, el del reloj)
+            
+        Returns:
+            Número de tareas disparadas
+        """
+        if hasta is None:
+            hasta = self.reloj()
+        objetivo = int(hasta // self.resolucion)
+        disparadas = 0
+        while self.tick_actual <= objetivo:
+            if not self.ubicaciones:
+                self.tick_actual = objetivo + 1
+                break
+            self._cascada()
+            if not self.cantidad_por_nivel[0]:
+                # Nada que disparar hasta la próxima vuelta del nivel 0
+                siguiente_vuelta = (self.tick_actual // self.ranuras + 1) * self.ranuras
+                self.tick_actual = min(siguiente_vuelta, objetivo + 1)
+                continue
+            
+            ranura = self.niveles[0][self.tick_actual % self.ranuras]
+            momento = self.tick_actual * self.resolucion
+            self.tick_actual += 1  # Lo que se programe al disparar va a ticks futuros
+            if not ranura:
+                continue
+            tareas = list(ranura.items())
+            ranura.clear()
+            self.cantidad_por_nivel[0] -= len(tareas)
+            lotes = {}
+            for id_tarea, tarea in tareas:
+                vence, accion, dato = tarea
+                if vence >= self.tick_actual:
+                    # Tarea fuera del alcance de una rueda de un solo nivel
+                    self._ubicar(id_tarea, tarea)
+                    continue
+                del self.ubicaciones[id_tarea]
+                lotes.setdefault(accion, []).append(dato)
+                disparadas += 1
+            for accion, datos in lotes.items():
+                accion(datos, momento)
+        return disparadas
+    
+    def esta_vacia(self):
+        """Verifica si no hay tareas pendientes."""
+        return not self.ubicaciones
+    
+    def obtener_tamaño(self):
+        """Retorna el número de tareas pendientes."""
+        return len(self.ubicaciones)
+    
+    def __len__(self):
+        return len(self.ubicaciones)
+
+class IndiceTrigramas:
+    """
+    Índice invertido de trigramas para búsqueda de subcadenas.
+    
+    Cada texto indexado se descompone en sus subcadenas de tres
+    caracteres; para cada trigrama se guarda la lista de claves cuyo texto
+    lo contiene (un diccionario, que conserva el orden de inserción y
+    permite eliminar en O(1)). Una búsqueda intersecta las listas de los
+    trigramas de la consulta, empezando por la más corta, y verifica cada
+    candidato con una comparación real de subcadena.
+    
+    Los textos se indexan tal como se reciben: quien use el índice debe
+    normalizarlos (por ejemplo, a minúsculas) igual que las consultas.
+    
+    Complejidad:
+        agregar y eliminar: O(longitud del texto)
+        buscar: proporcional a la lista de trigramas más corta de la
+        consulta; las consultas de menos de tres caracteres recorren todos
+        los textos
+    """
+    
+    def __init__(self):
+        self.listas = {}  # trigrama -> {clave: None}
+        self.textos = {}  # clave -> texto indexado
+    
+    @staticmethod
+    def _trigramas(texto):
+        """Retorna el conjunto de trigramas de un texto."""
+        return {texto[i:i + 3] for i in range(len(texto) - 2)}
+    
+    def agregar(self, clave, texto):
+        """Indexa el texto de una clave (reemplaza el anterior si existía)."""
+        if clave in self.textos:
+            self.eliminar(clave)
+        self.textos[clave] = texto
+        for trigrama in self._trigramas(texto):
+            self.listas.setdefault(trigrama, {})[clave] = None
+    
+    def eliminar(self, clave):
+        """
+        Quita una clave del índice.
+        
+        Returns:
+            True si se eliminó, False si no estaba indexada
+        """
+        texto = self.textos.pop(clave, None)
+        if texto is None:
+            return False
+        for trigrama in self._trigramas(texto):
+            lista = self.listas[trigrama]
+            del lista[clave]
+            if not lista:
+                del self.listas[trigrama]
+        return True
+    
+    def buscar(self, subcadena):
+        """
+        Recorre las claves cuyo texto contiene la subcadena, en orden de
+        inserción.
+        """
+        if len(subcadena) < 3:
+            return (clave for clave, texto in self.textos.items() if subcadena in texto)
+        listas = []
+        for trigrama in self._trigramas(subcadena):
+            lista = self.listas.get(trigrama)
+            if lista is None:
+                return iter(())
+            listas.append(lista)
+        listas.sort(key=len)
+        menor, resto = listas[0], listas[1:]
+        return (clave for clave in menor
+                if all(clave in lista for lista in resto) and subcadena in self.textos[clave])
+    
+    def __contains__(self, clave):
+        return clave in self.textos
+    
+    def __len__(self):
+        return len(self.textos)
+
+def distancia_edicion(a, b, maximo=None):
+    """
+    Calcula la distancia de Levenshtein entre dos textos: el mínimo de
+    inserciones, eliminaciones y sustituciones de un carácter que convierten
+    uno en el otro.
+    
+    Args:
+        a, b: Textos a comparar
+        maximo: Cota opcional; si la distancia la supera, el cálculo se
+                detiene en cuanto se sabe y retorna maximo + 1
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if maximo is not None and len(a) - len(b) > maximo:
+        return maximo + 1
+    anterior = list(range(len(b) + 1))
+    for i, caracter_a in enumerate(a, 1):
+        actual = [i]
+        for j, caracter_b in enumerate(b, 1):
+            actual.append(min(anterior[j] + 1, actual[j - 1] + 1,
+                              anterior[j - 1] + (caracter_a != caracter_b)))
+        if maximo is not None and min(actual) > maximo:
+            return maximo + 1
+        anterior = actual
+    if maximo is not None:
+        return min(anterior[-1], maximo + 1)
+    return anterior[-1]
+
+class NodoBK:
+    """
+    Nodo de un árbol BK.
+    
+    Atributos:
+        palabra: Palabra almacenada en el nodo
+        hijos: Diccionario distancia -> NodoBK
+        activa: False si la palabra fue eliminada (el nodo se conserva
+                porque sostiene a sus hijos)
+    """
+    __slots__ = ('palabra', 'hijos', 'activa')
+    
+    def __init__(self, palabra):
+        self.palabra = palabra
+        self.hijos = {}
+        self.activa = True
+
+class ArbolBK:
+    """
+    Árbol BK sobre la distancia de edición, para búsqueda aproximada.
+    
+    Cada hijo de un nodo cuelga de la distancia entre su palabra y la del
+    nodo. Por la desigualdad triangular, al buscar palabras a distancia k
+    o menos de una consulta que está a distancia d de un nodo, solo pueden
+    encontrarse en los hijos con distancia entre d - k y d + k; el resto
+    del árbol se descarta sin compararlo.
+    
+    Las palabras eliminadas quedan marcadas como inactivas (los nodos no
+    pueden quitarse sin reinsertar su subárbol) y se reactivan si vuelven
+    a agregarse.
+    
+    Complejidad:
+        agregar: O(altura) distancias calculadas
+        buscar: depende de k; con k pequeño compara una fracción de las
+        palabras en lugar de todas
+    """
+    
+    def __init__(self):
+        self.raiz = None
+        self.nodos = {}  # palabra -> NodoBK
+        self.activas = 0
+    
+    def agregar(self, palabra):
+        """
+        Agrega una palabra al árbol.
+        
+        Returns:
+            True si se agregó, False si ya estaba
+        """
+        nodo = self.nodos.get(palabra)
+        if nodo is not None:
+            if nodo.activa:
+                return False
+            nodo.activa = True
+            self.activas += 1
+            return True
+        nuevo = NodoBK(palabra)
+        self.nodos[palabra] = nuevo
+        self.activas += 1
+        if self.raiz is None:
+            self.raiz = nuevo
+            return True
+        nodo = self.raiz
+        while True:
+            distancia = distancia_edicion(palabra, nodo.palabra)
+            hijo = nodo.hijos.get(distancia)
+            if hijo is None:
+                nodo.hijos[distancia] = nuevo
+                return True
+            nodo = hijo
+    
+    def eliminar(self, palabra):
+        """
+        Quita una palabra del árbol.
+        
+        Returns:
+            True si se eliminó, False si no estaba
+        """
+        nodo = self.nodos.get(palabra)
+        if nodo is None or not nodo.activa:
+            return False
+        nodo.activa = False
+        self.activas -= 1
+        return True
+    
+    def buscar(self, palabra, distancia_maxima):
+        """
+        Busca las palabras a distancia de edición distancia_maxima o menos.
+        
+        Returns:
+            Lista de tuplas (distancia, palabra), de la más cercana a la más
+            lejana (en empate, por orden alfabético)
+        """
+        resultados = []
+        pendientes = [self.raiz] if self.raiz is not None else []
+        while pendientes:
+            nodo = pendientes.pop()
+            # Si la distancia supera la de todos los hijos más la tolerancia,
+            # ni el nodo ni sus hijos califican: basta calcularla hasta ahí
+            cota = distancia_maxima + max(nodo.hijos, default=0)
+            distancia = distancia_edicion(palabra, nodo.palabra, cota)
+            if distancia <= distancia_maxima and nodo.activa:
+                resultados.append((distancia, nodo.palabra))
+            for distancia_hijo, hijo in nodo.hijos.items():
+                if abs(distancia_hijo - distancia) <= distancia_maxima:
+                    pendientes.append(hijo)
+        resultados.sort()
+        return resultados
+    
+    def __contains__(self, palabra):
+        nodo = self.nodos.get(palabra)
+        return nodo is not None and nodo.activa
+    
+    def __len__(self):
+        return self.activas
+
+class NodoTrie:
+    """
+    Nodo de un trie de sugerencias con caminos comprimidos.
+    
+    Atributos:
+        etiqueta: Fragmento de clave del arco que llega al nodo (las cadenas
+                  de nodos con un solo hijo se comprimen en un único arco)
+        hijos: Diccionario primer carácter de la etiqueta -> NodoTrie
+               (None mientras el nodo es una hoja)
+        terminales: Elementos con una clave que termina en este nodo (None
+                    si no termina ninguna)
+        mejores: Los elementos de mayor peso del subárbol, ordenados
+    """
+    __slots__ = ('etiqueta', 'hijos', 'terminales', 'mejores')
+    
+    def __init__(self, etiqueta=""):
+        self.etiqueta = etiqueta
+        self.hijos = None
+        self.terminales = None
+        self.mejores = []
+
+class TrieSugerencias:
+    """
+    Trie de prefijos con las mejores k completaciones precalculadas.
+    
+    Cada elemento (por ejemplo, un título) se inserta bajo varias claves
+    (sus palabras y el texto completo) y tiene un peso. Cada nodo guarda
+    la lista de los `capacidad` elementos de mayor peso de su subárbol,
+    así que sugerir un prefijo solo recorre el prefijo y copia una lista.
+    Los empates se resuelven por orden de inserción.
+    
+    Los caminos sin ramificaciones se comprimen en un solo nodo (árbol
+    radix): el final único de una clave larga, como un título completo,
+    ocupa un nodo en lugar de uno por carácter. Los nodos se dividen al
+    insertar una clave que se separa a mitad de un arco y se vuelven a
+    unir al quitarla.
+    
+    Un mismo elemento puede agregarse varias veces (por ejemplo, el mismo
+    autor con varios libros): se cuentan las referencias y el elemento se
+    quita del trie cuando se quita la última.
+    
+    Complejidad:
+        sugerir: O(longitud del prefijo + k)
+        incrementar: O(nodos de las claves * capacidad log capacidad)
+        quitar y reducir peso: además, O(hijos * capacidad) por cada nodo
+                               cuya lista de mejores contiene al elemento
+    """
+    
+    def __init__(self, capacidad=10):
+        """
+        Args:
+            capacidad: Máximo de completaciones guardadas por nodo (k máximo)
+        """
+        self.capacidad = capacidad
+        self.raiz = NodoTrie()
+        self.pesos = {}        # elemento -> peso
+        self.claves = {}       # elemento -> claves bajo las que está insertado
+        self.referencias = {}  # elemento -> veces que se agregó
+        self.orden = {}        # elemento -> orden de inserción (desempate)
+        self.siguiente_orden = 0
+    
+    def _prioridad(self, elemento):
+        return (-self.pesos[elemento], self.orden[elemento])
+    
+    @staticmethod
+    def _prefijo_comun(etiqueta, clave, inicio):
+        """Retorna cuántos caracteres de la etiqueta coinciden con clave[inicio:]."""
+        limite = min(len(etiqueta), len(clave) - inicio)
+        comun = 0
+        while comun < limite and etiqueta[comun] == clave[inicio + comun]:
+            comun += 1
+        return comun
+    
+    def _ruta(self, clave, crear=False):
+        """
+        Retorna los nodos desde la raíz hasta el que termina exactamente en
+        la clave (None si no existe). Con crear, divide arcos y agrega la
+        hoja que falte.
+        """
+        nodo = self.raiz
+        ruta = [nodo]
+        posicion = 0
+        while posicion < len(clave):
+            hijo = nodo.hijos.get(clave[posicion]) if nodo.hijos else None
+            if hijo is None:
+                if not crear:
+                    return None
+                hijo = NodoTrie(clave[posicion:])
+                if nodo.hijos is None:
+                    nodo.hijos = {}
+                nodo.hijos[clave[posicion]] = hijo
+                ruta.append(hijo)
+                return ruta
+            if clave.startswith(hijo.etiqueta, posicion):
+                comun = len(hijo.etiqueta)
+            elif not crear:
+                return None
+            else:
+                comun = self._prefijo_comun(hijo.etiqueta, clave, posicion)
+                # Dividir el arco: un nodo intermedio con la parte común
+                intermedio = NodoTrie(hijo.etiqueta[:comun])
+                hijo.etiqueta = hijo.etiqueta[comun:]
+                intermedio.hijos = {hijo.etiqueta[0]: hijo}
+                intermedio.mejores = list(hijo.mejores)
+                nodo.hijos[clave[posicion]] = intermedio
+                hijo = intermedio
+            nodo = hijo
+            ruta.append(nodo)
+            posicion += comun
+        return ruta
+    
+    def _ruta_parcial(self, clave):
+        """Retorna los nodos existentes cuya etiqueta acumulada es prefijo de la clave."""
+        nodo = self.raiz
+        ruta = [nodo]
+        posicion = 0
+        while posicion < len(clave) and nodo.hijos:
+            hijo = nodo.hijos.get(clave[posicion])
+            if hijo is None or not clave.startswith(hijo.etiqueta, posicion):
+                break
+            nodo = hijo
+            ruta.append(nodo)
+            posicion += len(hijo.etiqueta)
+        return ruta
+    
+    def _promover(self, elemento, rutas=None):
+        """
+        Actualiza las listas de mejores tras un aumento de peso del elemento
+        (o su inserción), en las rutas de sus claves.
+        """
+        if rutas is None:
+            rutas = [self._ruta(clave) for clave in self.claves[elemento]]
+        prioridad = self._prioridad(elemento)
+        for ruta in rutas:
+            for nodo in ruta:
+                mejores = nodo.mejores
+                if elemento in mejores:
+                    mejores.remove(elemento)
+                elif len(mejores) == self.capacidad:
+                    if prioridad >= self._prioridad(mejores[-1]):
+                        continue
+                    mejores.pop()
+                self._insertar_ordenado(mejores, elemento, prioridad)
+    
+    def _insertar_ordenado(self, mejores, elemento, prioridad):
+        """Inserta un elemento en una lista de mejores, ubicándolo por búsqueda binaria."""
+        inicio, fin = 0, len(mejores)
+        while inicio < fin:
+            medio = (inicio + fin) // 2
+            if self._prioridad(mejores[medio]) < prioridad:
+                inicio = medio + 1
+            else:
+                fin = medio
+        mejores.insert(inicio, elemento)
+    
+    @staticmethod
+    def _nodos_con(elemento, rutas):
+        """
+        Retorna los nodos de las rutas cuya lista de mejores contiene al
+        elemento, de los más profundos a los menos. Cada ruta se sube desde
+        su final y se deja en el primer nodo que no lo contiene: ese nodo y
+        sus ancestros por esa ruta no dependen del elemento.
+        """
+        nodos = {}
+        for ruta in rutas:
+            for profundidad in range(len(ruta) - 1, -1, -1):
+                nodo = ruta[profundidad]
+                if elemento not in nodo.mejores:
+                    break
+                nodos[id(nodo)] = (profundidad, nodo)
+        return [nodo for _, nodo in sorted(nodos.values(), key=lambda par: -par[0])]
+    
+    def _recalcular(self, nodos):
+        """Recalcula las listas de mejores de los nodos, en el orden dado (hijos primero)."""
+        for nodo in nodos:
+            candidatos = set(nodo.terminales or ())
+            for hijo in (nodo.hijos or {}).values():
+                candidatos.update(hijo.mejores)
+            nodo.mejores = sorted(candidatos, key=self._prioridad)[:self.capacidad]
+    
+    @staticmethod
+    def _podar(ruta):
+        """
+        Quita, de abajo hacia arriba, los nodos de la ruta que quedaron sin
+        uso, y une con su hijo el primer nodo sin claves que quede con uno
+        solo.
+        """
+        for nivel in range(len(ruta) - 1, 0, -1):
+            nodo, padre = ruta[nivel], ruta[nivel - 1]
+            if nodo.terminales:
+                return
+            if not nodo.hijos:
+                del padre.hijos[nodo.etiqueta[0]]
+                if not padre.hijos:
+                    padre.hijos = None
+                continue
+            if len(nodo.hijos) == 1:
+                (hijo,) = nodo.hijos.values()
+                hijo.etiqueta = nodo.etiqueta + hijo.etiqueta
+                padre.hijos[hijo.etiqueta[0]] = hijo
+            return
+    
+    def agregar(self, elemento, claves, peso=0):
+        """
+        Agrega un elemento bajo las claves indicadas (o suma una referencia
+        y su peso si ya existía).
+        
+        Args:
+            elemento: Valor a sugerir
+            claves: Iterable de cadenas bajo las que se encuentra el elemento
+            peso: Peso inicial (o a sumar)
+        """
+        if elemento in self.pesos:
+            self.referencias[elemento] += 1
+            self.incrementar(elemento, peso)
+            return
+        self.pesos[elemento] = peso
+        self.claves[elemento] = tuple({sys.intern(clave) for clave in claves})
+        self.referencias[elemento] = 1
+        self.orden[elemento] = self.siguiente_orden
+        self.siguiente_orden += 1
+        rutas = [self._ruta(clave, crear=True) for clave in self.claves[elemento]]
+        for ruta in rutas:
+            if ruta[-1].terminales is None:
+                ruta[-1].terminales = set()
+            ruta[-1].terminales.add(elemento)
+        self._promover(elemento, rutas)
+    
+    def incrementar(self, elemento, cantidad=1):
+        """Suma (o resta, si es negativa) una cantidad al peso de un elemento."""
+        if elemento not in self.pesos or not cantidad:
+            return
+        self.pesos[elemento] += cantidad
+        if cantidad > 0:
+            self._promover(elemento)
+        else:
+            # Solo cambian las listas donde estaba: en las demás ya no entraba
+            rutas = [self._ruta(clave) for clave in self.claves[elemento]]
+            self._recalcular(self._nodos_con(elemento, rutas))
+    
+    def quitar(self, elemento, peso=0):
+        """
+        Quita una referencia a un elemento y resta su peso; el elemento
+        sale del trie al quitar la última referencia.
+        
+        Returns:
+            True si el elemento existía
+        """
+        if elemento not in self.pesos:
+            return False
+        self.referencias[elemento] -= 1
+        if self.referencias[elemento]:
+            self.incrementar(elemento, -peso)
+            return True
+        
+        claves = self.claves.pop(elemento)
+        # Las listas que contienen al elemento se ubican antes de podar
+        afectados = self._nodos_con(elemento, [self._ruta(clave) for clave in claves])
+        for clave in claves:
+            ruta = self._ruta(clave)
+            terminales = ruta[-1].terminales
+            terminales.discard(elemento)
+            if not terminales:
+                ruta[-1].terminales = None
+            self._podar(ruta)
+        del self.pesos[elemento], self.referencias[elemento], self.orden[elemento]
+        
+        # Rellenar las listas que perdieron al elemento; los nodos que la
+        # poda retiró se recalculan sin efecto y el hijo que ocupa el lugar
+        # de un nodo unido ya tiene la lista de su subárbol
+        self._recalcular(afectados)
+        return True
+    
+    def sugerir(self, prefijo, k=None):
+        """
+        Retorna hasta k elementos con alguna clave que empieza por el
+        prefijo, de mayor a menor peso (k no puede superar la capacidad).
+        """
+        nodo = self.raiz
+        posicion = 0
+        while posicion < len(prefijo):
+            hijo = nodo.hijos.get(prefijo[posicion]) if nodo.hijos else None
+            if hijo is None:
+                return []
+            comun = self._prefijo_comun(hijo.etiqueta, prefijo, posicion)
+            if comun < len(hijo.etiqueta) and posicion + comun < len(prefijo):
+                return []
+            nodo = hijo
+            posicion += comun
+        return nodo.mejores[:self.capacidad if k is None else k]
+    
+    def peso(self, elemento):
+        """Retorna el peso de un elemento (0 si no existe)."""
+        return self.pesos.get(elemento, 0)
+    
+    def __contains__(self, elemento):
+        return elemento in self.pesos
+    
+    def __len__(self):
+        return len(self.pesos)
+
+class IndiceOrdenado:
+    """
+    Índice secundario ordenado por clave, para consultas por rango.
+    
+    Guarda la lista ordenada de claves distintas y, para cada clave, sus
+    valores en un diccionario (conserva el orden de inserción y permite
+    eliminar en O(1)). Las claves se ubican con búsqueda binaria (bisect);
+    la lista solo se desplaza al aparecer o desaparecer una clave, de modo
+    que con pocas claves distintas (por ejemplo, años) agregar y eliminar
+    no dependen de la cantidad de valores.
+    
+    Complejidad (n claves distintas):
+        agregar y eliminar: O(log n), más el desplazamiento de la lista de
+        claves si la clave es nueva o queda vacía
+        rango: O(log n + k), con k la cantidad de resultados
+    """
+    
+    def __init__(self):
+        self.claves = []   # Claves distintas, en orden
+        self.valores = {}  # clave -> {valor: None}
+        self.cantidad = 0
+    
+    def agregar(self, clave, valor):
+        """Agrega un valor con su clave, después de los que ya tienen la misma clave."""
+        grupo = self.valores.get(clave)
+        if grupo is None:
+            grupo = self.valores[clave] = {}
+            self.claves.insert(bisect_left(self.claves, clave), clave)
+        if valor not in grupo:
+            grupo[valor] = None
+            self.cantidad += 1
+    
+    def eliminar(self, clave, valor):
+        """
+        Quita un valor registrado con la clave indicada.
+        
+        Returns:
+            True si se eliminó, False si no estaba
+        """
+        grupo = self.valores.get(clave)
+        if grupo is None or valor not in grupo:
+            return False
+        del grupo[valor]
+        self.cantidad -= 1
+        if not grupo:
+            del self.valores[clave]
+            del self.claves[bisect_left(self.claves, clave)]
+        return True
+    
+    def rango(self, desde=None, hasta=None):
+        """
+        Retorna los valores con clave entre desde y hasta (ambos incluidos),
+        ordenados por clave. None deja el extremo abierto.
+        """
+        inicio = 0 if desde is None else bisect_left(self.claves, desde)
+        fin = len(self.claves) if hasta is None else bisect_right(self.claves, hasta, inicio)
+        return [valor for clave in self.claves[inicio:fin] for valor in self.valores[clave]]
+    
+    def __len__(self):
+        return self.cantidad
+
+# Marca de las posiciones eliminadas en el modo de eliminación por lápidas
+_LAPIDA = object()
+
+class ArregloDinamico:
+    """
+    Implementación de un arreglo dinámico.
+    
+    Se utiliza para almacenar información de usuarios con acceso
+    indexado rápido y capacidad de crecimiento automático.
+    
+    Modos de eliminación:
+        desplazar: Desplaza los elementos siguientes (O(n), conserva el orden)
+        intercambio: Mueve el último elemento a la posición eliminada
+                     (O(1), no conserva el orden)
+        lapida: Marca la posición como eliminada y compacta el arreglo
+                cuando las lápidas superan a los elementos (más de la
+                mitad de las posiciones usadas), o al llenarse si al
+                menos una cuarta parte son lápidas, en lugar de crecer
+                (O(1) amortizado, conserva el orden)
+    
+    En el modo lapida las posiciones de los elementos no cambian hasta la
+    siguiente compactación, por lo que obtener y establecer pueden recibir
+    posiciones mayores o iguales al tamaño.
+    
+    Política de capacidad:
+        factor_crecimiento: Multiplicador de la capacidad al llenarse
+        umbral_reduccion: Si la ocupación cae por debajo de esta fracción,
+                          la capacidad se divide por el factor de
+                          crecimiento (None desactiva la reducción)
+    """
+    
+    MODOS_ELIMINACION = ("desplazar", "intercambio", "lapida")
+    
+    def __init__(self, capacidad_inicial=10, modo_eliminacion="desplazar",
+                 factor_crecimiento=2.0, umbral_reduccion=0.25):
+        if modo_eliminacion not in self.MODOS_ELIMINACION:
+            raise ValueError(f"Modo de eliminación no válido: {modo_eliminacion}")
+        if factor_crecimiento <= 1:
+            raise ValueError("El factor de crecimiento debe ser mayor que 1")
+        if umbral_reduccion is not None and umbral_reduccion * factor_crecimiento >= 1:
+            raise ValueError("El umbral de reducción debe ser menor que 1 / factor_crecimiento")
+        self.capacidad = max(1, capacidad_inicial)
+        self.capacidad_minima = self.capacidad
+        self.tamaño = 0
+        self.ocupados = 0  # Posiciones usadas, incluyendo lápidas
+        self.lapidas = 0
+        self.modo_eliminacion = modo_eliminacion
+        self.factor_crecimiento = factor_crecimiento
+        self.umbral_reduccion = umbral_reduccion
+        self.datos = [None] * self.capacidad
+    
+    def _redimensionar(self, nueva_capacidad=None):
+        """
+        Cambia la capacidad del arreglo copiando los elementos por rebanadas.
+        
+        Args:
+            nueva_capacidad: Capacidad deseada (por defecto, crece según
+                             el factor de crecimiento)
+        """
+        if nueva_capacidad is None:
+            nueva_capacidad = max(self.capacidad + 1,
+                                  int(self.capacidad * self.factor_crecimiento))
+        self.datos = self.datos[:self.ocupados] + [None] * (nueva_capacidad - self.ocupados)
+        self.capacidad = nueva_capacidad
+    
+    def _reducir_si_es_necesario(self):
+        """Reduce la capacidad cuando la ocupación cae bajo el umbral."""
+        if self.umbral_reduccion is None:
+            return
+        if (self.capacidad > self.capacidad_minima
+                and self.ocupados < self.capacidad * self.umbral_reduccion):
+            nueva_capacidad = max(self.capacidad_minima, self.ocupados,
+                                  int(self.capacidad / self.factor_crecimiento))
+            self._redimensionar(nueva_capacidad)
+    
+    def reservar(self, capacidad):
+        """
+        Asegura espacio para al menos la cantidad de elementos indicada.
+        
+        Útil antes de cargas masivas de tamaño conocido, para evitar
+        redimensionamientos intermedios.
+        
+        Args:
+            capacidad: Número total de elementos que debe poder contener
+        """
+        if capacidad > self.capacidad:
+            self._redimensionar(capacidad)
+    
+    def _reubicar(self, desde, hasta):
+        """
+        Notifica que los elementos en las posiciones [desde, hasta) cambiaron
+        de posición. Las subclases lo usan para mantener índices auxiliares.
+        """
+    
+    def _posicion_valida(self, indice):
+        """Verifica que la posición exista y no sea una lápida."""
+        return 0 <= indice < self.ocupados and self.datos[indice] is not _LAPIDA
+    
+    def agregar(self, elemento):
+        """Agrega un elemento al final del arreglo."""
+        if self.ocupados >= self.capacidad:
+            if self.lapidas * 4 >= self.ocupados:
+                self._compactar()
+            else:
+                self._redimensionar()
+        self.datos[self.ocupados] = elemento
+        self.ocupados += 1
+        self.tamaño += 1
+    
+    def obtener(self, indice):
+        """
+        Obtiene el elemento en la posición especificada.
+        
+        Args:
+            indice: Posición del elemento (0-indexado)
+            
+        Returns:
+            Elemento en la posición especificada
+            
+        Raises:
+            IndexError: Si el índice está fuera de rango
+        """
+        if self._posicion_valida(indice):
+            return self.datos[indice]
+        raise IndexError("Índice fuera de rango")
+    
+    def establecer(self, indice, elemento):
+        """
+        Establece el valor en la posición especificada.
+        
+        Args:
+            indice: Posición donde establecer el elemento
+            elemento: Nuevo elemento
+            
+        Raises:
+            IndexError: Si el índice está fuera de rango
+        """
+        if self._posicion_valida(indice):
+            self.datos[indice] = elemento
+        else:
+            raise IndexError("Índice fuera de rango")
+    
+    def buscar(self, criterio_busqueda):
+        """
+        Busca elementos que cumplan con el criterio especificado.
+        
+        Args:
+            criterio_busqueda: Función que evalúa si un elemento cumple la condición
+            
+        Returns:
+            Lista de elementos que cumplen el criterio
+        """
+        return [elemento for elemento in self if criterio_busqueda(elemento)]
+    
+    def eliminar(self, indice):
+        """
+        Elimina el elemento en la posición especificada según el modo de
+        eliminación del arreglo.
+        
+        Args:
+            indice: Posición del elemento a eliminar
+            
+        Returns:
+            Elemento eliminado
+            
+        Raises:
+            IndexError: Si el índice está fuera de rango
+        """
+        if not self._posicion_valida(indice):
+            raise IndexError("Índice fuera de rango")
+        
+        elemento_eliminado = self.datos[indice]
+        ultimo = self.ocupados - 1
+        self.tamaño -= 1
+        
+        if self.modo_eliminacion == "lapida":
+            self.datos[indice] = _LAPIDA
+            self.lapidas += 1
+            if self.lapidas > self.tamaño:  # Más de la mitad de las posiciones usadas
+                self._compactar()
+                self._reducir_si_es_necesario()
+            return elemento_eliminado
+        
+        if self.modo_eliminacion == "intercambio":
+            self.datos[indice] = self.datos[ultimo]
+            self.datos[ultimo] = None
+            self.ocupados -= 1
+            if indice < ultimo:
+                self._reubicar(indice, indice + 1)
+        else:
+            # Desplazar elementos hacia la izquierda
+            self.datos[indice:ultimo] = self.datos[indice + 1:ultimo + 1]
+            self.datos[ultimo] = None
+            self.ocupados -= 1
+            self._reubicar(indice, self.ocupados)
+        self._reducir_si_es_necesario()
+        return elemento_eliminado
+    
+    def _compactar(self):
+        """Elimina las lápidas conservando el orden de los elementos."""
+        destino = 0
+        primera_movida = None
+        for i in range(self.ocupados):
+            elemento = self.datos[i]
+            if elemento is _LAPIDA:
+                if primera_movida is None:
+                    primera_movida = destino
+                continue
+            self.datos[destino] = elemento
+            destino += 1
+        for i in range(destino, self.ocupados):
+            self.datos[i] = None
+        self.ocupados = destino
+        self.lapidas = 0
+        if primera_movida is not None:
+            self._reubicar(primera_movida, destino)
+    
+    def __iter__(self):
+        """Recorre los elementos del arreglo sin copiarlos."""
+        for i in range(self.ocupados):
+            elemento = self.datos[i]
+            if elemento is not _LAPIDA:
+                yield elemento
+    
+    def __len__(self):
+        return self.tamaño
+    
+    def obtener_todos(self):
+        """Retorna todos los elementos del arreglo."""
+        return list(self)
+    
+    def esta_vacio(self):
+        """Verifica si el arreglo está vacío."""
+        return self.tamaño == 0
+    
+    def obtener_tamaño(self):
+        """Retorna el tamaño actual del arreglo."""
+        return self.tamaño
+
+class ArregloIndexado(ArregloDinamico):
+    """
+    Arreglo dinámico con índices hash que asocian claves a posiciones.
+    
+    Cada índice se define con un nombre y una función que extrae la clave
+    de un elemento (por ejemplo, el ID o el email de un usuario). Los
+    índices se mantienen sincronizados en agregar, establecer y eliminar,
+    incluyendo los cambios de posición que provoca eliminar en cualquiera
+    de los modos de eliminación.
+    
+    Complejidad:
+        obtener_por, indice_de y contiene: O(1)
+    """
+    
+    def __init__(self, indices, capacidad_inicial=10, modo_eliminacion="desplazar",
+                 factor_crecimiento=2.0, umbral_reduccion=0.25):
+        """
+        Args:
+            indices: Diccionario {nombre: función que extrae la clave}
+            capacidad_inicial: Capacidad inicial del arreglo
+            modo_eliminacion: Modo de eliminación (ver ArregloDinamico)
+            factor_crecimiento: Multiplicador de la capacidad (ver ArregloDinamico)
+            umbral_reduccion: Ocupación mínima antes de reducir (ver ArregloDinamico)
+        """
+        super().__init__(capacidad_inicial, modo_eliminacion, factor_crecimiento,
+                         umbral_reduccion)
+        self.extractores = dict(indices)
+        self.indices = {nombre: {} for nombre in self.extractores}
+    
+    def _verificar_claves(self, elemento, indice_propio=None):
+        """Verifica que las claves del elemento no estén ocupadas por otra posición."""
+        for nombre, extraer in self.extractores.items():
+            posicion = self.indices[nombre].get(extraer(elemento))
+            if posicion is not None and posicion != indice_propio:
+                raise ValueError(f"Clave duplicada en índice '{nombre}': {extraer(elemento)}")
+    
+    def _indexar(self, elemento, indice):
+        """Registra las claves del elemento apuntando a la posición indicada."""
+        for nombre, extraer in self.extractores.items():
+            self.indices[nombre][extraer(elemento)] = indice
+    
+    def _desindexar(self, elemento):
+        """Retira las claves del elemento de todos los índices."""
+        for nombre, extraer in self.extractores.items():
+            del self.indices[nombre][extraer(elemento)]
+    
+    def agregar(self, elemento):
+        """
+        Agrega un elemento al final del arreglo.
+        
+        Raises:
+            ValueError: Si alguna clave del elemento ya está registrada
+        """
+        self._verificar_claves(elemento)
+        super().agregar(elemento)
+        self._indexar(elemento, self.ocupados - 1)
+    
+    def establecer(self, indice, elemento):
+        """
+        Establece el valor en la posición especificada.
+        
+        Raises:
+            IndexError: Si el índice está fuera de rango
+            ValueError: Si alguna clave ya pertenece a otra posición
+        """
+        anterior = self.obtener(indice)
+        self._verificar_claves(elemento, indice)
+        self._desindexar(anterior)
+        super().establecer(indice, elemento)
+        self._indexar(elemento, indice)
+    
+    def _reubicar(self, desde, hasta):
+        """Actualiza en los índices las posiciones de los elementos movidos."""
+        for i in range(desde, hasta):
+            elemento = self.datos[i]
+            if elemento is not _LAPIDA:
+                self._indexar(elemento, i)
+    
+    def eliminar(self, indice):
+        """
+        Elimina el elemento en la posición especificada y retira sus claves
+        de todos los índices.
+        """
+        elemento_eliminado = super().eliminar(indice)
+        self._desindexar(elemento_eliminado)
+        return elemento_eliminado
+    
+    def indice_de(self, nombre, clave):
+        """
+        Obtiene la posición del elemento con la clave indicada.
+        
+        Args:
+            nombre: Nombre del índice a consultar
+            clave: Clave buscada
+            
+        Returns:
+            Posición del elemento o None si la clave no existe
+        """
+        return self.indices[nombre].get(clave)
+    
+    def obtener_por(self, nombre, clave):
+        """Obtiene el elemento con la clave indicada o None si no existe."""
+        indice = self.indices[nombre].get(clave)
+        return None if indice is None else self.datos[indice]
+    
+    def contiene(self, nombre, clave):
+        """Verifica si existe un elemento con la clave indicada."""
+        return clave in self.indices[nombre]
@@ -186,14 +186,18 @@ class BibliotecaGUI:
         
         ttk.Label(search_frame, text="Buscar por:").grid(row=0, column=0, sticky=tk.W)
         self.book_search_combo = ttk.Combobox(search_frame, 
-                                            values=["titulo", "autor", "categoria", "isbn"],
+                                            values=["titulo", "autor", "categoria", "isbn",
+                                                    "titulo_aprox", "autor_aprox"],
                                             state="readonly", width=15)
         self.book_search_combo.grid(row=0, column=1, padx=(5, 10))
         self.book_search_combo.set("titulo")
         
         ttk.Label(search_frame, text="Valor:").grid(row=0, column=2, sticky=tk.W)
-        self.book_search_entry = ttk.Entry(search_frame, width=20)
+        # Campo con sugerencias de títulos y autores mientras se escribe
+        self.book_search_entry = ttk.Combobox(search_frame, width=20)
         self.book_search_entry.grid(row=0, column=3, padx=(5, 10))
+        self.book_search_entry.bind("<KeyRelease>", self.update_book_suggestions)
+        self.book_search_entry.bind("<<ComboboxSelected>>", lambda event: self.search_books())
         
         ttk.Button(search_frame, text="Buscar", 
                   command=self.search_books).grid(row=0, column=4)
@@ -519,6 +523,15 @@ class BibliotecaGUI:
         books = self.biblioteca.buscar_libros(criterion, value)
         self.populate_books_table(books)
     
+    def update_book_suggestions(self, event=None):
+        """Actualiza las sugerencias del campo de búsqueda según el texto escrito."""
+        criterion = self.book_search_combo.get()
+        if criterion not in ("titulo", "autor"):
+            self.book_search_entry['values'] = ()
+            return
+        self.book_search_entry['values'] = self.biblioteca.sugerir(
+            self.book_search_entry.get(), 8, criterion)
+    
     def show_all_books(self):
         """Muestra todos los libros."""
         self.book_search_entry.delete(0, tk.END)
@@ -532,7 +545,7 @@ class BibliotecaGUI:
         
         # Obtener libros
         if books is None:
-            books = self.biblioteca.obtener_todos_los_libros()
+            books = self.biblioteca.iterar_libros()
         
         # Poblar tabla
         for book in books:
@@ -559,7 +572,7 @@ class BibliotecaGUI:
                 self.populate_books_table()
                 self.update_statistics()
             else:
-                messagebox.showerror("Error", "No se pudo eliminar el libro")
+                messagebox.showerror("Error", "No se pudo eliminar el libro (está prestado)")
     
     # ==================== MÉTODOS DE GESTIÓN DE USUARIOS ====================
     
@@ -617,7 +630,7 @@ class BibliotecaGUI:
         
         # Obtener usuarios
         if users is None:
-            users = self.biblioteca.obtener_todos_los_usuarios()
+            users = self.biblioteca.iterar_usuarios()
         
         # Poblar tabla
         for user in users:
@@ -686,20 +699,24 @@ class BibliotecaGUI:
         for item in self.loans_tree.get_children():
             self.loans_tree.delete(item)
         
-        # Obtener préstamos activos
-        loans = self.biblioteca.obtener_prestamos_activos()
-        
-        # Poblar tabla
-        for loan in loans:
-            # Verificar si está vencido
-            loan.esta_vencido()  # Actualiza el estado si es necesario
+        # Una sola consulta de la hora para toda la tabla
+        with self.biblioteca.reloj.congelado() as now:
+            # Disparar las tareas programadas pendientes (recordatorios y vencimientos)
+            self.biblioteca.procesar_tareas_programadas()
+            # Marcar en bloque los préstamos que vencieron desde el último barrido
+            self.biblioteca.barrer_vencidos()
             
-            self.loans_tree.insert("", tk.END, values=(
-                loan.id_prestamo, loan.isbn_libro, loan.id_usuario,
-                loan.fecha_prestamo.strftime("%d/%m/%Y %H:%M"),
-                loan.fecha_vencimiento.strftime("%d/%m/%Y"),
-                loan.dias_restantes(), loan.estado
-            ))
+            # Obtener préstamos activos
+            loans = self.biblioteca.obtener_prestamos_activos()
+            
+            # Poblar tabla
+            for loan in loans:
+                self.loans_tree.insert("", tk.END, values=(
+                    loan.id_prestamo, loan.isbn_libro, loan.id_usuario,
+                    loan.fecha_prestamo.strftime("%d/%m/%Y %H:%M"),
+                    loan.fecha_vencimiento.strftime("%d/%m/%Y"),
+                    loan.dias_restantes(now), loan.estado
+                ))
     
     def populate_history_table(self):
         """Pobla la tabla de historial de préstamos."""
@@ -708,7 +725,7 @@ class BibliotecaGUI:
             self.history_tree.delete(item)
         
         # Obtener historial
-        history = self.biblioteca.obtener_historial_prestamos(20)  # Últimos 20 préstamos
+        history = self.biblioteca.iterar_historial_prestamos(20)  # Últimos 20 préstamos
         
         # Poblar tabla
         for loan in history:
@@ -188,10 +188,13 @@ def buscar_libro_consola(biblioteca):
     print("2. Por autor")
     print("3. Por categoría")
     print("4. Por ISBN")
+    print("5. Por título (tolerando errores de escritura)")
+    print("6. Por autor (tolerando errores de escritura)")
     
     try:
-        criterio_num = input("Seleccione criterio (1-4): ").strip()
-        criterios = {"1": "titulo", "2": "autor", "3": "categoria", "4": "isbn"}
+        criterio_num = input("Seleccione criterio (1-6): ").strip()
+        criterios = {"1": "titulo", "2": "autor", "3": "categoria", "4": "isbn",
+                     "5": "titulo_aprox", "6": "autor_aprox"}
         
         if criterio_num not in criterios:
             print("Criterio inválido.")
@@ -296,6 +299,7 @@ def mostrar_prestamos_activos(biblioteca):
         print("No hay préstamos activos.")
         return
     
+    ahora = biblioteca.reloj.ahora()
     for i, prestamo in enumerate(prestamos, 1):
         libro = biblioteca.obtener_libro_por_isbn(prestamo.isbn_libro)
         usuario = biblioteca.obtener_usuario_por_id(prestamo.id_usuario)
@@ -305,7 +309,7 @@ def mostrar_prestamos_activos(biblioteca):
         print(f"    Usuario: {usuario.nombre if usuario else 'Desconocido'}")
         print(f"    Fecha préstamo: {prestamo.fecha_prestamo.strftime('%d/%m/%Y %H:%M')}")
         print(f"    Vencimiento: {prestamo.fecha_vencimiento.strftime('%d/%m/%Y')}")
-        print(f"    Días restantes: {prestamo.dias_restantes()}")
+        print(f"    Días restantes: {prestamo.dias_restantes(ahora)}")
         print()
 
 def mostrar_ayuda():
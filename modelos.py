@@ -7,6 +7,10 @@ del sistema de gestión de biblioteca:
 - Libro: Representa un libro con sus atributos
 - Usuario: Representa un usuario de la biblioteca
 - Prestamo: Representa un préstamo de libro
+- ArchivoPrestamos: Registro columnar del historial de préstamos, con las
+  filas antiguas en disco
+- ValoresCompartidos: Copias únicas de autores y categorías repetidos
+- Reloj: Fuente de la hora actual, inyectable y congelable
 - BibliotecaManager: Administra todas las operaciones del sistema
 
 Autor: [Tu nombre]
@@ -14,8 +18,214 @@ Fecha: 2024
 Curso: Estructuras de Datos - Unidad 1
 """
 
+import re
+import struct
+import tempfile
+import unicodedata
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from estructuras_datos import ListaEnlazada, Pila, Cola, ArregloDinamico
+from itertools import islice
+from operator import attrgetter
+from estructuras_datos import (CatalogoIndexado, Cola, ColaPrioridad, MonticuloMinimo,
+                               RuedaTemporizacion, IndiceTrigramas, TrieSugerencias,
+                               ArbolBK, IndiceOrdenado, ArregloIndexado)
+
+# Prioridades de las solicitudes de préstamo (menor valor se atiende antes)
+PRIORIDAD_PERSONAL = 0
+PRIORIDAD_RESERVA_CURSO = 1
+PRIORIDAD_PUBLICO = 2
+PRIORIDADES_SOLICITUD = (PRIORIDAD_PERSONAL, PRIORIDAD_RESERVA_CURSO, PRIORIDAD_PUBLICO)
+
+# Campos de Libro que se pueden modificar tras registrarlo (ver actualizar_libro);
+# el ISBN no, porque es la clave del catálogo, los préstamos y las listas de espera
+CAMPOS_EDITABLES_LIBRO = ('titulo', 'autor', 'categoria', 'año_publicacion')
+# Campos de Libro con búsqueda por subcadena (sobre sus claves normalizadas)
+CAMPOS_BUSQUEDA_LIBRO = ('titulo', 'autor', 'categoria', 'isbn')
+# Campos de Libro con sugerencias por prefijo (autocompletado)
+CAMPOS_SUGERENCIA_LIBRO = ('titulo', 'autor')
+# Campos de Libro con búsqueda aproximada por palabras (criterio "<campo>_aprox")
+CAMPOS_APROXIMADOS_LIBRO = ('titulo', 'autor')
+SUFIJO_APROXIMADO = '_aprox'
+DISTANCIA_MAXIMA_APROX = 2  # Errores tolerados por palabra, como máximo
+# Criterios de búsqueda de usuarios y la clave normalizada que comparan
+CLAVES_BUSQUEDA_USUARIO = {'nombre': 'clave_nombre', 'email': 'clave_email', 'id': 'clave_id'}
+
+def normalizar_texto(texto):
+    """
+    Retorna la clave de búsqueda de un texto: sin distinguir mayúsculas ni
+    tildes ("García" y "GARCIA" dan "garcia"). Si el texto ya está
+    normalizado, retorna el mismo objeto en lugar de una copia.
+    """
+    if texto.isascii():
+        clave = texto.lower()
+    else:
+        descompuesto = unicodedata.normalize('NFD', texto.casefold())
+        clave = ''.join(caracter for caracter in descompuesto if not unicodedata.combining(caracter))
+    return texto if clave == texto else clave
+
+def distancia_tolerada(palabra):
+    """Retorna los errores tolerados al buscar una palabra: uno cada tres letras, hasta el máximo."""
+    return min(DISTANCIA_MAXIMA_APROX, len(palabra) // 3)
+
+def claves_sugerencia(clave):
+    """Retorna las claves de autocompletado de un texto normalizado: el texto completo y cada palabra."""
+    return {clave, *clave.split()}
+
+# Anticipación del recordatorio de devolución respecto al vencimiento
+DIAS_AVISO_VENCIMIENTO = 2
+
+# Marcas de tiempo: microsegundos enteros desde EPOCA, contados sobre la hora
+# local sin zona (como los datetime del sistema). Sumar un día es sumar
+# MICROSEGUNDOS_POR_DIA, sin saltos en los cambios de horario de verano.
+EPOCA = datetime(1970, 1, 1)
+MICROSEGUNDOS_POR_SEGUNDO = 1_000_000
+MICROSEGUNDOS_POR_DIA = 86400 * MICROSEGUNDOS_POR_SEGUNDO
+_UN_MICROSEGUNDO = timedelta(microseconds=1)
+
+def marca_de_fecha(fecha):
+    """Convierte un datetime (sin zona horaria) en su marca de tiempo."""
+    return (fecha - EPOCA) // _UN_MICROSEGUNDO
+
+def fecha_de_marca(marca):
+    """Convierte una marca de tiempo en el datetime correspondiente."""
+    return EPOCA + timedelta(microseconds=marca)
+
+# Estados del préstamo, guardados como enteros pequeños
+ESTADO_ACTIVO = 0
+ESTADO_DEVUELTO = 1
+ESTADO_VENCIDO = 2
+NOMBRES_ESTADO = ("activo", "devuelto", "vencido")
+CODIGOS_ESTADO = {nombre: codigo for codigo, nombre in enumerate(NOMBRES_ESTADO)}
+SIN_DEVOLUCION = -1  # Marca de devolución de un préstamo activo en el archivo
+SIN_FILA = -1  # Fila anterior del primer préstamo de un usuario o ISBN en el archivo
+
+# Registro de una fila del archivo de préstamos en su segmento en disco:
+# número, códigos de ISBN y de usuario, marca del préstamo, días, marca de
+# devolución, estado y filas anteriores del mismo ISBN y del mismo usuario
+REGISTRO_ARCHIVO = struct.Struct('<IIIqHqBqq')
+_CAMPO_ANTERIOR_ISBN = 7
+_CAMPO_ANTERIOR_USUARIO = 8
+# Marca de devolución y estado, que se reescriben al cerrar un préstamo en disco
+_REGISTRO_CIERRE = struct.Struct('<qB')
+_POSICION_CIERRE = struct.calcsize('<IIIqH')
+
+# IDs de préstamo tal como los produce formatear_id_prestamo: "P" y el número
+# con al menos tres cifras, sin ceros a la izquierda de más
+_FORMATO_ID_PRESTAMO = re.compile(r'P(?:[0-9]{3}|[1-9][0-9]{3,})')
+
+def formatear_id_prestamo(numero):
+    """Construye el ID de préstamo (P001, P002, ...) a partir de su número."""
+    return f"P{numero:03d}"
+
+def numero_id_prestamo(id_prestamo):
+    """
+    Extrae el número de un ID de préstamo.
+    
+    Raises:
+        ValueError: Si el ID no tiene el formato de formatear_id_prestamo,
+                    que es el único que se puede reconstruir desde el número
+    """
+    if not isinstance(id_prestamo, str) or _FORMATO_ID_PRESTAMO.fullmatch(id_prestamo) is None:
+        raise ValueError(f"ID de préstamo no válido: {id_prestamo!r} "
+                         f"(se espera 'P' y al menos tres dígitos, como P001)")
+    return int(id_prestamo[1:])
+
+class ValoresCompartidos:
+    """
+    Tabla de valores repetidos entre registros (autores, categorías): los
+    registros que la usan guardan una sola copia por valor distinto.
+    
+    Cada valor cuenta sus referencias y se olvida al liberar la última, así
+    que la tabla solo contiene los valores de los registros vigentes.
+    """
+    __slots__ = ('valores',)
+    
+    def __init__(self):
+        self.valores = {}  # valor -> [copia compartida, referencias]
+    
+    def compartir(self, valor):
+        """Retorna la copia compartida de un valor y le suma una referencia."""
+        entrada = self.valores.get(valor)
+        if entrada is None:
+            entrada = self.valores[valor] = [valor, 0]
+        entrada[1] += 1
+        return entrada[0]
+    
+    def liberar(self, valor):
+        """Resta una referencia a un valor y lo olvida si era la última."""
+        entrada = self.valores.get(valor)
+        if entrada is None:
+            return
+        entrada[1] -= 1
+        if not entrada[1]:
+            del self.valores[valor]
+    
+    def __contains__(self, valor):
+        return valor in self.valores
+    
+    def __len__(self):
+        return len(self.valores)
+
+class Reloj:
+    """
+    Fuente de la hora actual para el sistema de biblioteca.
+    
+    Centraliza las consultas de la hora para que puedan sustituirse en
+    pruebas y para que una operación por lotes use un único "ahora":
+    dentro de congelado() todas las consultas retornan el mismo momento.
+    """
+    __slots__ = ('fuente', 'momento_congelado')
+    
+    def __init__(self, fuente=datetime.now):
+        """
+        Args:
+            fuente: Función sin argumentos que retorna la hora actual
+        """
+        self.fuente = fuente
+        self.momento_congelado = None
+    
+    def ahora(self):
+        """Retorna la hora actual (o la congelada, si hay una)."""
+        if self.momento_congelado is not None:
+            return self.momento_congelado
+        return self.fuente()
+    
+    def marca(self):
+        """Retorna la hora actual como marca de tiempo (ver marca_de_fecha)."""
+        return marca_de_fecha(self.ahora())
+    
+    @contextmanager
+    def congelado(self, momento=None):
+        """
+        Congela la hora mientras dura el bloque with.
+        
+        Los bloques anidados conservan el momento del bloque exterior.
+        
+        Args:
+            momento: Hora a fijar (por defecto, la actual)
+        """
+        if self.momento_congelado is not None:
+            yield self.momento_congelado
+            return
+        self.momento_congelado = self.fuente() if momento is None else momento
+        try:
+            yield self.momento_congelado
+        finally:
+            self.momento_congelado = None
+
+class RelojManual(Reloj):
+    """Reloj que solo avanza cuando se le indica, para pruebas deterministas."""
+    __slots__ = ('momento',)
+    
+    def __init__(self, momento=None):
+        self.momento = datetime.now() if momento is None else momento
+        super().__init__(lambda: self.momento)
+    
+    def avanzar(self, **delta):
+        """Adelanta el reloj (acepta los argumentos de timedelta)."""
+        self.momento += timedelta(**delta)
 
 class Libro:
     """
@@ -24,21 +234,80 @@ class Libro:
     Atributos:
         isbn: Código ISBN único del libro
         titulo: Título del libro
-        autor: Autor del libro
-        categoria: Categoría o género del libro
+        autor: Autor del libro (compartido entre los libros del manager)
+        categoria: Categoría o género del libro (compartida entre los libros
+                   del manager)
         año_publicacion: Año de publicación
         disponible: Estado de disponibilidad (True/False)
         fecha_registro: Fecha cuando se registró en el sistema
+        clave_isbn, clave_titulo, clave_autor, clave_categoria: Claves de
+            búsqueda normalizadas (ver normalizar_texto), recalculadas al
+            asignar el campo correspondiente
+    
+    Los libros registrados en BibliotecaManager se modifican con
+    BibliotecaManager.actualizar_libro, que además actualiza sus índices y
+    los valores compartidos (ver compartir_valores).
     """
+    __slots__ = ('_isbn', '_titulo', '_autor', '_categoria', 'año_publicacion',
+                 'disponible', 'fecha_registro', 'clave_isbn', 'clave_titulo',
+                 'clave_autor', 'clave_categoria')
     
-    def __init__(self, isbn, titulo, autor, categoria, año_publicacion):
+    def __init__(self, isbn, titulo, autor, categoria, año_publicacion, fecha_registro=None):
         self.isbn = isbn
         self.titulo = titulo
         self.autor = autor
         self.categoria = categoria
         self.año_publicacion = año_publicacion
         self.disponible = True
-        self.fecha_registro = datetime.now()
+        self.fecha_registro = datetime.now() if fecha_registro is None else fecha_registro
+    
+    @property
+    def isbn(self):
+        return self._isbn
+    
+    @isbn.setter
+    def isbn(self, isbn):
+        self._isbn = isbn
+        self.clave_isbn = normalizar_texto(isbn)
+    
+    @property
+    def titulo(self):
+        return self._titulo
+    
+    @titulo.setter
+    def titulo(self, titulo):
+        self._titulo = titulo
+        self.clave_titulo = normalizar_texto(titulo)
+    
+    @property
+    def autor(self):
+        return self._autor
+    
+    @autor.setter
+    def autor(self, autor):
+        self._autor = autor
+        self.clave_autor = normalizar_texto(autor)
+    
+    @property
+    def categoria(self):
+        return self._categoria
+    
+    @categoria.setter
+    def categoria(self, categoria):
+        self._categoria = categoria
+        self.clave_categoria = normalizar_texto(categoria)
+    
+    def compartir_valores(self, tabla):
+        """Reemplaza autor y categoría, y sus claves, por las copias de una ValoresCompartidos."""
+        self._autor = tabla.compartir(self._autor)
+        self.clave_autor = tabla.compartir(self.clave_autor)
+        self._categoria = tabla.compartir(self._categoria)
+        self.clave_categoria = tabla.compartir(self.clave_categoria)
+    
+    def liberar_valores(self, tabla):
+        """Libera en una ValoresCompartidos las referencias tomadas por compartir_valores."""
+        for valor in (self._autor, self.clave_autor, self._categoria, self.clave_categoria):
+            tabla.liberar(valor)
     
     def __str__(self):
         """Representación en cadena del libro."""
@@ -74,17 +343,51 @@ class Usuario:
         telefono: Número de teléfono
         fecha_registro: Fecha de registro en el sistema
         prestamos_activos: Número de préstamos activos
-        historial_prestamos: Lista de préstamos realizados
+        total_prestamos: Número de préstamos realizados, activos o devueltos
+                         (el historial se lee del archivo de préstamos, ver
+                         BibliotecaManager.obtener_historial_usuario)
+        clave_id, clave_nombre, clave_email: Claves de búsqueda normalizadas
+            (ver normalizar_texto), recalculadas al asignar el campo
     """
+    __slots__ = ('_id_usuario', '_nombre', '_email', 'telefono', 'fecha_registro',
+                 'prestamos_activos', 'total_prestamos', 'clave_id',
+                 'clave_nombre', 'clave_email')
     
-    def __init__(self, id_usuario, nombre, email, telefono):
+    def __init__(self, id_usuario, nombre, email, telefono, fecha_registro=None):
         self.id_usuario = id_usuario
         self.nombre = nombre
         self.email = email
         self.telefono = telefono
-        self.fecha_registro = datetime.now()
+        self.fecha_registro = datetime.now() if fecha_registro is None else fecha_registro
         self.prestamos_activos = 0
-        self.historial_prestamos = []
+        self.total_prestamos = 0
+    
+    @property
+    def id_usuario(self):
+        return self._id_usuario
+    
+    @id_usuario.setter
+    def id_usuario(self, id_usuario):
+        self._id_usuario = id_usuario
+        self.clave_id = normalizar_texto(id_usuario)
+    
+    @property
+    def nombre(self):
+        return self._nombre
+    
+    @nombre.setter
+    def nombre(self, nombre):
+        self._nombre = nombre
+        self.clave_nombre = normalizar_texto(nombre)
+    
+    @property
+    def email(self):
+        return self._email
+    
+    @email.setter
+    def email(self, email):
+        self._email = email
+        self.clave_email = normalizar_texto(email)
     
     def __str__(self):
         """Representación en cadena del usuario."""
@@ -104,49 +407,197 @@ class Usuario:
             'telefono': self.telefono,
             'fecha_registro': self.fecha_registro.strftime("%d/%m/%Y %H:%M"),
             'prestamos_activos': self.prestamos_activos,
-            'total_prestamos': len(self.historial_prestamos)
+            'total_prestamos': self.total_prestamos
         }
 
+# Disposición de los campos numéricos de Prestamo en un único entero,
+# desde los bits menos significativos: estado, días, número, marca del
+# préstamo y marca de devolución (0 si no fue devuelto, para que el entero
+# de un préstamo activo sea más corto)
+_BITS_ESTADO = 2
+_BITS_DIAS = 16
+_BITS_NUMERO = 32
+_BITS_MARCA = 59  # Alcanza de datetime.min a datetime.max en microsegundos
+_DESPLAZAMIENTO_DIAS = _BITS_ESTADO
+_DESPLAZAMIENTO_NUMERO = _DESPLAZAMIENTO_DIAS + _BITS_DIAS
+_DESPLAZAMIENTO_PRESTAMO = _DESPLAZAMIENTO_NUMERO + _BITS_NUMERO
+_DESPLAZAMIENTO_DEVOLUCION = _DESPLAZAMIENTO_PRESTAMO + _BITS_MARCA
+_MARCA_MINIMA = marca_de_fecha(datetime.min)
+
 class Prestamo:
     """
     Clase que representa un préstamo de libro.
     
+    Para ocupar poca memoria, el número del préstamo, los días, el estado
+    y las dos marcas de tiempo (microsegundos enteros, ver marca_de_fecha)
+    se empaquetan en un solo entero; las propiedades los exponen por
+    separado, y id_prestamo, fecha_prestamo, fecha_vencimiento,
+    fecha_devolucion y estado los presentan como cadena y datetime.
+    
     Atributos:
-        id_prestamo: Identificador único del préstamo
+        id_prestamo: Identificador único del préstamo (P001, P002, ...)
+        numero: Número del préstamo (el ID sin prefijo)
         isbn_libro: ISBN del libro prestado
         id_usuario: ID del usuario que realiza el préstamo
-        fecha_prestamo: Fecha del préstamo
-        fecha_vencimiento: Fecha límite de devolución
-        fecha_devolucion: Fecha real de devolución (None si está activo)
-        estado: Estado del préstamo (activo, devuelto, vencido)
+        marca_prestamo: Momento del préstamo
+        dias_prestamo: Duración del préstamo en días
+        marca_devolucion: Momento de la devolución (None si está activo)
+        codigo_estado: ESTADO_ACTIVO, ESTADO_DEVUELTO o ESTADO_VENCIDO
     """
+    __slots__ = ('isbn_libro', 'id_usuario', '_campos')
     
-    def __init__(self, id_prestamo, isbn_libro, id_usuario, dias_prestamo=14):
+    def __init__(self, id_prestamo, isbn_libro, id_usuario, dias_prestamo=14, fecha_prestamo=None):
+        self._campos = 0
         self.id_prestamo = id_prestamo
         self.isbn_libro = isbn_libro
         self.id_usuario = id_usuario
-        self.fecha_prestamo = datetime.now()
-        self.fecha_vencimiento = self.fecha_prestamo + timedelta(days=dias_prestamo)
-        self.fecha_devolucion = None
-        self.estado = "activo"
-    
-    def devolver(self):
-        """Marca el préstamo como devuelto."""
-        self.fecha_devolucion = datetime.now()
-        self.estado = "devuelto"
-    
-    def esta_vencido(self):
-        """Verifica si el préstamo está vencido."""
-        if self.estado == "activo" and datetime.now() > self.fecha_vencimiento:
-            self.estado = "vencido"
+        self.fecha_prestamo = datetime.now() if fecha_prestamo is None else fecha_prestamo
+        self.dias_prestamo = dias_prestamo
+        self.codigo_estado = ESTADO_ACTIVO
+    
+    @classmethod
+    def desde_campos(cls, numero, isbn_libro, id_usuario, marca_prestamo, dias_prestamo,
+                     marca_devolucion, codigo_estado):
+        """Construye un préstamo a partir de sus campos ya codificados."""
+        prestamo = cls.__new__(cls)
+        prestamo._campos = 0
+        prestamo.numero = numero
+        prestamo.isbn_libro = isbn_libro
+        prestamo.id_usuario = id_usuario
+        prestamo.marca_prestamo = marca_prestamo
+        prestamo.dias_prestamo = dias_prestamo
+        prestamo.marca_devolucion = marca_devolucion
+        prestamo.codigo_estado = codigo_estado
+        return prestamo
+    
+    def _leer(self, desplazamiento, bits):
+        """Retorna un campo del entero empaquetado."""
+        return (self._campos >> desplazamiento) & ((1 << bits) - 1)
+    
+    def _escribir(self, desplazamiento, bits, valor, nombre):
+        """Reemplaza un campo del entero empaquetado, verificando que quepa."""
+        if not 0 <= valor < 1 << bits:
+            raise ValueError(f"{nombre} fuera de rango: {valor} (debe estar entre 0 y {(1 << bits) - 1})")
+        mascara = ((1 << bits) - 1) << desplazamiento
+        self._campos = (self._campos & ~mascara) | (valor << desplazamiento)
+    
+    @property
+    def numero(self):
+        """Número del préstamo."""
+        return self._leer(_DESPLAZAMIENTO_NUMERO, _BITS_NUMERO)
+    
+    @numero.setter
+    def numero(self, numero):
+        self._escribir(_DESPLAZAMIENTO_NUMERO, _BITS_NUMERO, numero, "Número de préstamo")
+    
+    @property
+    def id_prestamo(self):
+        """Identificador del préstamo (P001, P002, ...)."""
+        return formatear_id_prestamo(self.numero)
+    
+    @id_prestamo.setter
+    def id_prestamo(self, id_prestamo):
+        self.numero = numero_id_prestamo(id_prestamo)
+    
+    @property
+    def dias_prestamo(self):
+        """Duración del préstamo en días."""
+        return self._leer(_DESPLAZAMIENTO_DIAS, _BITS_DIAS)
+    
+    @dias_prestamo.setter
+    def dias_prestamo(self, dias):
+        self._escribir(_DESPLAZAMIENTO_DIAS, _BITS_DIAS, dias, "Días de préstamo")
+    
+    @property
+    def codigo_estado(self):
+        """Estado del préstamo como código entero."""
+        return self._leer(0, _BITS_ESTADO)
+    
+    @codigo_estado.setter
+    def codigo_estado(self, codigo):
+        self._escribir(0, _BITS_ESTADO, codigo, "Código de estado")
+    
+    @property
+    def marca_prestamo(self):
+        """Momento del préstamo (marca de tiempo)."""
+        return self._leer(_DESPLAZAMIENTO_PRESTAMO, _BITS_MARCA) + _MARCA_MINIMA
+    
+    @marca_prestamo.setter
+    def marca_prestamo(self, marca):
+        self._escribir(_DESPLAZAMIENTO_PRESTAMO, _BITS_MARCA, marca - _MARCA_MINIMA,
+                       "Marca de préstamo")
+    
+    @property
+    def marca_devolucion(self):
+        """Momento de la devolución (marca de tiempo; None si está activo)."""
+        valor = self._campos >> _DESPLAZAMIENTO_DEVOLUCION
+        return None if valor == 0 else valor - 1 + _MARCA_MINIMA
+    
+    @marca_devolucion.setter
+    def marca_devolucion(self, marca):
+        valor = 0 if marca is None else marca - _MARCA_MINIMA + 1
+        self._escribir(_DESPLAZAMIENTO_DEVOLUCION, _BITS_MARCA + 1, valor, "Marca de devolución")
+    
+    @property
+    def fecha_prestamo(self):
+        """Fecha del préstamo."""
+        return fecha_de_marca(self.marca_prestamo)
+    
+    @fecha_prestamo.setter
+    def fecha_prestamo(self, fecha):
+        self.marca_prestamo = marca_de_fecha(fecha)
+    
+    @property
+    def marca_vencimiento(self):
+        """Momento límite de devolución (marca de tiempo)."""
+        return self.marca_prestamo + self.dias_prestamo * MICROSEGUNDOS_POR_DIA
+    
+    @property
+    def fecha_vencimiento(self):
+        """Fecha límite de devolución."""
+        return fecha_de_marca(self.marca_vencimiento)
+    
+    @property
+    def fecha_devolucion(self):
+        """Fecha real de devolución (None si está activo)."""
+        marca = self.marca_devolucion
+        return None if marca is None else fecha_de_marca(marca)
+    
+    @fecha_devolucion.setter
+    def fecha_devolucion(self, fecha):
+        self.marca_devolucion = None if fecha is None else marca_de_fecha(fecha)
+    
+    @property
+    def estado(self):
+        """Estado del préstamo (activo, devuelto, vencido)."""
+        return NOMBRES_ESTADO[self.codigo_estado]
+    
+    @estado.setter
+    def estado(self, nombre):
+        self.codigo_estado = CODIGOS_ESTADO[nombre]
+    
+    def devolver(self, fecha=None):
+        """Marca el préstamo como devuelto (por defecto, en este momento)."""
+        self.fecha_devolucion = datetime.now() if fecha is None else fecha
+        self.codigo_estado = ESTADO_DEVUELTO
+    
+    def esta_vencido(self, ahora=None):
+        """Verifica si el préstamo está vencido a la hora indicada (por defecto, ahora)."""
+        if ahora is None:
+            ahora = datetime.now()
+        codigo = self.codigo_estado
+        if codigo == ESTADO_ACTIVO and marca_de_fecha(ahora) > self.marca_vencimiento:
+            self.codigo_estado = ESTADO_VENCIDO
             return True
-        return self.estado == "vencido"
+        return codigo == ESTADO_VENCIDO
     
-    def dias_restantes(self):
-        """Calcula los días restantes para la devolución."""
-        if self.estado != "activo":
+    def dias_restantes(self, ahora=None):
+        """Calcula los días restantes para la devolución a la hora indicada (por defecto, ahora)."""
+        if self.codigo_estado != ESTADO_ACTIVO:
             return 0
-        dias = (self.fecha_vencimiento - datetime.now()).days
+        if ahora is None:
+            ahora = datetime.now()
+        dias = (self.marca_vencimiento - marca_de_fecha(ahora)) // MICROSEGUNDOS_POR_DIA
         return max(0, dias)
     
     def __str__(self):
@@ -154,7 +605,7 @@ class Prestamo:
         return (f"Préstamo #{self.id_prestamo} | Libro: {self.isbn_libro} | "
                 f"Usuario: {self.id_usuario} | Estado: {self.estado}")
     
-    def obtener_info_completa(self):
+    def obtener_info_completa(self, ahora=None):
         """Retorna información completa del préstamo como diccionario."""
         return {
             'id_prestamo': self.id_prestamo,
@@ -164,26 +615,330 @@ class Prestamo:
             'fecha_vencimiento': self.fecha_vencimiento.strftime("%d/%m/%Y"),
             'fecha_devolucion': self.fecha_devolucion.strftime("%d/%m/%Y %H:%M") if self.fecha_devolucion else "Pendiente",
             'estado': self.estado,
-            'dias_restantes': self.dias_restantes()
+            'dias_restantes': self.dias_restantes(ahora)
         }
 
+class ArchivoPrestamos:
+    """
+    Registro columnar de todos los préstamos, en orden de creación.
+    
+    Cada campo de las filas recientes se guarda en un arreglo tipado
+    paralelo (una fila por préstamo). Cuando hay más de `filas_en_memoria`
+    filas, las más antiguas se vuelcan por bloques a un segmento temporal en
+    disco con registros de tamaño fijo (REGISTRO_ARCHIVO), de modo que la
+    memoria del archivo no crece con el historial. ISBN e ID de usuario se
+    codifican como enteros mediante diccionarios de valores distintos.
+    
+    Las filas de un mismo usuario o ISBN forman una cadena: cada fila guarda
+    la fila anterior de su usuario y de su ISBN, y en memoria solo quedan la
+    última fila y el total de filas de cada uno.
+    
+    Las filas de préstamos activos se actualizan al cerrarlos, también si ya
+    están en disco; mientras están activos, la fuente de verdad es el objeto
+    Prestamo vivo.
+    
+    Complejidad:
+        registrar: O(1) amortizado
+        cerrar: O(log n) (búsqueda binaria por número de préstamo)
+        obtener: O(1) (una lectura si la fila está en disco)
+        filas_de_usuario, filas_de_isbn: O(k) para las k filas de la clave
+    """
+    
+    def __init__(self, filas_en_memoria=4096):
+        """
+        Args:
+            filas_en_memoria: Número máximo de filas recientes en memoria
+        """
+        if filas_en_memoria < 1:
+            raise ValueError("Debe haber al menos una fila en memoria")
+        self.filas_en_memoria = filas_en_memoria
+        self.filas_en_disco = 0
+        self.segmento = None  # Archivo temporal, creado en el primer volcado
+        
+        # Columnas de las filas en memoria, en el orden de REGISTRO_ARCHIVO
+        self.numeros = array('I')              # Número del préstamo (ID sin prefijo)
+        self.codigos_isbn = array('I')
+        self.codigos_usuario = array('I')
+        self.marcas_prestamo = array('q')      # Marcas de tiempo (ver marca_de_fecha)
+        self.dias_prestamo = array('H')
+        self.marcas_devolucion = array('q')    # SIN_DEVOLUCION mientras está activo
+        self.codigos_estado = array('B')
+        self.anteriores_isbn = array('q')      # Fila anterior del mismo ISBN o SIN_FILA
+        self.anteriores_usuario = array('q')   # Fila anterior del mismo usuario o SIN_FILA
+        
+        # Codificación de valores repetidos: valor <-> código entero
+        self.isbns = []
+        self.codigo_de_isbn = {}
+        self.usuarios = []
+        self.codigo_de_usuario = {}
+        
+        # Por código: última fila de su cadena y número de filas
+        self.ultima_fila_isbn = array('q')
+        self.total_filas_isbn = array('I')
+        self.ultima_fila_usuario = array('q')
+        self.total_filas_usuario = array('I')
+    
+    def _columnas(self):
+        """Retorna las columnas en memoria en el orden de REGISTRO_ARCHIVO."""
+        return (self.numeros, self.codigos_isbn, self.codigos_usuario,
+                self.marcas_prestamo, self.dias_prestamo, self.marcas_devolucion,
+                self.codigos_estado, self.anteriores_isbn, self.anteriores_usuario)
+    
+    @staticmethod
+    def _codificar(valor, valores, codigos, ultimas, totales):
+        """Retorna el código de un valor, registrándolo si es nuevo."""
+        codigo = codigos.get(valor)
+        if codigo is None:
+            codigo = codigos[valor] = len(valores)
+            valores.append(valor)
+            ultimas.append(SIN_FILA)
+            totales.append(0)
+        return codigo
+    
+    def registrar(self, prestamo):
+        """
+        Agrega la fila de un préstamo recién creado.
+        
+        Returns:
+            Número de fila asignado
+            
+        Raises:
+            ValueError: Si el número del préstamo no es mayor que el último
+        """
+        numero = prestamo.numero
+        if self.numeros and numero <= self.numeros[-1]:
+            raise ValueError(f"Préstamo fuera de orden: {prestamo.id_prestamo}")
+        fila = len(self)
+        codigo_isbn = self._codificar(prestamo.isbn_libro, self.isbns, self.codigo_de_isbn,
+                                      self.ultima_fila_isbn, self.total_filas_isbn)
+        codigo_usuario = self._codificar(prestamo.id_usuario, self.usuarios,
+                                         self.codigo_de_usuario, self.ultima_fila_usuario,
+                                         self.total_filas_usuario)
+        self.numeros.append(numero)
+        self.codigos_isbn.append(codigo_isbn)
+        self.codigos_usuario.append(codigo_usuario)
+        self.marcas_prestamo.append(prestamo.marca_prestamo)
+        self.dias_prestamo.append(prestamo.dias_prestamo)
+        self.marcas_devolucion.append(SIN_DEVOLUCION if prestamo.marca_devolucion is None
+                                      else prestamo.marca_devolucion)
+        self.codigos_estado.append(prestamo.codigo_estado)
+        self.anteriores_isbn.append(self.ultima_fila_isbn[codigo_isbn])
+        self.anteriores_usuario.append(self.ultima_fila_usuario[codigo_usuario])
+        self.ultima_fila_isbn[codigo_isbn] = fila
+        self.total_filas_isbn[codigo_isbn] += 1
+        self.ultima_fila_usuario[codigo_usuario] = fila
+        self.total_filas_usuario[codigo_usuario] += 1
+        if len(self.numeros) > self.filas_en_memoria:
+            self._volcar()
+        return fila
+    
+    def _volcar(self):
+        """Envía al segmento en disco el bloque de filas más antiguo en memoria."""
+        if self.segmento is None:
+            self.segmento = tempfile.TemporaryFile()
+        bloque = max(1, self.filas_en_memoria // 2)
+        columnas = self._columnas()
+        self.segmento.seek(self.filas_en_disco * REGISTRO_ARCHIVO.size)
+        self.segmento.write(b''.join(REGISTRO_ARCHIVO.pack(*campos)
+                                     for campos in zip(*(columna[:bloque] for columna in columnas))))
+        for columna in columnas:
+            del columna[:bloque]
+        self.filas_en_disco += bloque
+    
+    def _leer_fila(self, fila):
+        """Retorna todos los campos de una fila, en el orden de REGISTRO_ARCHIVO."""
+        if fila >= self.filas_en_disco:
+            indice = fila - self.filas_en_disco
+            return tuple(columna[indice] for columna in self._columnas())
+        self.segmento.seek(fila * REGISTRO_ARCHIVO.size)
+        return REGISTRO_ARCHIVO.unpack(self.segmento.read(REGISTRO_ARCHIVO.size))
+    
+    def buscar_numero(self, numero):
+        """Retorna la fila de un número de préstamo o None si no está registrado."""
+        if self.numeros and numero >= self.numeros[0]:
+            indice = bisect_left(self.numeros, numero)
+            if indice < len(self.numeros) and self.numeros[indice] == numero:
+                return self.filas_en_disco + indice
+            return None
+        inicio, fin = 0, self.filas_en_disco
+        while inicio < fin:
+            medio = (inicio + fin) // 2
+            if self._leer_fila(medio)[0] < numero:
+                inicio = medio + 1
+            else:
+                fin = medio
+        if inicio < self.filas_en_disco and self._leer_fila(inicio)[0] == numero:
+            return inicio
+        return None
+    
+    def buscar_fila(self, id_prestamo):
+        """Retorna la fila de un préstamo o None si no está registrado."""
+        return self.buscar_numero(numero_id_prestamo(id_prestamo))
+    
+    def cerrar(self, prestamo):
+        """Copia al registro la devolución y el estado final de un préstamo."""
+        fila = self.buscar_fila(prestamo.id_prestamo)
+        marca = SIN_DEVOLUCION if prestamo.marca_devolucion is None else prestamo.marca_devolucion
+        if fila >= self.filas_en_disco:
+            self.marcas_devolucion[fila - self.filas_en_disco] = marca
+            self.codigos_estado[fila - self.filas_en_disco] = prestamo.codigo_estado
+        else:
+            self.segmento.seek(fila * REGISTRO_ARCHIVO.size + _POSICION_CIERRE)
+            self.segmento.write(_REGISTRO_CIERRE.pack(marca, prestamo.codigo_estado))
+    
+    def id_de(self, fila):
+        """Retorna el ID del préstamo de una fila."""
+        return formatear_id_prestamo(self._leer_fila(fila)[0])
+    
+    def obtener(self, fila):
+        """Reconstruye el Prestamo de una fila a partir de sus columnas."""
+        (numero, codigo_isbn, codigo_usuario, marca_prestamo, dias, marca_devolucion,
+         codigo_estado, _, _) = self._leer_fila(fila)
+        return Prestamo.desde_campos(
+            numero, self.isbns[codigo_isbn], self.usuarios[codigo_usuario], marca_prestamo,
+            dias, None if marca_devolucion == SIN_DEVOLUCION else marca_devolucion,
+            codigo_estado)
+    
+    def _cadena(self, fila, campo_anterior):
+        """Recorre una cadena de filas desde la última y la retorna en orden de creación."""
+        filas = []
+        while fila != SIN_FILA:
+            filas.append(fila)
+            fila = self._leer_fila(fila)[campo_anterior]
+        filas.reverse()
+        return filas
+    
+    def filas_de_usuario(self, id_usuario):
+        """Retorna las filas de un usuario en orden de creación."""
+        codigo = self.codigo_de_usuario.get(id_usuario)
+        if codigo is None:
+            return []
+        return self._cadena(self.ultima_fila_usuario[codigo], _CAMPO_ANTERIOR_USUARIO)
+    
+    def filas_de_isbn(self, isbn):
+        """Retorna las filas de un libro en orden de creación."""
+        codigo = self.codigo_de_isbn.get(isbn)
+        if codigo is None:
+            return []
+        return self._cadena(self.ultima_fila_isbn[codigo], _CAMPO_ANTERIOR_ISBN)
+    
+    def contar_filas_usuario(self, id_usuario):
+        """Retorna cuántos préstamos tiene registrados un usuario."""
+        codigo = self.codigo_de_usuario.get(id_usuario)
+        return 0 if codigo is None else self.total_filas_usuario[codigo]
+    
+    def contar_filas_isbn(self, isbn):
+        """Retorna cuántos préstamos tiene registrados un libro."""
+        codigo = self.codigo_de_isbn.get(isbn)
+        return 0 if codigo is None else self.total_filas_isbn[codigo]
+    
+    def obtener_tamaño(self):
+        """Retorna el número de préstamos registrados."""
+        return self.filas_en_disco + len(self.numeros)
+    
+    def __len__(self):
+        return self.obtener_tamaño()
+
+class HistorialPrestamos:
+    """
+    Vista de solo lectura sobre un conjunto de filas del archivo de
+    préstamos. Los préstamos activos se retornan como el objeto vivo y
+    los devueltos se reconstruyen desde el archivo al accederlos.
+    """
+    __slots__ = ('biblioteca', 'obtener_filas', 'contar_filas', 'clave')
+    
+    def __init__(self, biblioteca, obtener_filas, contar_filas, clave):
+        """
+        Args:
+            biblioteca: BibliotecaManager dueño del archivo
+            obtener_filas: Método del archivo que retorna las filas de la clave
+            contar_filas: Método del archivo que retorna cuántas filas tiene la clave
+            clave: ID de usuario o ISBN cuyas filas muestra la vista
+        """
+        self.biblioteca = biblioteca
+        self.obtener_filas = obtener_filas
+        self.contar_filas = contar_filas
+        self.clave = clave
+    
+    def __len__(self):
+        return self.contar_filas(self.clave)
+    
+    def __getitem__(self, indice):
+        return self.biblioteca._prestamo_de_fila(self.obtener_filas(self.clave)[indice])
+    
+    def __iter__(self):
+        for fila in self.obtener_filas(self.clave):
+            yield self.biblioteca._prestamo_de_fila(fila)
+
 class BibliotecaManager:
     """
     Clase principal que gestiona todas las operaciones del sistema de biblioteca.
     
     Utiliza diferentes estructuras de datos lineales:
-    - ListaEnlazada: Para almacenar libros (inserción/eliminación frecuente)
-    - ArregloDinamico: Para almacenar usuarios (acceso indexado rápido)
-    - Pila: Para historial de préstamos recientes
-    - Cola: Para solicitudes de préstamos pendientes
+    - CatalogoIndexado: Lista enlazada de libros con índice por ISBN
+    - ArregloIndexado: Arreglo dinámico de usuarios con índices por ID y email
+    - ArchivoPrestamos: Registro columnar de todos los préstamos, que
+      sirve de historial (por usuario, por libro y global)
+    - ColaPrioridad: Para solicitudes de préstamos pendientes por prioridad
+    - RuedaTemporizacion: Para recordatorios y vencimientos programados
+    - IndiceTrigramas: Para búsquedas de libros por subcadena
+    - TrieSugerencias: Para autocompletar títulos y autores según préstamos
+    
+    Todas las consultas de la hora pasan por self.reloj; las operaciones
+    por lotes la congelan para usar un único "ahora".
     """
     
-    def __init__(self):
+    def __init__(self, cola_solicitudes=None, historial_prestamos=None, temporizador=None,
+                 reloj=None, archivo_prestamos=None):
+        """
+        Args:
+            cola_solicitudes: Estructura para las solicitudes pendientes
+                              (ColaPrioridad por defecto; acepta Cola,
+                              ColaCircular u otra con la misma interfaz, en
+                              cuyo caso se atienden en orden de llegada)
+            historial_prestamos: Estructura LIFO opcional (Pila o PilaAcotada)
+                                 con los números de los préstamos recientes,
+                                 que se resuelven al consultarlos; por
+                                 defecto el historial se lee del archivo de
+                                 préstamos
+            temporizador: Planificador de tareas en el tiempo
+                          (RuedaTemporizacion sobre el reloj del manager
+                          por defecto)
+            reloj: Fuente de la hora actual (Reloj por defecto; RelojManual
+                   permite pruebas deterministas)
+            archivo_prestamos: Registro de todos los préstamos
+                               (ArchivoPrestamos por defecto)
+        """
+        if reloj is None:
+            reloj = Reloj()
+        self.reloj = reloj
+        if cola_solicitudes is None:
+            cola_solicitudes = ColaPrioridad(prioridad_por_defecto=PRIORIDAD_PUBLICO)
+        if temporizador is None:
+            temporizador = RuedaTemporizacion(reloj=reloj.marca,
+                                              resolucion=60 * MICROSEGUNDOS_POR_SEGUNDO)
+        
         # Estructuras de datos principales
-        self.libros = ListaEnlazada()          # Lista enlazada para libros
-        self.usuarios = ArregloDinamico()      # Arreglo dinámico para usuarios
-        self.historial_prestamos = Pila()     # Pila para historial reciente
-        self.cola_solicitudes = Cola()        # Cola para solicitudes pendientes
+        self.libros = CatalogoIndexado(lambda libro: libro.isbn)  # Lista enlazada indexada por ISBN
+        self.usuarios = ArregloIndexado({      # Arreglo dinámico para usuarios
+            'id_usuario': lambda usuario: usuario.id_usuario,
+            'email': lambda usuario: usuario.email
+        }, modo_eliminacion="lapida")
+        self.historial_prestamos = historial_prestamos  # Pila opcional de números de préstamo
+        if archivo_prestamos is None:
+            archivo_prestamos = ArchivoPrestamos()
+        self.archivo_prestamos = archivo_prestamos  # Registro columnar de todos los préstamos
+        # Índices de trigramas por campo de búsqueda de libros (claves normalizadas)
+        self.indices_busqueda = {campo: IndiceTrigramas() for campo in CAMPOS_BUSQUEDA_LIBRO}
+        # Tries de sugerencias por campo, ponderadas por cantidad de préstamos
+        self.sugerencias = {campo: TrieSugerencias() for campo in CAMPOS_SUGERENCIA_LIBRO}
+        # Árboles BK de las palabras distintas por campo, y los libros que contienen cada una
+        self.indices_aproximados = {campo: ArbolBK() for campo in CAMPOS_APROXIMADOS_LIBRO}
+        self.libros_por_palabra = {campo: {} for campo in CAMPOS_APROXIMADOS_LIBRO}
+        self.indice_años = IndiceOrdenado()  # ISBN por año de publicación
+        # Copias únicas de autores y categorías de los libros registrados
+        self.valores_compartidos = ValoresCompartidos()
+        self.cola_solicitudes = cola_solicitudes  # Cola de solicitudes pendientes
         
         # Contadores para IDs únicos
         self.siguiente_id_usuario = 1
@@ -191,6 +946,31 @@ class BibliotecaManager:
         
         # Préstamos activos (diccionario para búsqueda rápida)
         self.prestamos_activos = {}
+        # Préstamos activos por usuario: {id_usuario: {id_prestamo: prestamo}}
+        self.prestamos_por_usuario = {}
+        
+        # Índice de vencimientos: montículo de (marca_vencimiento, id_prestamo)
+        # con eliminación perezosa de los préstamos ya devueltos
+        self.indice_vencimientos = MonticuloMinimo()
+        self.entradas_obsoletas = 0
+        # Préstamos marcados como vencidos por barrer_vencidos, en orden de vencimiento
+        self.prestamos_vencidos = {}
+        
+        # Tareas programadas: recordatorio y vencimiento de cada préstamo activo
+        self.temporizador = temporizador
+        self.tareas_prestamo = {}  # {id_prestamo: (id_recordatorio, id_vencimiento)}
+        self.recordatorios = Cola()  # Préstamos por vencer pendientes de notificar
+        
+        # Listas de espera por ISBN (Cola FIFO de solicitudes por libro)
+        self.listas_espera = {}
+        # Métricas de espera por ISBN: [atendidas, segundos totales, segundos máximos]
+        self.metricas_espera = {}
+        
+        # Contadores de estadísticas mantenidos en cada operación
+        self.libros_disponibles = 0
+        self.libros_prestados = 0
+        self.total_prestamos = 0
+        self.total_solicitudes = 0
         
         # Inicializar con datos de ejemplo
         self._inicializar_datos_ejemplo()
@@ -206,9 +986,12 @@ class BibliotecaManager:
             ("978-84-663-2946-4", "Crónica de una muerte anunciada", "Gabriel García Márquez", "Realismo Mágico", 1981)
         ]
         
-        for isbn, titulo, autor, categoria, año in libros_ejemplo:
-            libro = Libro(isbn, titulo, autor, categoria, año)
-            self.libros.insertar_al_final(libro)
+        ahora = self.reloj.ahora()
+        self.libros.extender(Libro(isbn, titulo, autor, categoria, año, ahora)
+                             for isbn, titulo, autor, categoria, año in libros_ejemplo)
+        for libro in self.libros:
+            self._indexar_libro(libro)
+        self.libros_disponibles += len(libros_ejemplo)
         
         # Usuarios de ejemplo
         usuarios_ejemplo = [
@@ -218,7 +1001,7 @@ class BibliotecaManager:
         ]
         
         for nombre, email, telefono in usuarios_ejemplo:
-            usuario = Usuario(f"U{self.siguiente_id_usuario:03d}", nombre, email, telefono)
+            usuario = Usuario(f"U{self.siguiente_id_usuario:03d}", nombre, email, telefono, ahora)
             self.usuarios.agregar(usuario)
             self.siguiente_id_usuario += 1
     
@@ -239,53 +1022,172 @@ class BibliotecaManager:
             True si se registró correctamente, False si ya existe
         """
         # Verificar si el libro ya existe
-        libros_existentes = self.libros.buscar(lambda l: l.isbn == isbn)
-        if libros_existentes:
+        if self.libros.contiene(isbn):
             return False
         
         # Crear y registrar el nuevo libro
-        nuevo_libro = Libro(isbn, titulo, autor, categoria, año_publicacion)
+        nuevo_libro = Libro(isbn, titulo, autor, categoria, año_publicacion, self.reloj.ahora())
         self.libros.insertar_al_final(nuevo_libro)
+        self._indexar_libro(nuevo_libro)
+        self.libros_disponibles += 1
         return True
     
+    def _indexar_libro(self, libro):
+        """
+        Agrega un libro a los índices de búsqueda y de sugerencias, y
+        reemplaza su autor y categoría por las copias compartidas.
+        """
+        libro.compartir_valores(self.valores_compartidos)
+        for campo, indice in self.indices_busqueda.items():
+            indice.agregar(libro.isbn, getattr(libro, 'clave_' + campo))
+        prestamos = self.archivo_prestamos.contar_filas_isbn(libro.isbn)
+        for campo, trie in self.sugerencias.items():
+            trie.agregar(getattr(libro, campo),
+                         claves_sugerencia(getattr(libro, 'clave_' + campo)), prestamos)
+        self.indice_años.agregar(libro.año_publicacion, libro.isbn)
+        for campo, arbol in self.indices_aproximados.items():
+            libros_por_palabra = self.libros_por_palabra[campo]
+            for palabra in getattr(libro, 'clave_' + campo).split():
+                if palabra not in libros_por_palabra:
+                    libros_por_palabra[palabra] = {}
+                    arbol.agregar(palabra)
+                libros_por_palabra[palabra][libro.isbn] = None
+    
+    def _desindexar_libro(self, libro):
+        """
+        Quita un libro de los índices de búsqueda y de sugerencias, y libera
+        sus valores compartidos.
+        """
+        for indice in self.indices_busqueda.values():
+            indice.eliminar(libro.isbn)
+        prestamos = self.archivo_prestamos.contar_filas_isbn(libro.isbn)
+        for campo, trie in self.sugerencias.items():
+            trie.quitar(getattr(libro, campo), prestamos)
+        self.indice_años.eliminar(libro.año_publicacion, libro.isbn)
+        for campo, arbol in self.indices_aproximados.items():
+            libros_por_palabra = self.libros_por_palabra[campo]
+            for palabra in set(getattr(libro, 'clave_' + campo).split()):
+                libros = libros_por_palabra[palabra]
+                del libros[libro.isbn]
+                if not libros:
+                    del libros_por_palabra[palabra]
+                    arbol.eliminar(palabra)
+        libro.liberar_valores(self.valores_compartidos)
+    
     def buscar_libros(self, criterio="", valor=""):
         """
         Busca libros por diferentes criterios.
         
         Args:
-            criterio: Tipo de búsqueda (titulo, autor, categoria, isbn)
-            valor: Valor a buscar
+            criterio: Tipo de búsqueda (titulo, autor, categoria, isbn), o
+                      titulo_aprox / autor_aprox para tolerar errores de
+                      escritura en cada palabra
+            valor: Valor a buscar (sin distinguir mayúsculas ni tildes)
             
         Returns:
-            Lista de libros que coinciden con el criterio
+            Lista de libros que coinciden con el criterio, en orden de
+            registro (en la búsqueda aproximada, de la coincidencia más
+            cercana a la más lejana)
         """
         if not criterio or not valor:
             return self.libros.obtener_todos()
         
-        valor_lower = valor.lower()
-        
-        def buscar_por_criterio(libro):
-            if criterio == "titulo":
-                return valor_lower in libro.titulo.lower()
-            elif criterio == "autor":
-                return valor_lower in libro.autor.lower()
-            elif criterio == "categoria":
-                return valor_lower in libro.categoria.lower()
-            elif criterio == "isbn":
-                return valor_lower in libro.isbn.lower()
-            return False
+        if criterio.endswith(SUFIJO_APROXIMADO):
+            campo = criterio[:-len(SUFIJO_APROXIMADO)]
+            if campo not in self.indices_aproximados:
+                return []
+            return self._buscar_aproximado(campo, valor)
+        indice = self.indices_busqueda.get(criterio)
+        if indice is None:
+            return []
+        return [self.libros.obtener(isbn) for isbn in indice.buscar(normalizar_texto(valor))]
+    
+    def _buscar_aproximado(self, campo, valor):
+        """
+        Busca los libros que tienen, para cada palabra de la consulta, una
+        palabra del campo a distancia de edición tolerable (ver
+        distancia_tolerada), ordenados por la suma de esas distancias.
+        """
+        arbol = self.indices_aproximados[campo]
+        libros_por_palabra = self.libros_por_palabra[campo]
+        distancias = None
+        for palabra in normalizar_texto(valor).split():
+            encontrados = {}
+            for distancia, similar in arbol.buscar(palabra, distancia_tolerada(palabra)):
+                for isbn in libros_por_palabra[similar]:
+                    encontrados.setdefault(isbn, distancia)  # La más cercana llega primero
+            if distancias is None:
+                distancias = encontrados
+            else:
+                distancias = {isbn: distancia + encontrados[isbn]
+                              for isbn, distancia in distancias.items() if isbn in encontrados}
+            if not distancias:
+                return []
+        if distancias is None:
+            return []
+        return [self.libros.obtener(isbn) for isbn in sorted(distancias, key=distancias.get)]
+    
+    def buscar_libros_por_rango(self, desde=None, hasta=None):
+        """
+        Busca los libros publicados entre dos años.
+        
+        Args:
+            desde: Primer año incluido (None para no acotar)
+            hasta: Último año incluido (None para no acotar)
+            
+        Returns:
+            Lista de libros ordenados por año de publicación (en el mismo
+            año, en orden de registro)
+        """
+        return [self.libros.obtener(isbn) for isbn in self.indice_años.rango(desde, hasta)]
+    
+    def sugerir(self, prefijo, k=5, campo=None):
+        """
+        Sugiere títulos y autores que empiezan por un prefijo (en el texto
+        completo o en cualquiera de sus palabras), de más a menos prestados.
+        Como en la búsqueda, no se distinguen mayúsculas ni tildes.
         
-        return self.libros.buscar(buscar_por_criterio)
+        Args:
+            prefijo: Texto escrito hasta el momento
+            k: Número máximo de sugerencias (hasta la capacidad de los tries)
+            campo: 'titulo' o 'autor' para limitar el tipo de sugerencia
+                   (None para mezclar ambos)
+            
+        Returns:
+            Lista de textos sugeridos
+            
+        Raises:
+            ValueError: Si el campo no admite sugerencias
+        """
+        if campo is not None and campo not in self.sugerencias:
+            raise ValueError(f"Campo de sugerencia no válido: {campo}")
+        prefijo = normalizar_texto(prefijo.lstrip())
+        if not prefijo:
+            return []
+        if campo is not None:
+            return self.sugerencias[campo].sugerir(prefijo, k)
+        candidatos = []
+        for trie in self.sugerencias.values():
+            candidatos.extend((-trie.peso(valor), valor) for valor in trie.sugerir(prefijo, k))
+        candidatos.sort(key=lambda candidato: candidato[0])  # Estable: títulos primero en empates
+        sugerencias = []
+        for _, valor in candidatos:
+            if valor not in sugerencias:
+                sugerencias.append(valor)
+        return sugerencias[:k]
     
     def obtener_libro_por_isbn(self, isbn):
         """Obtiene un libro específico por su ISBN."""
-        libros_encontrados = self.libros.buscar(lambda l: l.isbn == isbn)
-        return libros_encontrados[0] if libros_encontrados else None
+        return self.libros.obtener(isbn)
     
     def obtener_todos_los_libros(self):
         """Retorna todos los libros registrados."""
         return self.libros.obtener_todos()
     
+    def iterar_libros(self):
+        """Recorre los libros registrados sin crear una copia de la lista."""
+        return iter(self.libros)
+    
     def eliminar_libro(self, isbn):
         """
         Elimina un libro del sistema.
@@ -294,9 +1196,49 @@ class BibliotecaManager:
             isbn: ISBN del libro a eliminar
             
         Returns:
-            True si se eliminó correctamente, False si no se encontró
+            True si se eliminó correctamente, False si no se encontró o
+            está prestado (su préstamo activo quedaría sin libro)
         """
-        return self.libros.eliminar(lambda l: l.isbn == isbn)
+        libro = self.libros.obtener(isbn)
+        if libro is None or not libro.disponible:
+            return False
+        
+        self.libros_disponibles -= 1
+        self.listas_espera.pop(isbn, None)
+        self._desindexar_libro(libro)
+        return self.libros.eliminar_por_clave(isbn)
+    
+    def actualizar_libro(self, isbn, **campos):
+        """
+        Modifica los datos de un libro registrado y lo reindexa.
+        
+        Asignar directamente los campos de un libro solo recalcula sus claves
+        normalizadas; este método además lo retira de los índices de
+        búsqueda, sugerencias, búsqueda aproximada y años con sus valores
+        anteriores y lo vuelve a agregar con los nuevos.
+        
+        Args:
+            isbn: ISBN del libro a modificar
+            **campos: Nuevos valores (titulo, autor, categoria o año_publicacion)
+            
+        Returns:
+            True si se actualizó, False si el libro no existe
+            
+        Raises:
+            ValueError: Si se indica un campo que no se puede modificar
+        """
+        no_editables = sorted(set(campos).difference(CAMPOS_EDITABLES_LIBRO))
+        if no_editables:
+            raise ValueError(f"Campos no modificables: {', '.join(no_editables)}")
+        libro = self.libros.obtener(isbn)
+        if libro is None:
+            return False
+        
+        self._desindexar_libro(libro)
+        for campo, valor in campos.items():
+            setattr(libro, campo, valor)
+        self._indexar_libro(libro)
+        return True
     
     # ==================== GESTIÓN DE USUARIOS ====================
     
@@ -313,13 +1255,12 @@ class BibliotecaManager:
             ID del usuario creado o None si el email ya existe
         """
         # Verificar si el usuario ya existe por email
-        usuarios_existentes = self.usuarios.buscar(lambda u: u.email == email)
-        if usuarios_existentes:
+        if self.usuarios.contiene('email', email):
             return None
         
         # Crear nuevo usuario
         id_usuario = f"U{self.siguiente_id_usuario:03d}"
-        nuevo_usuario = Usuario(id_usuario, nombre, email, telefono)
+        nuevo_usuario = Usuario(id_usuario, nombre, email, telefono, self.reloj.ahora())
         self.usuarios.agregar(nuevo_usuario)
         self.siguiente_id_usuario += 1
         
@@ -331,7 +1272,7 @@ class BibliotecaManager:
         
         Args:
             criterio: Tipo de búsqueda (nombre, email, id)
-            valor: Valor a buscar
+            valor: Valor a buscar (sin distinguir mayúsculas ni tildes)
             
         Returns:
             Lista de usuarios que coinciden con el criterio
@@ -339,28 +1280,55 @@ class BibliotecaManager:
         if not criterio or not valor:
             return self.usuarios.obtener_todos()
         
-        valor_lower = valor.lower()
-        
-        def buscar_por_criterio(usuario):
-            if criterio == "nombre":
-                return valor_lower in usuario.nombre.lower()
-            elif criterio == "email":
-                return valor_lower in usuario.email.lower()
-            elif criterio == "id":
-                return valor_lower in usuario.id_usuario.lower()
-            return False
-        
-        return self.usuarios.buscar(buscar_por_criterio)
+        atributo = CLAVES_BUSQUEDA_USUARIO.get(criterio)
+        if atributo is None:
+            return []
+        valor = normalizar_texto(valor)
+        obtener_clave = attrgetter(atributo)
+        return self.usuarios.buscar(lambda usuario: valor in obtener_clave(usuario))
     
     def obtener_usuario_por_id(self, id_usuario):
         """Obtiene un usuario específico por su ID."""
-        usuarios_encontrados = self.usuarios.buscar(lambda u: u.id_usuario == id_usuario)
-        return usuarios_encontrados[0] if usuarios_encontrados else None
+        return self.usuarios.obtener_por('id_usuario', id_usuario)
+    
+    def obtener_info_usuario(self, id_usuario):
+        """
+        Obtiene la información completa de un usuario.
+        
+        Returns:
+            Diccionario con la información o None si el usuario no existe
+        """
+        usuario = self.obtener_usuario_por_id(id_usuario)
+        if usuario is None:
+            return None
+        return usuario.obtener_info_completa()
+    
+    def eliminar_usuario(self, id_usuario):
+        """
+        Elimina un usuario del sistema.
+        
+        Args:
+            id_usuario: ID del usuario a eliminar
+            
+        Returns:
+            True si se eliminó, False si no existe o tiene préstamos activos
+        """
+        indice = self.usuarios.indice_de('id_usuario', id_usuario)
+        if indice is None:
+            return False
+        if self.usuarios.obtener(indice).prestamos_activos > 0:
+            return False
+        self.usuarios.eliminar(indice)
+        return True
     
     def obtener_todos_los_usuarios(self):
         """Retorna todos los usuarios registrados."""
         return self.usuarios.obtener_todos()
     
+    def iterar_usuarios(self):
+        """Recorre los usuarios registrados sin crear una copia del arreglo."""
+        return iter(self.usuarios)
+    
     # ==================== GESTIÓN DE PRÉSTAMOS ====================
     
     def realizar_prestamo(self, isbn_libro, id_usuario):
@@ -384,18 +1352,37 @@ class BibliotecaManager:
         if not usuario:
             return None
         
-        # Crear el préstamo
-        id_prestamo = f"P{self.siguiente_id_prestamo:03d}"
-        prestamo = Prestamo(id_prestamo, isbn_libro, id_usuario)
+        return self._crear_prestamo(libro, usuario)
+    
+    def _crear_prestamo(self, libro, usuario):
+        """
+        Crea un préstamo para un libro disponible y un usuario ya validados.
+        
+        Returns:
+            ID del préstamo creado
+        """
+        id_prestamo = formatear_id_prestamo(self.siguiente_id_prestamo)
+        prestamo = Prestamo(id_prestamo, libro.isbn, usuario.id_usuario,
+                            fecha_prestamo=self.reloj.ahora())
         
         # Actualizar estados
         libro.disponible = False
+        self.libros_disponibles -= 1
+        self.libros_prestados += 1
+        self.total_prestamos += 1
         usuario.prestamos_activos += 1
-        usuario.historial_prestamos.append(prestamo)
+        usuario.total_prestamos += 1
         
         # Almacenar en estructuras de datos
         self.prestamos_activos[id_prestamo] = prestamo
-        self.historial_prestamos.apilar(prestamo)
+        self.prestamos_por_usuario.setdefault(usuario.id_usuario, {})[id_prestamo] = prestamo
+        self.indice_vencimientos.insertar((prestamo.marca_vencimiento, id_prestamo))
+        self._programar_tareas_prestamo(prestamo)
+        self.archivo_prestamos.registrar(prestamo)
+        for campo, trie in self.sugerencias.items():
+            trie.incrementar(getattr(libro, campo))
+        if self.historial_prestamos is not None:
+            self.historial_prestamos.apilar(prestamo.numero)
         
         self.siguiente_id_prestamo += 1
         return id_prestamo
@@ -413,90 +1400,582 @@ class BibliotecaManager:
         if id_prestamo not in self.prestamos_activos:
             return False
         
-        prestamo = self.prestamos_activos[id_prestamo]
-        
+        self._procesar_devolucion(self.prestamos_activos[id_prestamo])
+        return True
+    
+    def _procesar_devolucion(self, prestamo):
+        """Cierra un préstamo activo y libera el libro para la lista de espera."""
         # Actualizar estados
-        prestamo.devolver()
+        prestamo.devolver(self.reloj.ahora())
+        self.archivo_prestamos.cerrar(prestamo)
         libro = self.obtener_libro_por_isbn(prestamo.isbn_libro)
         usuario = self.obtener_usuario_por_id(prestamo.id_usuario)
         
-        if libro:
-            libro.disponible = True
         if usuario:
             usuario.prestamos_activos -= 1
         
         # Remover de préstamos activos
-        del self.prestamos_activos[id_prestamo]
+        del self.prestamos_activos[prestamo.id_prestamo]
+        prestamos_usuario = self.prestamos_por_usuario[prestamo.id_usuario]
+        del prestamos_usuario[prestamo.id_prestamo]
+        if not prestamos_usuario:
+            del self.prestamos_por_usuario[prestamo.id_usuario]
+        if self.prestamos_vencidos.pop(prestamo.id_prestamo, None) is None:
+            self._descartar_entrada_vencimiento()
+        for id_tarea in self.tareas_prestamo.pop(prestamo.id_prestamo, ()):
+            self.temporizador.cancelar(id_tarea)
         
-        return True
+        if libro:
+            libro.disponible = True
+            self.libros_disponibles += 1
+            self.libros_prestados -= 1
+            self._atender_lista_espera(libro)
+    
+    def realizar_prestamos_lote(self, pares):
+        """
+        Realiza varios préstamos con semántica de todo o nada.
+        
+        El lote completo se valida en una sola pasada (resolviendo cada
+        libro y usuario una vez); si algún elemento es inválido no se
+        realiza ningún préstamo.
+        
+        Args:
+            pares: Iterable de tuplas (isbn_libro, id_usuario)
+            
+        Returns:
+            Diccionario con 'exitoso' (True si se aplicó el lote) y
+            'resultados': lista con isbn_libro, id_usuario, prestamo_id y
+            error (None si el elemento es válido) por cada par
+        """
+        libros = {}
+        usuarios = {}
+        solicitados = set()
+        resultados = []
+        valido = True
+        for isbn, id_usuario in pares:
+            if isbn not in libros:
+                libros[isbn] = self.obtener_libro_por_isbn(isbn)
+            if id_usuario not in usuarios:
+                usuarios[id_usuario] = self.obtener_usuario_por_id(id_usuario)
+            libro = libros[isbn]
+            
+            if libro is None:
+                error = "Libro no encontrado"
+            elif not libro.disponible:
+                error = "Libro no disponible"
+            elif isbn in solicitados:
+                error = "Libro repetido en el lote"
+            elif usuarios[id_usuario] is None:
+                error = "Usuario no encontrado"
+            else:
+                error = None
+            solicitados.add(isbn)
+            valido = valido and error is None
+            resultados.append({
+                'isbn_libro': isbn,
+                'id_usuario': id_usuario,
+                'prestamo_id': None,
+                'error': error
+            })
+        
+        if valido:
+            with self.reloj.congelado():
+                for resultado in resultados:
+                    resultado['prestamo_id'] = self._crear_prestamo(
+                        libros[resultado['isbn_libro']], usuarios[resultado['id_usuario']])
+        
+        return {'exitoso': valido, 'resultados': resultados}
+    
+    def devolver_lote(self, ids_prestamo):
+        """
+        Procesa varias devoluciones con semántica de todo o nada.
+        
+        Args:
+            ids_prestamo: Iterable de IDs de préstamos a devolver
+            
+        Returns:
+            Diccionario con 'exitoso' (True si se aplicó el lote) y
+            'resultados': lista con id_prestamo y error (None si el
+            elemento es válido) por cada ID
+        """
+        vistos = set()
+        resultados = []
+        valido = True
+        for id_prestamo in ids_prestamo:
+            if id_prestamo not in self.prestamos_activos:
+                error = "Préstamo no encontrado"
+            elif id_prestamo in vistos:
+                error = "Préstamo repetido en el lote"
+            else:
+                error = None
+            vistos.add(id_prestamo)
+            valido = valido and error is None
+            resultados.append({'id_prestamo': id_prestamo, 'error': error})
+        
+        if valido:
+            with self.reloj.congelado():
+                for resultado in resultados:
+                    self._procesar_devolucion(self.prestamos_activos[resultado['id_prestamo']])
+        
+        return {'exitoso': valido, 'resultados': resultados}
     
     def obtener_prestamos_activos(self):
         """Retorna lista de todos los préstamos activos."""
         return list(self.prestamos_activos.values())
     
-    def obtener_historial_prestamos(self, limite=10):
+    def obtener_historial_prestamos(self, limite=10, desplazamiento=0):
         """
-        Obtiene el historial reciente de préstamos.
+        Obtiene el historial de préstamos, del más reciente al más antiguo.
         
         Args:
             limite: Número máximo de préstamos a retornar
+            desplazamiento: Número de préstamos recientes a omitir (para
+                            paginar; los valores negativos cuentan como 0)
             
         Returns:
-            Lista de préstamos recientes
+            Lista de préstamos de la página solicitada
+        """
+        desplazamiento = max(desplazamiento, 0)
+        if self.historial_prestamos is not None:
+            return [self._prestamo_de_numero(numero)
+                    for numero in self.historial_prestamos.obtener_pagina(limite, desplazamiento)]
+        ultima = len(self.archivo_prestamos) - 1 - desplazamiento
+        return [self._prestamo_de_fila(fila)
+                for fila in range(ultima, max(ultima - limite, -1), -1)]
+    
+    def iterar_historial_prestamos(self, limite=None):
+        """
+        Recorre el historial de préstamos del más reciente al más antiguo.
+        
+        Args:
+            limite: Número máximo de préstamos a recorrer (None para todos)
+        """
+        if self.historial_prestamos is not None:
+            return (self._prestamo_de_numero(numero)
+                    for numero in islice(self.historial_prestamos, limite))
+        filas = range(len(self.archivo_prestamos) - 1, -1, -1)
+        return (self._prestamo_de_fila(fila) for fila in islice(filas, limite))
+    
+    def _prestamo_de_fila(self, fila):
+        """Retorna el préstamo de una fila del archivo (el objeto vivo si está activo)."""
+        prestamo = self.prestamos_activos.get(self.archivo_prestamos.id_de(fila))
+        return prestamo if prestamo is not None else self.archivo_prestamos.obtener(fila)
+    
+    def _prestamo_de_numero(self, numero):
+        """Retorna el préstamo con un número dado, con su estado actual."""
+        prestamo = self.prestamos_activos.get(formatear_id_prestamo(numero))
+        if prestamo is not None:
+            return prestamo
+        return self.archivo_prestamos.obtener(self.archivo_prestamos.buscar_numero(numero))
+    
+    def obtener_historial_usuario(self, id_usuario):
+        """
+        Obtiene todos los préstamos de un usuario, del más antiguo al más
+        reciente, como una vista sobre el archivo. La vista se crea en cada
+        consulta, así que los objetos Usuario no guardan referencias al
+        manager.
         """
-        historial = self.historial_prestamos.obtener_todos()
-        return historial[:limite]
+        return HistorialPrestamos(self, self.archivo_prestamos.filas_de_usuario,
+                                  self.archivo_prestamos.contar_filas_usuario, id_usuario)
+    
+    def obtener_historial_libro(self, isbn):
+        """
+        Obtiene todos los préstamos de un libro, del más antiguo al más
+        reciente, usando el índice por ISBN del archivo.
+        """
+        return HistorialPrestamos(self, self.archivo_prestamos.filas_de_isbn,
+                                  self.archivo_prestamos.contar_filas_isbn, isbn)
     
     def obtener_prestamos_usuario(self, id_usuario):
-        """Obtiene los préstamos activos de un usuario específico."""
-        return [p for p in self.prestamos_activos.values() if p.id_usuario == id_usuario]
+        """
+        Obtiene los préstamos activos de un usuario específico.
+        
+        Usa el índice por usuario, por lo que el costo es proporcional a
+        los préstamos del propio usuario.
+        """
+        return list(self.prestamos_por_usuario.get(id_usuario, {}).values())
+    
+    # ==================== VENCIMIENTOS ====================
+    
+    def _descartar_entrada_vencimiento(self):
+        """
+        Registra que una entrada del índice de vencimientos quedó obsoleta
+        y reconstruye el montículo cuando las obsoletas son mayoría.
+        """
+        self.entradas_obsoletas += 1
+        if self.entradas_obsoletas * 2 > self.indice_vencimientos.obtener_tamaño():
+            self.indice_vencimientos.filtrar(lambda entrada: entrada[1] in self.prestamos_activos)
+            self.entradas_obsoletas = 0
+    
+    def barrer_vencidos(self, fecha=None):
+        """
+        Marca como vencidos, en bloque, los préstamos cuya fecha de
+        vencimiento ya pasó.
+        
+        Extrae del índice solo las entradas vencidas, por lo que el costo
+        es O(k log n) para k préstamos vencidos desde el último barrido.
+        
+        Args:
+            fecha: Momento de referencia (por defecto, ahora)
+            
+        Returns:
+            Lista de préstamos que pasaron a estado vencido
+        """
+        if fecha is None:
+            fecha = self.reloj.ahora()
+        limite = marca_de_fecha(fecha)
+        nuevos = []
+        while not self.indice_vencimientos.esta_vacio():
+            vencimiento, id_prestamo = self.indice_vencimientos.ver_minimo()
+            if vencimiento >= limite:
+                break
+            self.indice_vencimientos.extraer()
+            prestamo = self.prestamos_activos.get(id_prestamo)
+            if prestamo is None:
+                self.entradas_obsoletas -= 1
+                continue
+            prestamo.codigo_estado = ESTADO_VENCIDO
+            self.prestamos_vencidos[id_prestamo] = prestamo
+            nuevos.append(prestamo)
+        return nuevos
+    
+    def obtener_prestamos_vencidos(self, fecha=None):
+        """
+        Obtiene los préstamos activos vencidos a una fecha, ordenados por
+        fecha de vencimiento.
+        
+        Args:
+            fecha: Momento de referencia (por defecto, ahora)
+        """
+        if fecha is None:
+            fecha = self.reloj.ahora()
+        limite = marca_de_fecha(fecha)
+        vencidos = []
+        for prestamo in self.prestamos_vencidos.values():
+            if prestamo.marca_vencimiento >= limite:
+                break
+            vencidos.append(prestamo)
+        for vencimiento, id_prestamo in self.indice_vencimientos.recorrer_hasta(
+                limite, clave=lambda entrada: entrada[0]):
+            if vencimiento < limite and id_prestamo in self.prestamos_activos:
+                vencidos.append(self.prestamos_activos[id_prestamo])
+        vencidos.sort(key=lambda prestamo: prestamo.marca_vencimiento)
+        return vencidos
+    
+    def obtener_prestamos_por_vencer(self, dias, fecha=None):
+        """
+        Obtiene los préstamos activos que vencen en los próximos días,
+        ordenados por fecha de vencimiento.
+        
+        Args:
+            dias: Tamaño de la ventana en días
+            fecha: Inicio de la ventana (por defecto, ahora)
+        """
+        if fecha is None:
+            fecha = self.reloj.ahora()
+        desde = marca_de_fecha(fecha)
+        hasta = desde + dias * MICROSEGUNDOS_POR_DIA
+        por_vencer = [
+            self.prestamos_activos[id_prestamo]
+            for vencimiento, id_prestamo in self.indice_vencimientos.recorrer_hasta(
+                hasta, clave=lambda entrada: entrada[0])
+            if vencimiento >= desde and id_prestamo in self.prestamos_activos
+        ]
+        por_vencer.sort(key=lambda prestamo: prestamo.marca_vencimiento)
+        return por_vencer
+    
+    # ==================== TAREAS PROGRAMADAS ====================
+    
+    def _programar_tareas_prestamo(self, prestamo):
+        """Registra el recordatorio y el vencimiento de un préstamo nuevo."""
+        vencimiento = prestamo.marca_vencimiento
+        aviso = vencimiento - DIAS_AVISO_VENCIMIENTO * MICROSEGUNDOS_POR_DIA
+        self.tareas_prestamo[prestamo.id_prestamo] = (
+            self.temporizador.programar(aviso, self._recordar_vencimientos,
+                                        prestamo.id_prestamo),
+            self.temporizador.programar(vencimiento, self._vencer_prestamos,
+                                        prestamo.id_prestamo)
+        )
+    
+    def _recordar_vencimientos(self, ids_prestamo, momento):
+        """Encola, en lote, los préstamos cuyo vencimiento está próximo."""
+        for id_prestamo in ids_prestamo:
+            prestamo = self.prestamos_activos.get(id_prestamo)
+            if prestamo is not None:
+                self.recordatorios.encolar(prestamo)
+    
+    def _vencer_prestamos(self, ids_prestamo, momento):
+        """Pasa a vencido, en un solo barrido, el lote de préstamos del tick."""
+        self.barrer_vencidos(fecha_de_marca(momento))
+    
+    def programar_tarea(self, fecha, accion, dato):
+        """
+        Programa una tarea para una fecha.
+        
+        Args:
+            fecha: Momento a partir del cual se dispara la tarea
+            accion: Función que recibe (datos, momento) con el lote de datos
+                    de las tareas que vencen en el mismo tick
+            dato: Valor que se entrega a la acción
+            
+        Returns:
+            ID de la tarea, para cancelarla con cancelar_tarea
+        """
+        return self.temporizador.programar(marca_de_fecha(fecha), accion, dato)
+    
+    def cancelar_tarea(self, id_tarea):
+        """Cancela una tarea programada. Retorna True si estaba pendiente."""
+        return self.temporizador.cancelar(id_tarea)
+    
+    def procesar_tareas_programadas(self, fecha=None):
+        """
+        Dispara las tareas vencidas hasta una fecha.
+        
+        Args:
+            fecha: Momento hasta el cual avanzar (por defecto, el del reloj
+                   del temporizador)
+            
+        Returns:
+            Número de tareas disparadas
+        """
+        return self.temporizador.avanzar(None if fecha is None else marca_de_fecha(fecha))
+    
+    def obtener_recordatorios(self):
+        """Retorna y vacía la lista de préstamos pendientes de recordatorio."""
+        return self.recordatorios.desencolar_lote(self.recordatorios.obtener_tamaño())
     
     # ==================== GESTIÓN DE SOLICITUDES ====================
     
-    def agregar_solicitud_prestamo(self, isbn_libro, id_usuario):
-        """Agrega una solicitud de préstamo a la cola."""
+    def agregar_solicitud_prestamo(self, isbn_libro, id_usuario, prioridad=PRIORIDAD_PUBLICO):
+        """
+        Agrega una solicitud de préstamo a la cola.
+        
+        Args:
+            isbn_libro: ISBN del libro solicitado
+            id_usuario: ID del usuario que solicita
+            prioridad: PRIORIDAD_PERSONAL, PRIORIDAD_RESERVA_CURSO o
+                       PRIORIDAD_PUBLICO (por defecto)
+                       
+        Raises:
+            ValueError: Si la prioridad no es válida
+        """
+        if prioridad not in PRIORIDADES_SOLICITUD:
+            raise ValueError(f"Prioridad no válida: {prioridad}")
         solicitud = {
             'isbn_libro': isbn_libro,
             'id_usuario': id_usuario,
-            'fecha_solicitud': datetime.now()
+            'prioridad': prioridad,
+            'fecha_solicitud': self.reloj.ahora()
         }
-        self.cola_solicitudes.encolar(solicitud)
+        if isinstance(self.cola_solicitudes, ColaPrioridad):
+            self.cola_solicitudes.encolar(solicitud, prioridad)
+        else:
+            self.cola_solicitudes.encolar(solicitud)
+        self.total_solicitudes += 1
     
     def procesar_siguiente_solicitud(self):
-        """Procesa la siguiente solicitud en la cola."""
+        """
+        Procesa la siguiente solicitud en la cola (la de mayor prioridad).
+        
+        Si el libro existe pero está prestado, la solicitud pasa a la lista
+        de espera de ese ISBN y se atenderá automáticamente al devolverse.
+        """
         if self.cola_solicitudes.esta_vacia():
             return None
         
         solicitud = self.cola_solicitudes.desencolar()
         
-        # Intentar realizar el préstamo
-        id_prestamo = self.realizar_prestamo(solicitud['isbn_libro'], solicitud['id_usuario'])
+        libro = self.obtener_libro_por_isbn(solicitud['isbn_libro'])
+        usuario = self.obtener_usuario_por_id(solicitud['id_usuario'])
+        id_prestamo = None
+        en_espera = False
+        
+        if libro and usuario:
+            if libro.disponible:
+                id_prestamo = self._crear_prestamo(libro, usuario)
+                self._registrar_espera(solicitud)
+            else:
+                self._agregar_a_lista_espera(solicitud)
+                en_espera = True
         
         return {
             'solicitud': solicitud,
             'prestamo_id': id_prestamo,
-            'exitoso': id_prestamo is not None
+            'exitoso': id_prestamo is not None,
+            'en_espera': en_espera
+        }
+    
+    def procesar_solicitudes_lote(self, max_n):
+        """
+        Procesa hasta max_n solicitudes de la cola en un solo paso.
+        
+        Las solicitudes se agrupan por ISBN, de modo que cada libro y cada
+        usuario se resuelven una sola vez por lote. Dentro de cada grupo se
+        respeta el orden de atención de la cola: el primer solicitante
+        válido recibe el libro si está disponible y el resto pasa a la
+        lista de espera del libro.
+        
+        Args:
+            max_n: Número máximo de solicitudes a procesar
+            
+        Returns:
+            Diccionario con procesadas, exitosas, en_espera, fallidas,
+            libros (grupos distintos) y prestamos (IDs creados)
+        """
+        solicitudes = self.cola_solicitudes.desencolar_lote(max_n)
+        
+        grupos = {}
+        for solicitud in solicitudes:
+            grupos.setdefault(solicitud['isbn_libro'], []).append(solicitud)
+        
+        usuarios = {}
+        prestamos = []
+        en_espera = 0
+        fallidas = 0
+        with self.reloj.congelado():
+            for isbn, grupo in grupos.items():
+                libro = self.obtener_libro_por_isbn(isbn)
+                if libro is None:
+                    fallidas += len(grupo)
+                    continue
+                for solicitud in grupo:
+                    id_usuario = solicitud['id_usuario']
+                    if id_usuario not in usuarios:
+                        usuarios[id_usuario] = self.obtener_usuario_por_id(id_usuario)
+                    usuario = usuarios[id_usuario]
+                    if usuario is None:
+                        fallidas += 1
+                    elif libro.disponible:
+                        prestamos.append(self._crear_prestamo(libro, usuario))
+                        self._registrar_espera(solicitud)
+                    else:
+                        self._agregar_a_lista_espera(solicitud)
+                        en_espera += 1
+        
+        return {
+            'procesadas': len(solicitudes),
+            'exitosas': len(prestamos),
+            'en_espera': en_espera,
+            'fallidas': fallidas,
+            'libros': len(grupos),
+            'prestamos': prestamos
         }
     
     def obtener_solicitudes_pendientes(self):
         """Retorna todas las solicitudes pendientes."""
         return self.cola_solicitudes.obtener_todos()
     
+    def iterar_solicitudes_pendientes(self):
+        """Recorre las solicitudes pendientes en orden de atención."""
+        return iter(self.cola_solicitudes)
+    
+    # ==================== LISTAS DE ESPERA ====================
+    
+    def _agregar_a_lista_espera(self, solicitud):
+        """Agrega una solicitud a la lista de espera de su libro."""
+        isbn = solicitud['isbn_libro']
+        if isbn not in self.listas_espera:
+            self.listas_espera[isbn] = Cola()
+        self.listas_espera[isbn].encolar(solicitud)
+    
+    def _atender_lista_espera(self, libro):
+        """
+        Presta un libro recién devuelto al primer solicitante elegible de
+        su lista de espera. Los solicitantes que ya no existen se descartan.
+        
+        Returns:
+            ID del préstamo creado o None si nadie estaba esperando
+        """
+        lista = self.listas_espera.get(libro.isbn)
+        id_prestamo = None
+        while lista is not None and not lista.esta_vacia():
+            solicitud = lista.desencolar()
+            usuario = self.obtener_usuario_por_id(solicitud['id_usuario'])
+            if usuario:
+                id_prestamo = self._crear_prestamo(libro, usuario)
+                self._registrar_espera(solicitud)
+                break
+        if lista is not None and lista.esta_vacia():
+            del self.listas_espera[libro.isbn]
+        return id_prestamo
+    
+    def _registrar_espera(self, solicitud):
+        """Acumula el tiempo que esperó una solicitud atendida."""
+        segundos = (self.reloj.ahora() - solicitud['fecha_solicitud']).total_seconds()
+        metricas = self.metricas_espera.setdefault(solicitud['isbn_libro'], [0, 0.0, 0.0])
+        metricas[0] += 1
+        metricas[1] += segundos
+        metricas[2] = max(metricas[2], segundos)
+    
+    def obtener_lista_espera(self, isbn):
+        """Retorna las solicitudes en espera de un libro, en orden de atención."""
+        lista = self.listas_espera.get(isbn)
+        return lista.obtener_todos() if lista else []
+    
+    def obtener_metricas_espera(self, isbn=None):
+        """
+        Obtiene las métricas de tiempo de espera por título.
+        
+        Args:
+            isbn: ISBN del libro (None para obtener todos los títulos)
+            
+        Returns:
+            Diccionario con atendidas, espera_promedio y espera_maxima (en
+            segundos) y en_espera; o un diccionario {isbn: métricas}
+        """
+        if isbn is not None:
+            atendidas, total, maxima = self.metricas_espera.get(isbn, (0, 0.0, 0.0))
+            lista = self.listas_espera.get(isbn)
+            return {
+                'atendidas': atendidas,
+                'espera_promedio': total / atendidas if atendidas else 0.0,
+                'espera_maxima': maxima,
+                'en_espera': lista.obtener_tamaño() if lista else 0
+            }
+        isbns = set(self.metricas_espera) | set(self.listas_espera)
+        return {isbn: self.obtener_metricas_espera(isbn) for isbn in isbns}
+    
     # ==================== ESTADÍSTICAS Y REPORTES ====================
     
     def obtener_estadisticas(self):
-        """Genera estadísticas del sistema."""
-        total_libros = self.libros.obtener_tamaño()
-        libros_disponibles = len([l for l in self.libros.obtener_todos() if l.disponible])
-        total_usuarios = self.usuarios.obtener_tamaño()
-        prestamos_activos = len(self.prestamos_activos)
-        solicitudes_pendientes = self.cola_solicitudes.obtener_tamaño()
-        
+        """
+        Genera estadísticas del sistema en O(1) a partir de los contadores
+        que mantienen las operaciones de libros, préstamos y solicitudes.
+        """
         return {
-            'total_libros': total_libros,
+            'total_libros': self.libros.obtener_tamaño(),
+            'libros_disponibles': self.libros_disponibles,
+            'libros_prestados': self.libros_prestados,
+            'total_usuarios': self.usuarios.obtener_tamaño(),
+            'prestamos_activos': len(self.prestamos_activos),
+            'solicitudes_pendientes': self.cola_solicitudes.obtener_tamaño(),
+            'total_prestamos': self.total_prestamos,
+            'total_solicitudes': self.total_solicitudes
+        }
+    
+    def verificar_estadisticas(self):
+        """
+        Recalcula desde cero las estadísticas derivables de las estructuras
+        y las compara con los contadores (útil para depuración).
+        
+        Returns:
+            Diccionario {campo: (contador, recalculado)} con las diferencias
+            (los totales por usuario usan la clave 'total_prestamos[<id>]');
+            vacío si los contadores son consistentes
+        """
+        libros_disponibles = sum(1 for libro in self.libros if libro.disponible)
+        recalculadas = {
             'libros_disponibles': libros_disponibles,
-            'libros_prestados': total_libros - libros_disponibles,
-            'total_usuarios': total_usuarios,
-            'prestamos_activos': prestamos_activos,
-            'solicitudes_pendientes': solicitudes_pendientes
-        }
\ No newline at end of file
+            'libros_prestados': self.libros.obtener_tamaño() - libros_disponibles,
+            'total_prestamos': self.archivo_prestamos.obtener_tamaño()
+        }
+        estadisticas = self.obtener_estadisticas()
+        diferencias = {campo: (estadisticas[campo], valor)
+                       for campo, valor in recalculadas.items()
+                       if estadisticas[campo] != valor}
+        for usuario in self.usuarios:
+            registrados = self.archivo_prestamos.contar_filas_usuario(usuario.id_usuario)
+            if usuario.total_prestamos != registrados:
+                diferencias[f'total_prestamos[{usuario.id_usuario}]'] = (
+                    usuario.total_prestamos, registrados)
+        return diferencias
\ No newline at end of file
@@ -14,13 +14,22 @@ Curso: Estructuras de Datos - Unidad 1
 import unittest
 import sys
 import os
+import pickle
+import tempfile
 from datetime import datetime, timedelta
 
 # Agregar el directorio actual al path para importaciones
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from estructuras_datos import ListaEnlazada, Pila, Cola, ArregloDinamico
-from modelos import Libro, Usuario, Prestamo, BibliotecaManager
+from estructuras_datos import (Nodo, ListaEnlazada, CatalogoIndexado, Pila, PilaAcotada,
+                               Cola, ColaCircular, ColaPrioridad, MonticuloMinimo,
+                               RuedaTemporizacion, IndiceTrigramas, TrieSugerencias,
+                               ArbolBK, distancia_edicion, IndiceOrdenado,
+                               ArregloDinamico, ArregloIndexado)
+from modelos import (Libro, Usuario, Prestamo, ArchivoPrestamos, BibliotecaManager, RelojManual,
+                     normalizar_texto,
+                     PRIORIDAD_PERSONAL, PRIORIDAD_RESERVA_CURSO, PRIORIDAD_PUBLICO,
+                     ESTADO_ACTIVO, ESTADO_VENCIDO)
 
 class TestEstructurasDatos(unittest.TestCase):
     """
@@ -65,6 +74,88 @@ class TestEstructurasDatos(unittest.TestCase):
         
         print("✓ Lista enlazada: Inserción, búsqueda y eliminación funcionan correctamente")
     
+    def test_lista_enlazada_final_y_extender(self):
+        """Prueba que el final de la lista se mantiene al insertar, extender y eliminar."""
+        print("\n=== PRUEBAS DE FINAL DE LISTA ENLAZADA ===")
+        
+        self.lista.extender([])
+        self.assertTrue(self.lista.esta_vacia())
+        
+        self.lista.extender(range(1, 4))
+        self.lista.insertar_al_final(4)
+        self.lista.extender(iter([5, 6]))
+        self.assertEqual(self.lista.obtener_todos(), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(self.lista.obtener_tamaño(), 6)
+        
+        # Eliminar el último nodo actualiza el final
+        self.assertTrue(self.lista.eliminar(lambda x: x == 6))
+        self.lista.insertar_al_final(7)
+        self.assertEqual(self.lista.obtener_todos(), [1, 2, 3, 4, 5, 7])
+        
+        # Vaciar la lista y volver a insertar
+        for valor in [1, 2, 3, 4, 5, 7]:
+            self.lista.eliminar(lambda x, v=valor: x == v)
+        self.assertIsNone(self.lista.final)
+        self.lista.insertar_al_final(8)
+        self.assertEqual(self.lista.obtener_todos(), [8])
+        
+        # En el catálogo, un lote con claves repetidas no inserta nada
+        catalogo = CatalogoIndexado(lambda x: x)
+        catalogo.extender(["A", "B"])
+        with self.assertRaises(ValueError):
+            catalogo.extender(["C", "A"])
+        self.assertFalse(catalogo.contiene("C"))
+        self.assertEqual(catalogo.obtener_todos(), ["A", "B"])
+        
+        # Una excepción de otro tipo a mitad del lote tampoco deja claves huérfanas
+        def lote_con_error():
+            yield "C"
+            yield "D"
+            raise RuntimeError("fallo al leer el lote")
+        with self.assertRaises(RuntimeError):
+            catalogo.extender(lote_con_error())
+        self.assertFalse(catalogo.contiene("C"))
+        self.assertIsNone(catalogo.obtener("D"))
+        self.assertEqual(catalogo.obtener_tamaño(), 2)
+        catalogo.insertar_al_final("C")
+        self.assertEqual(catalogo.obtener_todos(), ["A", "B", "C"])
+        
+        print("✓ Lista enlazada: Inserción al final en O(1) y extensión por lotes verificadas")
+    
+    def test_catalogo_indexado_por_clave(self):
+        """Prueba que el índice del catálogo se mantiene sincronizado con la lista."""
+        print("\n=== PRUEBAS DE CATÁLOGO INDEXADO ===")
+        
+        catalogo = CatalogoIndexado(lambda x: x[0])
+        catalogo.insertar_al_final(("B", "Segundo"))
+        catalogo.insertar_al_inicio(("A", "Primero"))
+        catalogo.insertar_al_final(("C", "Tercero"))
+        
+        # Acceso directo por clave
+        self.assertTrue(catalogo.contiene("B"))
+        self.assertEqual(catalogo.obtener("C"), ("C", "Tercero"))
+        self.assertIsNone(catalogo.obtener("Z"))
+        
+        # Claves duplicadas no se permiten
+        with self.assertRaises(ValueError):
+            catalogo.insertar_al_final(("A", "Duplicado"))
+        
+        # Eliminación por clave y por criterio mantienen orden e índice
+        self.assertTrue(catalogo.eliminar_por_clave("C"))
+        self.assertFalse(catalogo.eliminar_por_clave("C"))
+        self.assertTrue(catalogo.eliminar(lambda x: x[0] == "A"))
+        self.assertFalse(catalogo.contiene("A"))
+        self.assertEqual(catalogo.obtener_todos(), [("B", "Segundo")])
+        
+        # El final se actualiza al eliminar el último nodo
+        catalogo.insertar_al_final(("D", "Cuarto"))
+        self.assertTrue(catalogo.eliminar_por_clave("D"))
+        catalogo.insertar_al_final(("E", "Quinto"))
+        self.assertEqual(catalogo.obtener_todos(), [("B", "Segundo"), ("E", "Quinto")])
+        self.assertEqual(catalogo.obtener_tamaño(), 2)
+        
+        print("✓ Catálogo indexado: Acceso por clave y sincronización del índice verificados")
+    
     def test_pila_operaciones_lifo(self):
         """Prueba el comportamiento LIFO de la pila."""
         print("\n=== PRUEBAS DE PILA (LIFO) ===")
@@ -96,6 +187,82 @@ class TestEstructurasDatos(unittest.TestCase):
         
         print("✓ Pila: Comportamiento LIFO verificado correctamente")
     
+    def test_pila_acotada_desborde_a_disco(self):
+        """Prueba que la pila acotada envía los elementos antiguos a disco."""
+        print("\n=== PRUEBAS DE PILA ACOTADA ===")
+        
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "historial.seg")
+            pila = PilaAcotada(3, ruta)
+            for i in range(10):
+                pila.apilar(i)
+            
+            # Solo los 3 más recientes quedan en memoria
+            self.assertEqual(pila.recientes.obtener_tamaño(), 3)
+            self.assertEqual(pila.obtener_tamaño(), 10)
+            self.assertEqual(pila.ver_tope(), 9)
+            self.assertEqual(list(pila), list(range(9, -1, -1)))
+            
+            # Paginación en memoria, entre memoria y disco, y solo en disco
+            self.assertEqual(pila.obtener_pagina(2), [9, 8])
+            self.assertEqual(pila.obtener_pagina(3, 2), [7, 6, 5])
+            self.assertEqual(pila.obtener_pagina(5, 7), [2, 1, 0])
+            self.assertEqual(pila.obtener_pagina(5, 20), [])
+            
+            # Desapilar continúa desde el disco al vaciarse la memoria
+            self.assertEqual([pila.desapilar() for _ in range(5)], [9, 8, 7, 6, 5])
+            pila.apilar(10)
+            self.assertEqual(pila.obtener_todos(), [10, 4, 3, 2, 1, 0])
+            pila.cerrar()
+            pila.cerrar()  # Cerrar de nuevo no vuelve a escribir
+            
+            # Al cerrar, los elementos en memoria pasan al segmento y se recuperan al reabrir
+            reabierta = PilaAcotada(3, ruta)
+            self.assertEqual(reabierta.obtener_todos(), [10, 4, 3, 2, 1, 0])
+            self.assertEqual(reabierta.recientes.obtener_tamaño(), 0)
+            reabierta.cerrar()
+            
+            # Ida y vuelta completa con más elementos que la capacidad en memoria
+            ruta_completa = os.path.join(directorio, "completo.seg")
+            pila = PilaAcotada(2, ruta_completa)
+            for i in range(10):
+                pila.apilar(i)
+            pila.cerrar()
+            reabierta = PilaAcotada(2, ruta_completa)
+            self.assertEqual(reabierta.obtener_tamaño(), 10)
+            self.assertEqual(reabierta.obtener_todos(), list(range(9, -1, -1)))
+            reabierta.apilar(10)
+            self.assertEqual(reabierta.desapilar(), 10)
+            self.assertEqual(reabierta.desapilar(), 9)
+            reabierta.cerrar()
+            reabierta = PilaAcotada(2, ruta_completa)
+            self.assertEqual(reabierta.obtener_todos(), list(range(8, -1, -1)))
+            reabierta.cerrar()
+            
+            # Los registros son de tamaño fijo: un archivo ajeno se rechaza
+            ajeno = os.path.join(directorio, "ajeno.seg")
+            with open(ajeno, 'wb') as archivo:
+                archivo.write(b"no es un segmento")
+            with self.assertRaises(ValueError):
+                PilaAcotada(3, ajeno)
+        
+        # Con un formato de varios campos se apilan tuplas
+        pila_tuplas = PilaAcotada(1, formato='<Id')
+        pila_tuplas.apilar((1, 2.5))
+        pila_tuplas.apilar((2, 3.5))
+        self.assertEqual(pila_tuplas.obtener_todos(), [(2, 3.5), (1, 2.5)])
+        self.assertEqual(pila_tuplas.desapilar(), (2, 3.5))
+        self.assertEqual(pila_tuplas.desapilar(), (1, 2.5))
+        self.assertIsNone(pila_tuplas.desapilar())
+        pila_tuplas.cerrar()
+        
+        # La pila ordinaria también admite paginación
+        for i in range(5):
+            self.pila.apilar(i)
+        self.assertEqual(self.pila.obtener_pagina(2, 1), [3, 2])
+        
+        print("✓ Pila acotada: Desborde a disco, paginación y recuperación verificados")
+    
     def test_cola_operaciones_fifo(self):
         """Prueba el comportamiento FIFO de la cola."""
         print("\n=== PRUEBAS DE COLA (FIFO) ===")
@@ -127,6 +294,244 @@ class TestEstructurasDatos(unittest.TestCase):
         
         print("✓ Cola: Comportamiento FIFO verificado correctamente")
     
+    def test_cola_circular_y_lotes(self):
+        """Prueba la cola circular, su crecimiento y las operaciones por lotes."""
+        print("\n=== PRUEBAS DE COLA CIRCULAR ===")
+        
+        cola = ColaCircular(capacidad_inicial=4)
+        self.assertTrue(cola.esta_vacia())
+        self.assertIsNone(cola.desencolar())
+        self.assertIsNone(cola.ver_frente())
+        self.assertEqual(cola.desencolar_lote(3), [])
+        
+        # Avanzar el frente para que los datos den la vuelta al arreglo
+        cola.encolar_lote([1, 2, 3])
+        self.assertEqual(cola.desencolar(), 1)
+        self.assertEqual(cola.desencolar(), 2)
+        cola.encolar_lote([4, 5, 6])
+        self.assertEqual(cola.obtener_todos(), [3, 4, 5, 6])
+        self.assertEqual(cola.capacidad, 4)
+        
+        # Crecimiento automático con datos que dan la vuelta
+        cola.encolar(7)
+        cola.encolar_lote(range(8, 12))
+        self.assertEqual(list(cola), list(range(3, 12)))
+        self.assertEqual(cola.obtener(0), 3)
+        self.assertEqual(cola.obtener(8), 11)
+        
+        # Desencolar por lotes
+        self.assertEqual(cola.desencolar_lote(5), [3, 4, 5, 6, 7])
+        self.assertEqual(cola.ver_frente(), 8)
+        self.assertEqual(cola.desencolar_lote(10), [8, 9, 10, 11])
+        self.assertTrue(cola.esta_vacia())
+        self.assertEqual(len(cola), 0)
+        
+        print("✓ Cola circular: FIFO, crecimiento y lotes verificados correctamente")
+    
+    def test_cola_prioridad_estable(self):
+        """Prueba que la cola de prioridad respeta FIFO dentro de cada prioridad."""
+        print("\n=== PRUEBAS DE COLA DE PRIORIDAD ===")
+        
+        cola = ColaPrioridad(prioridad_por_defecto=2)
+        self.assertIsNone(cola.desencolar())
+        self.assertIsNone(cola.ver_frente())
+        
+        cola.encolar("publico-1")
+        cola.encolar("curso-1", 1)
+        cola.encolar("personal-1", 0)
+        cola.encolar("publico-2")
+        cola.encolar("personal-2", 0)
+        cola.encolar_lote(["curso-2", "curso-3"], 1)
+        
+        orden = ["personal-1", "personal-2", "curso-1", "curso-2", "curso-3",
+                 "publico-1", "publico-2"]
+        self.assertEqual(cola.obtener_todos(), orden)
+        self.assertEqual(cola.obtener_tamaño(), 7)
+        self.assertEqual(cola.ver_frente(), "personal-1")
+        self.assertEqual(cola.desencolar_lote(3), orden[:3])
+        self.assertEqual([cola.desencolar() for _ in range(4)], orden[3:])
+        self.assertTrue(cola.esta_vacia())
+        
+        print("✓ Cola de prioridad: Orden por prioridad y FIFO interno verificados")
+    
+    def test_monticulo_recorrido_acotado(self):
+        """Prueba el recorrido acotado y el filtrado del montículo."""
+        print("\n=== PRUEBAS DE MONTÍCULO MÍNIMO ===")
+        
+        monticulo = MonticuloMinimo()
+        self.assertEqual(list(monticulo.recorrer_hasta(10)), [])
+        for valor in [9, 4, 7, 1, 8, 2, 6, 3, 5]:
+            monticulo.insertar(valor)
+        
+        self.assertEqual(sorted(monticulo.recorrer_hasta(4)), [1, 2, 3, 4])
+        self.assertEqual(sorted(monticulo.recorrer_hasta(0)), [])
+        
+        monticulo.filtrar(lambda valor: valor % 2 == 0)
+        self.assertEqual([monticulo.extraer() for _ in range(4)], [2, 4, 6, 8])
+        self.assertIsNone(monticulo.extraer())
+        
+        print("✓ Montículo: Recorrido acotado y filtrado verificados")
+    
+    def test_rueda_temporizacion(self):
+        """Prueba el disparo por lotes, la cascada y la cancelación de tareas."""
+        print("\n=== PRUEBAS DE RUEDA DE TEMPORIZACIÓN ===")
+        
+        reloj = [0]
+        rueda = RuedaTemporizacion(reloj=lambda: reloj[0], resolucion=1, ranuras=4, niveles=2)
+        disparos = []
+        def accion(datos, momento):
+            disparos.append((momento, sorted(datos)))
+        
+        rueda.programar(2, accion, "a")
+        rueda.programar(2.5, accion, "b")   # Mismo tick que "a": un solo lote
+        rueda.programar(9, accion, "c")     # Requiere cascada desde el nivel 1
+        rueda.programar(100, accion, "d")   # Fuera del alcance de la rueda
+        cancelada = rueda.programar(5, accion, "e")
+        self.assertEqual(rueda.obtener_tamaño(), 5)
+        
+        self.assertTrue(rueda.cancelar(cancelada))
+        self.assertFalse(rueda.cancelar(cancelada))
+        self.assertEqual(rueda.avanzar(2), 0)  # Se dispara en el tick posterior
+        
+        reloj[0] = 12
+        self.assertEqual(rueda.avanzar(), 3)
+        self.assertEqual(disparos, [(3, ["a", "b"]), (10, ["c"])])
+        
+        self.assertEqual(rueda.avanzar(150), 1)
+        self.assertEqual(disparos[-1], (101, ["d"]))
+        self.assertTrue(rueda.esta_vacia())
+        
+        # Las tareas con momento pasado se disparan en el siguiente tick
+        rueda.programar(0, accion, "f")
+        self.assertEqual(rueda.avanzar(150), 0)
+        self.assertEqual(rueda.avanzar(151), 1)
+        
+        print("✓ Rueda de temporización: Lotes por tick, cascada y cancelación verificados")
+    
+    def test_indice_trigramas(self):
+        """Prueba la búsqueda de subcadenas y la actualización del índice de trigramas."""
+        print("\n=== PRUEBAS DE ÍNDICE DE TRIGRAMAS ===")
+        
+        indice = IndiceTrigramas()
+        indice.agregar(1, "cien años de soledad")
+        indice.agregar(2, "el amor en los tiempos del cólera")
+        indice.agregar(3, "soledades")
+        
+        self.assertEqual(list(indice.buscar("soledad")), [1, 3])
+        self.assertEqual(list(indice.buscar("amor")), [2])
+        self.assertEqual(list(indice.buscar("de")), [1, 2, 3])  # Consulta corta: recorrido completo
+        self.assertEqual(list(indice.buscar("dadsol")), [])     # Trigramas presentes, subcadena no
+        self.assertEqual(list(indice.buscar("xyz")), [])
+        
+        self.assertTrue(indice.eliminar(1))
+        self.assertFalse(indice.eliminar(1))
+        self.assertEqual(list(indice.buscar("soledad")), [3])
+        indice.agregar(3, "la soledad de américa latina")
+        self.assertEqual(list(indice.buscar("soledades")), [])
+        self.assertEqual(list(indice.buscar("américa")), [3])
+        self.assertTrue(all(indice.listas.values()))  # Sin listas vacías
+        self.assertEqual(len(indice), 2)
+        
+        print("✓ Índice de trigramas: Búsqueda verificada y actualización incremental")
+    
+    def test_arbol_bk(self):
+        """Prueba la distancia de edición y la búsqueda aproximada del árbol BK."""
+        print("\n=== PRUEBAS DE ÁRBOL BK ===")
+        
+        self.assertEqual(distancia_edicion("garsia", "garcia"), 1)
+        self.assertEqual(distancia_edicion("marquez", "marques"), 1)
+        self.assertEqual(distancia_edicion("", "abc"), 3)
+        self.assertEqual(distancia_edicion("cervantes", "borges"), 6)
+        self.assertEqual(distancia_edicion("cervantes", "borges", maximo=2), 3)  # Acotada
+        
+        arbol = ArbolBK()
+        for palabra in ("garcia", "marquez", "garza", "borges", "marques", "garcia"):
+            arbol.agregar(palabra)
+        self.assertEqual(len(arbol), 5)
+        self.assertEqual(arbol.buscar("garsia", 1), [(1, "garcia")])
+        self.assertEqual(arbol.buscar("garsia", 2), [(1, "garcia"), (2, "garza")])
+        self.assertEqual(arbol.buscar("marquez", 1), [(0, "marquez"), (1, "marques")])
+        self.assertEqual(arbol.buscar("xyz", 1), [])
+        
+        # Las palabras eliminadas no aparecen, pero siguen guiando la búsqueda
+        self.assertTrue(arbol.eliminar("garcia"))
+        self.assertFalse(arbol.eliminar("garcia"))
+        self.assertNotIn("garcia", arbol)
+        self.assertEqual(arbol.buscar("garsia", 2), [(2, "garza")])
+        self.assertTrue(arbol.agregar("garcia"))
+        self.assertEqual(arbol.buscar("garsia", 1), [(1, "garcia")])
+        
+        print("✓ Árbol BK: Distancias, búsqueda acotada y eliminación verificadas")
+    
+    def test_trie_sugerencias(self):
+        """Prueba las completaciones ordenadas por peso del trie de sugerencias."""
+        print("\n=== PRUEBAS DE TRIE DE SUGERENCIAS ===")
+        
+        trie = TrieSugerencias(capacidad=2)
+        trie.agregar("Cien años de soledad", {"cien", "años", "de", "soledad"})
+        trie.agregar("Cuentos", {"cuentos"}, peso=1)
+        trie.agregar("Crónica", {"crónica"})
+        
+        self.assertEqual(trie.sugerir("c"), ["Cuentos", "Cien años de soledad"])
+        self.assertEqual(trie.sugerir("so"), ["Cien años de soledad"])
+        self.assertEqual(trie.sugerir("x"), [])
+        
+        # Al subir el peso, el elemento entra en las listas de sus prefijos
+        trie.incrementar("Crónica", 2)
+        self.assertEqual(trie.sugerir("c"), ["Crónica", "Cuentos"])
+        self.assertEqual(trie.sugerir("c", 1), ["Crónica"])
+        
+        # Al bajar el peso o quitarlo, las listas se rellenan con el siguiente
+        trie.incrementar("Crónica", -2)
+        self.assertEqual(trie.sugerir("c"), ["Cuentos", "Cien años de soledad"])
+        trie.agregar("Cuentos", {"cuentos"})  # Segunda referencia
+        self.assertTrue(trie.quitar("Cuentos", peso=1))
+        self.assertIn("Cuentos", trie)
+        self.assertTrue(trie.quitar("Cuentos"))
+        self.assertNotIn("Cuentos", trie)
+        self.assertEqual(trie.sugerir("c"), ["Cien años de soledad", "Crónica"])
+        self.assertEqual(trie.sugerir("cu"), [])
+        self.assertNotIn("u", trie.raiz.hijos["c"].hijos)  # Nodos sin uso podados
+        
+        # Quitar un elemento solo recalcula las listas que lo contenían
+        for i in range(3):
+            trie.agregar(f"Sol {i}", {f"sol {i}"}, peso=5)
+        lista_raiz = trie.raiz.mejores
+        self.assertNotIn("Crónica", lista_raiz)
+        trie.quitar("Crónica")
+        self.assertIs(trie.raiz.mejores, lista_raiz)
+        self.assertEqual(trie.sugerir("c"), ["Cien años de soledad"])
+        trie.quitar("Sol 0")
+        self.assertEqual(trie.sugerir(""), ["Sol 1", "Sol 2"])
+        
+        print("✓ Trie de sugerencias: Orden por peso, actualización y poda verificados")
+    
+    def test_indice_ordenado(self):
+        """Prueba las consultas por rango del índice ordenado."""
+        print("\n=== PRUEBAS DE ÍNDICE ORDENADO ===")
+        
+        indice = IndiceOrdenado()
+        for clave, valor in [(1967, "a"), (1943, "b"), (1967, "c"), (1605, "d"), (1981, "e")]:
+            indice.agregar(clave, valor)
+        self.assertEqual(len(indice), 5)
+        self.assertEqual(indice.claves, [1605, 1943, 1967, 1981])
+        self.assertEqual(indice.rango(1940, 1970), ["b", "a", "c"])  # Empates en orden de inserción
+        self.assertEqual(indice.rango(1967, 1967), ["a", "c"])
+        self.assertEqual(indice.rango(hasta=1943), ["d", "b"])
+        self.assertEqual(indice.rango(1980), ["e"])
+        self.assertEqual(indice.rango(1990, 2000), [])
+        self.assertEqual(indice.rango(1970, 1940), [])
+        
+        self.assertTrue(indice.eliminar(1967, "a"))
+        self.assertFalse(indice.eliminar(1967, "a"))
+        self.assertFalse(indice.eliminar(1943, "c"))  # Valor con otra clave
+        self.assertEqual(indice.rango(), ["d", "b", "c", "e"])
+        self.assertTrue(indice.eliminar(1605, "d"))
+        self.assertEqual(indice.claves, [1943, 1967, 1981])  # Clave sin valores descartada
+        self.assertEqual(len(indice), 3)
+        
+        print("✓ Índice ordenado: Rangos, empates y eliminación verificados")
+    
     def test_arreglo_dinamico_operaciones(self):
         """Prueba las operaciones del arreglo dinámico."""
         print("\n=== PRUEBAS DE ARREGLO DINÁMICO ===")
@@ -160,6 +565,156 @@ class TestEstructurasDatos(unittest.TestCase):
         self.assertEqual(self.arreglo.obtener_tamaño(), 14)
         
         print("✓ Arreglo dinámico: Redimensionamiento automático y operaciones funcionan correctamente")
+    
+    def test_protocolo_iteracion(self):
+        """Prueba __iter__ y __len__ en todas las estructuras."""
+        print("\n=== PRUEBAS DE PROTOCOLO DE ITERACIÓN ===")
+        
+        for valor in range(3):
+            self.lista.insertar_al_final(valor)
+            self.pila.apilar(valor)
+            self.cola.encolar(valor)
+            self.arreglo.agregar(valor)
+        
+        self.assertEqual(list(self.lista), [0, 1, 2])
+        self.assertEqual(list(self.pila), [2, 1, 0])
+        self.assertEqual(list(self.cola), [0, 1, 2])
+        self.assertEqual(list(self.arreglo), [0, 1, 2])
+        
+        for estructura in (self.lista, self.pila, self.cola, self.arreglo):
+            self.assertEqual(len(estructura), 3)
+        
+        # El recorrido es perezoso: se puede detener sin copiar el resto
+        iterador = iter(self.pila)
+        self.assertEqual(next(iterador), 2)
+        
+        print("✓ Iteración: Recorridos perezosos y longitud verificados en las cuatro estructuras")
+    
+    def test_arreglo_indexado_sincroniza_indices(self):
+        """Prueba que los índices por clave siguen a los elementos desplazados."""
+        print("\n=== PRUEBAS DE ARREGLO INDEXADO ===")
+        
+        arreglo = ArregloIndexado({'id': lambda x: x[0], 'email': lambda x: x[1]})
+        for i in range(15):
+            arreglo.agregar((f"U{i:03d}", f"u{i}@email.com"))
+        
+        self.assertEqual(arreglo.indice_de('id', "U007"), 7)
+        self.assertEqual(arreglo.obtener_por('email', "u3@email.com"), ("U003", "u3@email.com"))
+        
+        # Claves duplicadas no se permiten
+        with self.assertRaises(ValueError):
+            arreglo.agregar(("U999", "u1@email.com"))
+        
+        # Eliminar desplaza las posiciones de los elementos siguientes
+        arreglo.eliminar(2)
+        self.assertFalse(arreglo.contiene('id', "U002"))
+        self.assertEqual(arreglo.indice_de('id', "U007"), 6)
+        self.assertEqual(arreglo.obtener_por('id', "U014"), ("U014", "u14@email.com"))
+        
+        # Establecer reemplaza las claves del elemento anterior
+        arreglo.establecer(0, ("U000", "nuevo@email.com"))
+        self.assertFalse(arreglo.contiene('email', "u0@email.com"))
+        self.assertEqual(arreglo.indice_de('email', "nuevo@email.com"), 0)
+        with self.assertRaises(ValueError):
+            arreglo.establecer(0, ("U000", "u5@email.com"))
+        
+        print("✓ Arreglo indexado: Índices por ID y email sincronizados correctamente")
+    
+    def test_arreglo_modos_eliminacion(self):
+        """Prueba los modos de eliminación por intercambio y por lápidas."""
+        print("\n=== PRUEBAS DE MODOS DE ELIMINACIÓN ===")
+        
+        with self.assertRaises(ValueError):
+            ArregloDinamico(modo_eliminacion="otro")
+        
+        # Intercambio: el último elemento ocupa la posición eliminada
+        intercambio = ArregloIndexado({'id': lambda x: x}, modo_eliminacion="intercambio")
+        for i in range(5):
+            intercambio.agregar(i)
+        self.assertEqual(intercambio.eliminar(1), 1)
+        self.assertEqual(intercambio.obtener_todos(), [0, 4, 2, 3])
+        self.assertEqual(intercambio.indice_de('id', 4), 1)
+        self.assertEqual(intercambio.eliminar(3), 3)
+        self.assertEqual(intercambio.obtener_tamaño(), 3)
+        
+        # Lápidas: el orden se conserva y las posiciones no cambian
+        lapida = ArregloIndexado({'id': lambda x: x}, modo_eliminacion="lapida")
+        for i in range(8):
+            lapida.agregar(i)
+        lapida.eliminar(0)
+        lapida.eliminar(2)
+        self.assertEqual(lapida.obtener_todos(), [1, 3, 4, 5, 6, 7])
+        self.assertEqual(lapida.indice_de('id', 7), 7)
+        self.assertEqual(lapida.obtener(7), 7)
+        with self.assertRaises(IndexError):
+            lapida.obtener(2)
+        self.assertEqual(lapida.buscar(lambda x: x < 4), [1, 3])
+        
+        # Al superar la mitad de lápidas se compacta conservando el orden
+        for valor in (1, 3, 4):
+            lapida.eliminar(lapida.indice_de('id', valor))
+        self.assertEqual(lapida.lapidas, 0)
+        self.assertEqual(lapida.obtener_todos(), [5, 6, 7])
+        for posicion, valor in enumerate([5, 6, 7]):
+            self.assertEqual(lapida.indice_de('id', valor), posicion)
+            self.assertEqual(lapida.obtener(posicion), valor)
+        
+        print("✓ Arreglo dinámico: Eliminación por intercambio y por lápidas verificadas")
+    
+    def test_arreglo_politica_capacidad(self):
+        """Prueba el factor de crecimiento, la reserva y la reducción automática."""
+        print("\n=== PRUEBAS DE POLÍTICA DE CAPACIDAD ===")
+        
+        with self.assertRaises(ValueError):
+            ArregloDinamico(factor_crecimiento=1)
+        with self.assertRaises(ValueError):
+            ArregloDinamico(factor_crecimiento=2, umbral_reduccion=0.5)
+        
+        # Crecimiento con factor configurable
+        arreglo = ArregloDinamico(capacidad_inicial=4, factor_crecimiento=1.5)
+        for i in range(5):
+            arreglo.agregar(i)
+        self.assertEqual(arreglo.capacidad, 6)
+        
+        # Reserva anticipada sin perder elementos
+        arreglo.reservar(100)
+        self.assertEqual(arreglo.capacidad, 100)
+        self.assertEqual(arreglo.obtener_todos(), [0, 1, 2, 3, 4])
+        for i in range(5, 100):
+            arreglo.agregar(i)
+        self.assertEqual(arreglo.capacidad, 100)
+        
+        # Reducción automática al vaciarse, sin bajar de la capacidad inicial
+        while arreglo.obtener_tamaño() > 10:
+            arreglo.eliminar(arreglo.obtener_tamaño() - 1)
+        self.assertLess(arreglo.capacidad, 100)
+        self.assertEqual(arreglo.obtener_todos(), list(range(10)))
+        while not arreglo.esta_vacio():
+            arreglo.eliminar(0)
+        self.assertEqual(arreglo.capacidad, 4)
+        
+        # Sin umbral la capacidad se conserva
+        fijo = ArregloDinamico(capacidad_inicial=2, umbral_reduccion=None)
+        for i in range(64):
+            fijo.agregar(i)
+        while not fijo.esta_vacio():
+            fijo.eliminar(0)
+        self.assertEqual(fijo.capacidad, 64)
+        
+        # El arreglo indexado acepta la misma política y mantiene sus índices
+        indexado = ArregloIndexado({'id': lambda x: x}, capacidad_inicial=4,
+                                   modo_eliminacion="lapida", factor_crecimiento=1.5,
+                                   umbral_reduccion=None)
+        for i in range(5):
+            indexado.agregar(i)
+        self.assertEqual(indexado.capacidad, 6)
+        while not indexado.esta_vacio():
+            indexado.eliminar(indexado.indice_de('id', indexado.obtener_todos()[0]))
+        self.assertEqual(indexado.capacidad, 6)
+        with self.assertRaises(ValueError):
+            ArregloIndexado({'id': lambda x: x}, factor_crecimiento=1)
+        
+        print("✓ Arreglo dinámico: Crecimiento, reserva y reducción verificados")
 
 class TestModelosDatos(unittest.TestCase):
     """
@@ -193,11 +748,16 @@ class TestModelosDatos(unittest.TestCase):
         self.assertEqual(usuario.id_usuario, "U001")
         self.assertEqual(usuario.nombre, "Juan Pérez")
         self.assertEqual(usuario.prestamos_activos, 0)
-        self.assertEqual(len(usuario.historial_prestamos), 0)
+        self.assertEqual(usuario.total_prestamos, 0)
         
         info = usuario.obtener_info_completa()
         self.assertIsInstance(info, dict)
         self.assertEqual(info['id_usuario'], "U001")
+        self.assertEqual(info['total_prestamos'], 0)
+        
+        # El usuario no guarda referencias a otras estructuras y se puede serializar
+        copia = pickle.loads(pickle.dumps(usuario))
+        self.assertEqual((copia.id_usuario, copia.clave_nombre), ("U001", "juan perez"))
         
         print("✓ Usuario: Creación y propiedades funcionan correctamente")
     
@@ -220,7 +780,135 @@ class TestModelosDatos(unittest.TestCase):
         self.assertEqual(prestamo.estado, "devuelto")
         self.assertIsNotNone(prestamo.fecha_devolucion)
         
+        # Consultas con una hora de referencia explícita
+        inicio = datetime(2024, 3, 1, 10, 0)
+        prestamo = Prestamo("P002", "978-84-376-0494-7", "U001", 7, fecha_prestamo=inicio)
+        self.assertEqual(prestamo.dias_restantes(inicio + timedelta(days=2)), 5)
+        self.assertFalse(prestamo.esta_vencido(inicio + timedelta(days=7)))
+        self.assertTrue(prestamo.esta_vencido(inicio + timedelta(days=7, seconds=1)))
+        
         print("✓ Préstamo: Estados y transiciones funcionan correctamente")
+    
+    def test_modelos_compactos(self):
+        """Prueba la representación compacta detrás de los atributos habituales."""
+        print("\n=== PRUEBAS DE MODELOS COMPACTOS ===")
+        
+        inicio = datetime(2024, 3, 1, 10, 0, 30)
+        prestamo = Prestamo("P001", "978-84-376-0494-7", "U001", 14, fecha_prestamo=inicio)
+        self.assertIsInstance(prestamo.marca_prestamo, int)
+        self.assertEqual(prestamo.fecha_prestamo, inicio)
+        self.assertEqual(prestamo.fecha_vencimiento, inicio + timedelta(days=14))
+        self.assertEqual(prestamo.codigo_estado, ESTADO_ACTIVO)
+        
+        prestamo.devolver(inicio + timedelta(days=3))
+        self.assertEqual(prestamo.estado, "devuelto")
+        self.assertEqual(prestamo.fecha_devolucion, inicio + timedelta(days=3))
+        prestamo.estado = "vencido"
+        self.assertEqual(prestamo.codigo_estado, ESTADO_VENCIDO)
+        
+        # El número del préstamo es un entero; el ID se formatea al consultarlo
+        self.assertEqual((prestamo.numero, prestamo.id_prestamo), (1, "P001"))
+        self.assertEqual(prestamo.dias_prestamo, 14)
+        
+        # Las fechas conservan los microsegundos y los plazos cuentan días de
+        # calendario, también al cruzar un cambio de horario de verano
+        inicio = datetime(2024, 3, 5, 10, 0, 0, 123456)
+        prestamo = Prestamo("P1234567", "978-84-376-0494-7", "U001", 14, fecha_prestamo=inicio)
+        self.assertEqual(prestamo.fecha_prestamo, inicio)
+        self.assertEqual(prestamo.fecha_vencimiento, datetime(2024, 3, 19, 10, 0, 0, 123456))
+        self.assertEqual(prestamo.dias_restantes(datetime(2024, 3, 18, 10, 0)), 1)
+        self.assertFalse(prestamo.esta_vencido(prestamo.fecha_vencimiento))
+        self.assertIsNone(prestamo.marca_devolucion)
+        prestamo.devolver(datetime(2024, 3, 10, 23, 59, 59, 999999))
+        self.assertEqual(prestamo.fecha_devolucion, datetime(2024, 3, 10, 23, 59, 59, 999999))
+        self.assertEqual((prestamo.numero, prestamo.fecha_prestamo), (1234567, inicio))
+        with self.assertRaises(ValueError):
+            prestamo.dias_prestamo = -1
+        
+        # Los IDs deben tener el formato P### para reconstruirse desde el número
+        self.assertEqual(Prestamo("P000", "978-1", "U001").id_prestamo, "P000")
+        self.assertEqual(Prestamo("P4294967295", "978-1", "U001").id_prestamo, "P4294967295")
+        for id_invalido in ("X5", "PR-ABC", "P-5", "P5", "P0005", "p001", "P001 ", "P١٢٣", "", 5):
+            with self.assertRaisesRegex(ValueError, "ID de préstamo no válido"):
+                Prestamo(id_invalido, "978-1", "U001")
+        with self.assertRaisesRegex(ValueError, "fuera de rango.*entre 0 y 4294967295"):
+            Prestamo("P4294967296", "978-1", "U001")
+        
+        # En un manager, autores y categorías iguales comparten una sola cadena
+        biblioteca = BibliotecaManager()
+        valores = biblioteca.valores_compartidos
+        autor = "".join(["Gabriel ", "García Márquez"])
+        biblioteca.registrar_libro("978-1", "A", autor, "".join(["Realismo ", "Mágico"]), 1967)
+        libro_a = biblioteca.obtener_libro_por_isbn("978-1")
+        libro_muestra = biblioteca.obtener_libro_por_isbn("978-84-376-0494-7")
+        self.assertIs(libro_a.autor, libro_muestra.autor)
+        self.assertIs(libro_a.categoria, libro_muestra.categoria)
+        
+        # Los valores que ningún libro usa ya no se conservan
+        biblioteca.registrar_libro("978-2", "B", "Autor Único", "Ensayo", 1981)
+        self.assertIn("Autor Único", valores)
+        self.assertIn("autor unico", valores)
+        biblioteca.actualizar_libro("978-2", autor="".join(["Miguel de ", "Cervantes"]))
+        self.assertNotIn("Autor Único", valores)
+        self.assertNotIn("autor unico", valores)
+        self.assertIs(biblioteca.obtener_libro_por_isbn("978-2").autor,
+                      biblioteca.obtener_libro_por_isbn("978-84-663-0016-6").autor)
+        biblioteca.eliminar_libro("978-2")
+        self.assertNotIn("Ensayo", valores)
+        self.assertIn("Miguel de Cervantes", valores)  # Sigue en uso por otro libro
+        biblioteca.eliminar_libro("978-1")
+        self.assertIn("Gabriel García Márquez", valores)
+        for isbn in [libro.isbn for libro in biblioteca.obtener_todos_los_libros()]:
+            biblioteca.eliminar_libro(isbn)
+        self.assertEqual(len(valores), 0)
+        
+        # Un libro suelto guarda sus propios valores
+        libro = Libro("978-3", "C", "Autor", "Categoría", 2000)
+        libro.autor = "".join(["Miguel de ", "Cervantes"])
+        self.assertEqual((libro.autor, libro.clave_autor), ("Miguel de Cervantes", "miguel de cervantes"))
+        
+        print("✓ Modelos compactos: Fechas, estados y valores compartidos verificados")
+    
+    def test_claves_busqueda_normalizadas(self):
+        """Prueba las claves de búsqueda sin mayúsculas ni tildes de libros y usuarios."""
+        print("\n=== PRUEBAS DE CLAVES NORMALIZADAS ===")
+        
+        self.assertEqual(normalizar_texto("Gabriel GARCÍA Márquez"), "gabriel garcia marquez")
+        self.assertEqual(normalizar_texto("Straße Ñandú"), "strasse nandu")
+        texto = "ya normalizado"
+        self.assertIs(normalizar_texto(texto), texto)  # Sin copia si no cambia
+        
+        libro = Libro("978-X", "Cien Años de Soledad", "Gabriel García Márquez", "Novela", 1967)
+        self.assertEqual(libro.clave_titulo, "cien anos de soledad")
+        self.assertEqual(libro.clave_autor, "gabriel garcia marquez")
+        self.assertEqual(libro.clave_isbn, "978-x")
+        libro.titulo = "Crónica"
+        self.assertEqual(libro.clave_titulo, "cronica")
+        
+        usuario = Usuario("U001", "José Pérez", "Jose@Email.com", "555")
+        self.assertEqual((usuario.clave_id, usuario.clave_nombre, usuario.clave_email),
+                         ("u001", "jose perez", "jose@email.com"))
+        usuario.nombre = "María"
+        self.assertEqual(usuario.clave_nombre, "maria")
+        
+        print("✓ Claves normalizadas: Calculadas al crear y al actualizar registros")
+    
+    def test_modelos_sin_diccionario_por_instancia(self):
+        """Prueba que los modelos y nodos usan __slots__ en lugar de __dict__."""
+        print("\n=== PRUEBAS DE __slots__ EN MODELOS ===")
+        
+        objetos = [
+            Libro("978-test-002", "Título", "Autor", "Categoría", 2000),
+            Usuario("U001", "Nombre", "email@email.com", "555-0000"),
+            Prestamo("P001", "978-test-002", "U001"),
+            Nodo("dato"),
+        ]
+        for objeto in objetos:
+            self.assertFalse(hasattr(objeto, '__dict__'))
+            with self.assertRaises(AttributeError):
+                objeto.atributo_inexistente = True
+        
+        print("✓ Modelos: Instancias sin __dict__ verificadas")
 
 class TestSistemaBiblioteca(unittest.TestCase):
     """
@@ -255,8 +943,149 @@ class TestSistemaBiblioteca(unittest.TestCase):
         libros_autor = self.biblioteca.buscar_libros("autor", "Test")
         self.assertGreater(len(libros_autor), 0)
         
+        # Subcadenas sin distinguir mayúsculas, en orden de registro
+        self.assertEqual([libro.isbn for libro in self.biblioteca.buscar_libros("autor", "GARCÍA")],
+                         ["978-84-376-0494-7", "978-84-663-2946-4"])
+        self.assertEqual(len(self.biblioteca.buscar_libros("isbn", "test-0")), 1)
+        self.assertEqual(self.biblioteca.buscar_libros("editorial", "Prueba"), [])
+        
+        # El índice se actualiza al eliminar libros
+        self.assertTrue(self.biblioteca.eliminar_libro("978-test-001"))
+        self.assertEqual(self.biblioteca.buscar_libros("titulo", "de prueba"), [])
+        
         print("✓ Gestión de libros: Registro y búsqueda funcionan correctamente")
     
+    def test_busqueda_sin_tildes(self):
+        """Prueba que la búsqueda y las sugerencias de libros ignoran mayúsculas y tildes."""
+        print("\n=== PRUEBAS DE BÚSQUEDA SIN TILDES ===")
+        
+        por_autor = self.biblioteca.buscar_libros("autor", "garcia marquez")
+        self.assertEqual(len(por_autor), 2)
+        self.assertEqual(por_autor, self.biblioteca.buscar_libros("autor", "GARCÍA MÁRQUEZ"))
+        self.assertEqual([libro.titulo for libro in self.biblioteca.buscar_libros("titulo", "CRONICA")],
+                         ["Crónica de una muerte anunciada"])
+        self.assertEqual(self.biblioteca.sugerir("marq", campo="autor"), ["Gabriel García Márquez"])
+        self.assertEqual(self.biblioteca.sugerir("Crón", campo="titulo"),
+                         ["Crónica de una muerte anunciada"])
+        
+        print("✓ Búsqueda sin tildes: Libros y sugerencias verificados")
+    
+    def test_busqueda_aproximada(self):
+        """Prueba la búsqueda de libros tolerando errores de escritura."""
+        print("\n=== PRUEBAS DE BÚSQUEDA APROXIMADA ===")
+        
+        self.assertEqual(self.biblioteca.buscar_libros("autor", "Garsia Marquez"), [])
+        por_autor = self.biblioteca.buscar_libros("autor_aprox", "Garsia Marquez")
+        self.assertEqual(por_autor, self.biblioteca.buscar_libros("autor", "garcía márquez"))
+        self.assertEqual([libro.autor for libro in self.biblioteca.buscar_libros("autor_aprox", "servantes")],
+                         ["Miguel de Cervantes"])
+        self.assertEqual([libro.titulo for libro in self.biblioteca.buscar_libros("titulo_aprox", "soledd")],
+                         ["Cien años de soledad"])
+        
+        # La distancia tolerada es acotada y todas las palabras deben coincidir
+        self.assertEqual(self.biblioteca.buscar_libros("autor_aprox", "Grcxa"), [])
+        self.assertEqual(self.biblioteca.buscar_libros("autor_aprox", "garcia borges"), [])
+        self.assertEqual(self.biblioteca.buscar_libros("isbn_aprox", "978"), [])
+        
+        # Los libros nuevos y eliminados se reflejan en el índice
+        self.biblioteca.registrar_libro("978-test-003", "Ficciones", "Jorge Luis Borges", "Cuento", 1944)
+        self.assertEqual(len(self.biblioteca.buscar_libros("autor_aprox", "jorje borjes")), 1)
+        self.biblioteca.eliminar_libro("978-test-003")
+        self.assertEqual(self.biblioteca.buscar_libros("autor_aprox", "borges"), [])
+        self.assertNotIn("borges", self.biblioteca.indices_aproximados['autor'])
+        
+        print("✓ Búsqueda aproximada: Errores de escritura tolerados y acotados")
+    
+    def test_actualizar_libro_reindexa(self):
+        """Prueba que modificar un libro actualiza todos sus índices."""
+        print("\n=== PRUEBAS DE ACTUALIZACIÓN DE LIBROS ===")
+        
+        isbn = "978-84-376-0485-5"
+        id_prestamo = self.biblioteca.realizar_prestamo(isbn, "U001")
+        self.biblioteca.devolver_libro(id_prestamo)
+        self.assertTrue(self.biblioteca.actualizar_libro(
+            isbn, titulo="Rebelión en la granja", autor="Eric Blair", año_publicacion=1945))
+        
+        # Búsqueda por subcadena
+        self.assertEqual(self.biblioteca.buscar_libros("titulo", "1984"), [])
+        self.assertEqual([libro.isbn for libro in self.biblioteca.buscar_libros("titulo", "rebelion")],
+                         [isbn])
+        self.assertEqual(self.biblioteca.buscar_libros("autor", "orwell"), [])
+        
+        # Sugerencias, conservando los préstamos del libro como peso
+        self.assertEqual(self.biblioteca.sugerir("geo"), [])
+        self.assertEqual(self.biblioteca.sugerir("rebe", campo='titulo'), ["Rebelión en la granja"])
+        self.assertEqual(self.biblioteca.sugerencias['titulo'].peso("Rebelión en la granja"), 1)
+        self.assertEqual(self.biblioteca.sugerir("eri"), ["Eric Blair"])
+        
+        # Búsqueda aproximada y por rango de años
+        self.assertEqual(self.biblioteca.buscar_libros("autor_aprox", "orwel"), [])
+        self.assertEqual([libro.isbn for libro in self.biblioteca.buscar_libros("autor_aprox", "erik blar")],
+                         [isbn])
+        self.assertEqual(self.biblioteca.buscar_libros_por_rango(1949, 1949), [])
+        self.assertEqual([libro.isbn for libro in self.biblioteca.buscar_libros_por_rango(1945, 1945)],
+                         [isbn])
+        
+        # La disponibilidad y los campos desconocidos no se modifican por esta vía
+        with self.assertRaises(ValueError):
+            self.biblioteca.actualizar_libro(isbn, disponible=False)
+        self.assertFalse(self.biblioteca.actualizar_libro("978-0", titulo="Nada"))
+        self.assertEqual(self.biblioteca.verificar_estadisticas(), {})
+        
+        print("✓ Actualización de libros: Búsqueda, sugerencias, aproximada y años reindexados")
+    
+    def test_busqueda_por_rango_de_años(self):
+        """Prueba la búsqueda de libros por rango de año de publicación."""
+        print("\n=== PRUEBAS DE BÚSQUEDA POR RANGO DE AÑOS ===")
+        
+        self.assertEqual([libro.año_publicacion for libro in self.biblioteca.buscar_libros_por_rango(1940, 1970)],
+                         [1943, 1949, 1967])
+        self.assertEqual(len(self.biblioteca.buscar_libros_por_rango()), 5)
+        self.assertEqual(self.biblioteca.buscar_libros_por_rango(1700, 1900), [])
+        
+        self.biblioteca.registrar_libro("978-test-004", "Ficciones", "Jorge Luis Borges", "Cuento", 1944)
+        self.assertEqual([libro.titulo for libro in self.biblioteca.buscar_libros_por_rango(1944, 1944)],
+                         ["Ficciones"])
+        self.biblioteca.eliminar_libro("978-test-004")
+        self.assertEqual(self.biblioteca.buscar_libros_por_rango(1944, 1944), [])
+        
+        # Coincide con el recorrido completo de la lista
+        esperado = self.biblioteca.libros.buscar(lambda libro: 1900 <= libro.año_publicacion <= 2000)
+        self.assertCountEqual(self.biblioteca.buscar_libros_por_rango(1900, 2000), esperado)
+        
+        print("✓ Búsqueda por rango: Índice ordenado por año verificado")
+    
+    def test_sugerencias_por_prestamos(self):
+        """Prueba el autocompletado de títulos y autores según la cantidad de préstamos."""
+        print("\n=== PRUEBAS DE SUGERENCIAS ===")
+        
+        self.assertEqual(self.biblioteca.sugerir("cr", campo="titulo"),
+                         ["Crónica de una muerte anunciada"])
+        self.assertEqual(self.biblioteca.sugerir("gab"), ["Gabriel García Márquez"])
+        self.assertEqual(self.biblioteca.sugerir("  "), [])
+        
+        # Los préstamos elevan la posición del título y del autor
+        self.biblioteca.realizar_prestamo("978-84-663-2946-4", "U001")
+        self.assertEqual(self.biblioteca.sugerir("c", 2, campo="titulo"),
+                         ["Crónica de una muerte anunciada", "Cien años de soledad"])
+        self.assertEqual(self.biblioteca.sugerir("m")[:2],
+                         ["Crónica de una muerte anunciada", "Gabriel García Márquez"])
+        
+        self.biblioteca.registrar_libro("978-test-002", "Cuentos", "Autor Test", "Prueba", 2024)
+        self.assertIn("Cuentos", self.biblioteca.sugerir("cu", campo="titulo"))
+        self.biblioteca.eliminar_libro("978-test-002")
+        self.assertEqual(self.biblioteca.sugerir("cu", campo="titulo"), [])
+        self.assertEqual(self.biblioteca.sugerir("autor t"), [])
+        
+        # Un campo sin sugerencias se informa con ValueError, aun con prefijo vacío
+        for campo in ("categoria", "editorial"):
+            with self.assertRaises(ValueError):
+                self.biblioteca.sugerir("c", campo=campo)
+        with self.assertRaises(ValueError):
+            self.biblioteca.sugerir("", campo="isbn")
+        
+        print("✓ Sugerencias: Prefijos por palabra y orden por préstamos verificados")
+    
     def test_registro_y_busqueda_usuarios(self):
         """Prueba el registro y búsqueda de usuarios."""
         print("\n=== PRUEBAS DE GESTIÓN DE USUARIOS ===")
@@ -282,8 +1111,43 @@ class TestSistemaBiblioteca(unittest.TestCase):
         self.assertIsNotNone(usuario)
         self.assertEqual(usuario.id_usuario, user_id)
         
+        # Sin distinguir mayúsculas ni tildes, en ambos sentidos
+        self.assertEqual([u.nombre for u in self.biblioteca.buscar_usuarios("nombre", "PEREZ")],
+                         ["Juan Pérez"])
+        self.assertEqual(len(self.biblioteca.buscar_usuarios("nombre", "usuário")), 1)
+        self.assertEqual(self.biblioteca.buscar_usuarios("id", user_id.lower()), [usuario])
+        self.assertEqual(self.biblioteca.buscar_usuarios("telefono", "555"), [])
+        
         print("✓ Gestión de usuarios: Registro y búsqueda funcionan correctamente")
     
+    def test_eliminar_usuarios(self):
+        """Prueba que las búsquedas por ID siguen funcionando tras eliminar usuarios."""
+        print("\n=== PRUEBAS DE ELIMINACIÓN DE USUARIOS ===")
+        
+        ids = [self.biblioteca.registrar_usuario(f"Usuario {i}", f"u{i}@email.com", "555")
+               for i in range(10)]
+        
+        # No se elimina un usuario con préstamos activos
+        libro = self.biblioteca.obtener_todos_los_libros()[0]
+        self.biblioteca.realizar_prestamo(libro.isbn, ids[-1])
+        self.assertFalse(self.biblioteca.eliminar_usuario(ids[-1]))
+        
+        for id_usuario in ids[:8]:
+            self.assertTrue(self.biblioteca.eliminar_usuario(id_usuario))
+        self.assertFalse(self.biblioteca.eliminar_usuario(ids[0]))
+        
+        self.assertIsNone(self.biblioteca.obtener_usuario_por_id(ids[0]))
+        self.assertEqual(self.biblioteca.obtener_usuario_por_id(ids[8]).nombre, "Usuario 8")
+        self.assertEqual(self.biblioteca.obtener_usuario_por_id("U001").nombre, "Juan Pérez")
+        self.assertIsNotNone(self.biblioteca.realizar_prestamo(
+            self.biblioteca.obtener_todos_los_libros()[1].isbn, ids[9]))
+        self.assertEqual(len(self.biblioteca.obtener_todos_los_usuarios()), 5)
+        
+        # El email de un usuario eliminado queda libre
+        self.assertIsNotNone(self.biblioteca.registrar_usuario("Nuevo", "u0@email.com", "555"))
+        
+        print("✓ Eliminación de usuarios: Índices por ID y email se mantienen correctos")
+    
     def test_sistema_prestamos_completo(self):
         """Prueba el sistema completo de préstamos."""
         print("\n=== PRUEBAS DE SISTEMA DE PRÉSTAMOS ===")
@@ -328,6 +1192,176 @@ class TestSistemaBiblioteca(unittest.TestCase):
         
         print("✓ Sistema de préstamos: Préstamo y devolución funcionan correctamente")
     
+    def test_prestamos_y_devoluciones_lote(self):
+        """Prueba los préstamos y devoluciones por lote con semántica todo o nada."""
+        print("\n=== PRUEBAS DE PRÉSTAMOS Y DEVOLUCIONES POR LOTE ===")
+        
+        isbns = [libro.isbn for libro in self.biblioteca.obtener_todos_los_libros()]
+        
+        # Un lote con errores no realiza ningún préstamo
+        lote = self.biblioteca.realizar_prestamos_lote([
+            (isbns[0], "U001"), (isbns[1], "U999"), (isbns[0], "U002"), ("978-x", "U001")
+        ])
+        self.assertFalse(lote['exitoso'])
+        errores = [r['error'] for r in lote['resultados']]
+        self.assertEqual(errores, [None, "Usuario no encontrado",
+                                   "Libro repetido en el lote", "Libro no encontrado"])
+        self.assertEqual(self.biblioteca.obtener_prestamos_activos(), [])
+        self.assertTrue(all(r['prestamo_id'] is None for r in lote['resultados']))
+        
+        # Un lote válido se aplica completo
+        lote = self.biblioteca.realizar_prestamos_lote([(isbns[0], "U001"), (isbns[1], "U002")])
+        self.assertTrue(lote['exitoso'])
+        ids = [r['prestamo_id'] for r in lote['resultados']]
+        self.assertTrue(all(ids))
+        self.assertFalse(self.biblioteca.obtener_libro_por_isbn(isbns[0]).disponible)
+        
+        # Un libro ya prestado invalida el lote
+        lote = self.biblioteca.realizar_prestamos_lote([(isbns[0], "U003")])
+        self.assertEqual(lote['resultados'][0]['error'], "Libro no disponible")
+        
+        # Devoluciones: un ID inválido o repetido no devuelve nada
+        lote = self.biblioteca.devolver_lote([ids[0], ids[0], "P999"])
+        self.assertFalse(lote['exitoso'])
+        self.assertEqual([r['error'] for r in lote['resultados']],
+                         [None, "Préstamo repetido en el lote", "Préstamo no encontrado"])
+        self.assertEqual(len(self.biblioteca.obtener_prestamos_activos()), 2)
+        
+        lote = self.biblioteca.devolver_lote(ids)
+        self.assertTrue(lote['exitoso'])
+        self.assertEqual(self.biblioteca.obtener_prestamos_activos(), [])
+        self.assertTrue(self.biblioteca.obtener_libro_por_isbn(isbns[0]).disponible)
+        
+        print("✓ Lotes: Validación en una pasada y semántica todo o nada verificadas")
+    
+    def test_prestamos_por_usuario(self):
+        """Prueba el índice de préstamos activos por usuario."""
+        print("\n=== PRUEBAS DE PRÉSTAMOS POR USUARIO ===")
+        
+        isbns = [libro.isbn for libro in self.biblioteca.obtener_todos_los_libros()]
+        id_1 = self.biblioteca.realizar_prestamo(isbns[0], "U001")
+        id_2 = self.biblioteca.realizar_prestamo(isbns[1], "U001")
+        id_3 = self.biblioteca.realizar_prestamo(isbns[2], "U002")
+        
+        ids_u001 = [p.id_prestamo for p in self.biblioteca.obtener_prestamos_usuario("U001")]
+        self.assertEqual(ids_u001, [id_1, id_2])
+        self.assertEqual(self.biblioteca.obtener_prestamos_usuario("U003"), [])
+        
+        self.biblioteca.devolver_libro(id_1)
+        ids_u001 = [p.id_prestamo for p in self.biblioteca.obtener_prestamos_usuario("U001")]
+        self.assertEqual(ids_u001, [id_2])
+        
+        self.biblioteca.devolver_lote([id_2, id_3])
+        self.assertEqual(self.biblioteca.obtener_prestamos_usuario("U001"), [])
+        self.assertEqual(self.biblioteca.prestamos_por_usuario, {})
+        
+        print("✓ Préstamos por usuario: Índice actualizado en préstamos y devoluciones")
+    
+    def test_indice_vencimientos(self):
+        """Prueba las consultas de vencimiento y el barrido en bloque."""
+        print("\n=== PRUEBAS DE ÍNDICE DE VENCIMIENTOS ===")
+        
+        isbns = [libro.isbn for libro in self.biblioteca.obtener_todos_los_libros()]
+        ids = [self.biblioteca.realizar_prestamo(isbn, "U001") for isbn in isbns[:3]]
+        ahora = datetime.now()
+        futuro = ahora + timedelta(days=15)
+        
+        self.assertEqual(self.biblioteca.obtener_prestamos_vencidos(ahora), [])
+        self.assertEqual(len(self.biblioteca.obtener_prestamos_por_vencer(15, ahora)), 3)
+        self.assertEqual(self.biblioteca.obtener_prestamos_por_vencer(5, ahora), [])
+        self.assertEqual(len(self.biblioteca.obtener_prestamos_vencidos(futuro)), 3)
+        
+        # Los préstamos devueltos se descartan del índice
+        self.biblioteca.devolver_libro(ids[0])
+        vencidos = self.biblioteca.barrer_vencidos(futuro)
+        self.assertEqual([p.id_prestamo for p in vencidos], ids[1:])
+        self.assertTrue(all(p.estado == "vencido" for p in vencidos))
+        self.assertEqual(self.biblioteca.barrer_vencidos(futuro), [])
+        
+        # Las consultas combinan los préstamos ya barridos y los pendientes
+        self.assertEqual([p.id_prestamo for p in self.biblioteca.obtener_prestamos_vencidos(futuro)],
+                         ids[1:])
+        self.assertEqual(self.biblioteca.obtener_prestamos_vencidos(ahora), [])
+        self.biblioteca.devolver_libro(ids[1])
+        self.assertEqual([p.id_prestamo for p in self.biblioteca.obtener_prestamos_vencidos(futuro)],
+                         ids[2:])
+        self.assertNotIn(ids[1], self.biblioteca.prestamos_vencidos)
+        
+        print("✓ Vencimientos: Consultas por fecha y barrido en bloque verificados")
+    
+    def test_tareas_programadas_prestamos(self):
+        """Prueba los recordatorios y vencimientos programados de los préstamos."""
+        print("\n=== PRUEBAS DE TAREAS PROGRAMADAS ===")
+        
+        isbns = [libro.isbn for libro in self.biblioteca.obtener_todos_los_libros()]
+        ids = [self.biblioteca.realizar_prestamo(isbn, "U001") for isbn in isbns[:3]]
+        ahora = datetime.now()
+        self.assertEqual(self.biblioteca.temporizador.obtener_tamaño(), 6)
+        
+        # Devolver un préstamo cancela sus tareas
+        self.biblioteca.devolver_libro(ids[0])
+        self.assertEqual(self.biblioteca.temporizador.obtener_tamaño(), 4)
+        
+        self.assertEqual(self.biblioteca.procesar_tareas_programadas(ahora + timedelta(days=1)), 0)
+        self.assertEqual(self.biblioteca.procesar_tareas_programadas(ahora + timedelta(days=13)), 2)
+        self.assertEqual([p.id_prestamo for p in self.biblioteca.obtener_recordatorios()], ids[1:])
+        self.assertEqual(self.biblioteca.obtener_recordatorios(), [])
+        self.assertTrue(all(self.biblioteca.prestamos_activos[i].estado == "activo" for i in ids[1:]))
+        
+        self.assertEqual(self.biblioteca.procesar_tareas_programadas(ahora + timedelta(days=15)), 2)
+        self.assertEqual(list(self.biblioteca.prestamos_vencidos), ids[1:])
+        self.assertTrue(all(self.biblioteca.prestamos_activos[i].estado == "vencido" for i in ids[1:]))
+        
+        # Tareas genéricas
+        avisos = []
+        id_tarea = self.biblioteca.programar_tarea(ahora + timedelta(days=20),
+                                                   lambda datos, momento: avisos.extend(datos), "x")
+        self.biblioteca.programar_tarea(ahora + timedelta(days=20),
+                                        lambda datos, momento: avisos.extend(datos), "y")
+        self.assertTrue(self.biblioteca.cancelar_tarea(id_tarea))
+        self.biblioteca.procesar_tareas_programadas(ahora + timedelta(days=21))
+        self.assertEqual(avisos, ["y"])
+        
+        print("✓ Tareas programadas: Recordatorios, vencimientos y cancelación verificados")
+    
+    def test_reloj_inyectable(self):
+        """Prueba el reloj manual y el "ahora" congelado en operaciones por lotes."""
+        print("\n=== PRUEBAS DE RELOJ INYECTABLE ===")
+        
+        inicio = datetime(2024, 3, 1, 10, 0)
+        reloj = RelojManual(inicio)
+        biblioteca = BibliotecaManager(reloj=reloj)
+        isbns = [libro.isbn for libro in biblioteca.obtener_todos_los_libros()]
+        self.assertTrue(all(libro.fecha_registro == inicio for libro in biblioteca.iterar_libros()))
+        
+        id_prestamo = biblioteca.realizar_prestamo(isbns[0], "U001")
+        prestamo = biblioteca.prestamos_activos[id_prestamo]
+        self.assertEqual(prestamo.fecha_prestamo, inicio)
+        
+        # El tiempo solo avanza cuando lo indica la prueba
+        reloj.avanzar(days=13)
+        self.assertEqual(biblioteca.barrer_vencidos(), [])
+        self.assertEqual(biblioteca.procesar_tareas_programadas(), 1)
+        self.assertEqual(biblioteca.obtener_recordatorios(), [prestamo])
+        reloj.avanzar(days=1, minutes=1)
+        self.assertEqual(biblioteca.procesar_tareas_programadas(), 1)
+        self.assertEqual(prestamo.estado, "vencido")
+        
+        # Dentro de congelado() todas las consultas usan el mismo momento
+        with reloj.congelado() as ahora:
+            reloj.avanzar(hours=5)
+            self.assertEqual(reloj.ahora(), ahora)
+            with reloj.congelado() as interior:
+                self.assertEqual(interior, ahora)
+        self.assertEqual(reloj.ahora(), ahora + timedelta(hours=5))
+        
+        resultado = biblioteca.realizar_prestamos_lote([(isbns[1], "U002"), (isbns[2], "U003")])
+        fechas = {biblioteca.prestamos_activos[r['prestamo_id']].fecha_prestamo
+                  for r in resultado['resultados']}
+        self.assertEqual(fechas, {reloj.ahora()})
+        
+        print("✓ Reloj: Hora controlada en pruebas y congelada por lote verificadas")
+    
     def test_estadisticas_sistema(self):
         """Prueba las estadísticas del sistema."""
         print("\n=== PRUEBAS DE ESTADÍSTICAS ===")
@@ -351,6 +1385,309 @@ class TestSistemaBiblioteca(unittest.TestCase):
         )
         
         print("✓ Estadísticas: Cálculos y coherencia verificados correctamente")
+    
+    def test_contadores_estadisticas_consistentes(self):
+        """Prueba que los contadores coinciden con un recálculo completo."""
+        print("\n=== PRUEBAS DE CONTADORES DE ESTADÍSTICAS ===")
+        
+        isbns = [libro.isbn for libro in self.biblioteca.obtener_todos_los_libros()]
+        self.biblioteca.registrar_libro("978-test-010", "Nuevo", "Autor", "Categoría", 2020)
+        id_1 = self.biblioteca.realizar_prestamo(isbns[0], "U001")
+        self.biblioteca.realizar_prestamo(isbns[1], "U002")
+        self.biblioteca.agregar_solicitud_prestamo(isbns[0], "U003")
+        self.biblioteca.procesar_siguiente_solicitud()  # Pasa a lista de espera
+        self.biblioteca.devolver_libro(id_1)            # Se presta a U003
+        self.assertFalse(self.biblioteca.eliminar_libro(isbns[1]))  # Libro prestado
+        self.assertTrue(self.biblioteca.eliminar_libro(isbns[2]))   # Libro disponible
+        self.assertFalse(self.biblioteca.eliminar_libro(isbns[2]))
+        
+        self.assertEqual(self.biblioteca.verificar_estadisticas(), {})
+        stats = self.biblioteca.obtener_estadisticas()
+        self.assertEqual(stats['total_libros'], 5)
+        self.assertEqual(stats['libros_prestados'], 2)
+        self.assertEqual(stats['libros_disponibles'], 3)
+        self.assertEqual(stats['total_prestamos'], 3)
+        self.assertEqual(stats['total_solicitudes'], 1)
+        
+        # Un cambio fuera del gestor se detecta en la verificación
+        self.biblioteca.obtener_libro_por_isbn(isbns[3]).disponible = False
+        self.assertIn('libros_disponibles', self.biblioteca.verificar_estadisticas())
+        
+        print("✓ Estadísticas: Contadores incrementales consistentes con el recálculo")
+    
+    def test_eliminar_libro_prestado(self):
+        """Prueba que un libro prestado no se elimina y los contadores siguen correctos."""
+        print("\n=== PRUEBAS DE ELIMINACIÓN DE LIBRO PRESTADO ===")
+        
+        isbn = "978-84-376-0494-7"
+        id_prestamo = self.biblioteca.realizar_prestamo(isbn, "U001")
+        self.assertFalse(self.biblioteca.eliminar_libro(isbn))
+        self.assertFalse(self.biblioteca.registrar_libro(isbn, "Otro", "Autor", "Categoría", 2020))
+        self.assertTrue(self.biblioteca.devolver_libro(id_prestamo))
+        self.assertEqual(self.biblioteca.verificar_estadisticas(), {})
+        
+        # Devuelto, ya puede eliminarse y registrarse de nuevo
+        self.assertTrue(self.biblioteca.eliminar_libro(isbn))
+        self.assertTrue(self.biblioteca.registrar_libro(isbn, "Otro", "Autor", "Categoría", 2020))
+        self.assertEqual(self.biblioteca.verificar_estadisticas(), {})
+        stats = self.biblioteca.obtener_estadisticas()
+        self.assertEqual((stats['total_libros'], stats['libros_disponibles'], stats['libros_prestados']),
+                         (5, 5, 0))
+        
+        print("✓ Eliminación de libros: Libros prestados protegidos y contadores consistentes")
+    
+    def test_solicitudes_con_cola_circular(self):
+        """Prueba que la cola circular funciona como cola de solicitudes."""
+        print("\n=== PRUEBAS DE SOLICITUDES CON COLA CIRCULAR ===")
+        
+        biblioteca = BibliotecaManager(cola_solicitudes=ColaCircular())
+        libros = biblioteca.obtener_todos_los_libros()
+        biblioteca.agregar_solicitud_prestamo(libros[0].isbn, "U001")
+        biblioteca.agregar_solicitud_prestamo(libros[1].isbn, "U002")
+        self.assertEqual(biblioteca.obtener_estadisticas()['solicitudes_pendientes'], 2)
+        
+        resultado = biblioteca.procesar_siguiente_solicitud()
+        self.assertTrue(resultado['exitoso'])
+        self.assertEqual(resultado['solicitud']['id_usuario'], "U001")
+        self.assertEqual(len(biblioteca.obtener_solicitudes_pendientes()), 1)
+        
+        print("✓ Solicitudes: Cola circular usada como reemplazo directo")
+    
+    def test_solicitudes_por_prioridad(self):
+        """Prueba que las solicitudes se atienden por clase de prioridad."""
+        print("\n=== PRUEBAS DE SOLICITUDES POR PRIORIDAD ===")
+        
+        libros = self.biblioteca.obtener_todos_los_libros()
+        self.biblioteca.agregar_solicitud_prestamo(libros[0].isbn, "U001")
+        self.biblioteca.agregar_solicitud_prestamo(libros[1].isbn, "U002", PRIORIDAD_RESERVA_CURSO)
+        self.biblioteca.agregar_solicitud_prestamo(libros[2].isbn, "U003", PRIORIDAD_PERSONAL)
+        self.biblioteca.agregar_solicitud_prestamo(libros[3].isbn, "U001", PRIORIDAD_PUBLICO)
+        with self.assertRaises(ValueError):
+            self.biblioteca.agregar_solicitud_prestamo(libros[4].isbn, "U001", 7)
+        
+        atendidas = [self.biblioteca.procesar_siguiente_solicitud()['solicitud']['isbn_libro']
+                     for _ in range(4)]
+        self.assertEqual(atendidas, [libros[2].isbn, libros[1].isbn, libros[0].isbn, libros[3].isbn])
+        self.assertIsNone(self.biblioteca.procesar_siguiente_solicitud())
+        
+        print("✓ Solicitudes: Personal, reservas de curso y público atendidos en orden")
+    
+    def test_lista_espera_atendida_al_devolver(self):
+        """Prueba que una devolución presta el libro al siguiente en la lista de espera."""
+        print("\n=== PRUEBAS DE LISTAS DE ESPERA ===")
+        
+        isbn = self.biblioteca.obtener_todos_los_libros()[0].isbn
+        id_prestamo = self.biblioteca.realizar_prestamo(isbn, "U001")
+        id_eliminado = self.biblioteca.registrar_usuario("Temporal", "temporal@email.com", "555")
+        
+        # Las solicitudes de un libro prestado pasan a su lista de espera
+        for id_usuario in (id_eliminado, "U002", "U003"):
+            self.biblioteca.agregar_solicitud_prestamo(isbn, id_usuario)
+            resultado = self.biblioteca.procesar_siguiente_solicitud()
+            self.assertFalse(resultado['exitoso'])
+            self.assertTrue(resultado['en_espera'])
+        self.assertEqual(len(self.biblioteca.obtener_lista_espera(isbn)), 3)
+        self.assertEqual(self.biblioteca.obtener_metricas_espera(isbn)['en_espera'], 3)
+        
+        # Al devolver, el libro pasa al primer solicitante que sigue registrado
+        self.biblioteca.eliminar_usuario(id_eliminado)
+        self.assertTrue(self.biblioteca.devolver_libro(id_prestamo))
+        self.assertFalse(self.biblioteca.obtener_libro_por_isbn(isbn).disponible)
+        prestamos_u002 = self.biblioteca.obtener_prestamos_usuario("U002")
+        self.assertEqual([p.isbn_libro for p in prestamos_u002], [isbn])
+        self.assertEqual([s['id_usuario'] for s in self.biblioteca.obtener_lista_espera(isbn)], ["U003"])
+        
+        # La última devolución vacía la lista de espera
+        self.biblioteca.devolver_libro(prestamos_u002[0].id_prestamo)
+        self.assertEqual(self.biblioteca.obtener_lista_espera(isbn), [])
+        self.assertNotIn(isbn, self.biblioteca.listas_espera)
+        
+        metricas = self.biblioteca.obtener_metricas_espera(isbn)
+        self.assertEqual(metricas['atendidas'], 2)
+        self.assertEqual(metricas['en_espera'], 0)
+        self.assertGreaterEqual(metricas['espera_maxima'], metricas['espera_promedio'])
+        self.assertIn(isbn, self.biblioteca.obtener_metricas_espera())
+        
+        print("✓ Listas de espera: Atención automática al devolver y métricas verificadas")
+    
+    def test_procesar_solicitudes_lote(self):
+        """Prueba el procesamiento por lotes agrupado por ISBN."""
+        print("\n=== PRUEBAS DE PROCESAMIENTO POR LOTES ===")
+        
+        libros = self.biblioteca.obtener_todos_los_libros()
+        solicitudes = [
+            (libros[0].isbn, "U001"),
+            (libros[1].isbn, "U002", PRIORIDAD_PERSONAL),
+            (libros[0].isbn, "U003"),
+            ("978-inexistente", "U001"),
+            (libros[2].isbn, "U999"),
+            (libros[3].isbn, "U002"),
+        ]
+        for solicitud in solicitudes:
+            self.biblioteca.agregar_solicitud_prestamo(*solicitud)
+        
+        resumen = self.biblioteca.procesar_solicitudes_lote(5)
+        self.assertEqual(resumen['procesadas'], 5)
+        self.assertEqual(resumen['exitosas'], 2)
+        self.assertEqual(resumen['en_espera'], 1)
+        self.assertEqual(resumen['fallidas'], 2)
+        self.assertEqual(resumen['libros'], 4)
+        self.assertEqual(len(resumen['prestamos']), 2)
+        self.assertFalse(self.biblioteca.obtener_libro_por_isbn(libros[0].isbn).disponible)
+        self.assertEqual([s['id_usuario'] for s in self.biblioteca.obtener_lista_espera(libros[0].isbn)],
+                         ["U003"])
+        
+        # La solicitud restante queda en la cola
+        self.assertEqual(len(self.biblioteca.obtener_solicitudes_pendientes()), 1)
+        self.assertEqual(self.biblioteca.procesar_solicitudes_lote(10)['exitosas'], 1)
+        self.assertEqual(self.biblioteca.procesar_solicitudes_lote(10)['procesadas'], 0)
+        
+        # También funciona con una cola enlazada sin prioridades
+        biblioteca = BibliotecaManager(cola_solicitudes=Cola())
+        biblioteca.agregar_solicitud_prestamo(libros[4].isbn, "U001")
+        self.assertEqual(biblioteca.procesar_solicitudes_lote(10)['exitosas'], 1)
+        self.assertTrue(biblioteca.cola_solicitudes.esta_vacia())
+        
+        print("✓ Procesamiento por lotes: Agrupación por ISBN y resumen verificados")
+    
+    def test_archivo_prestamos(self):
+        """Prueba el archivo columnar y las vistas de historial por usuario y libro."""
+        print("\n=== PRUEBAS DE ARCHIVO DE PRÉSTAMOS ===")
+        
+        isbns = [libro.isbn for libro in self.biblioteca.obtener_todos_los_libros()]
+        usuario = self.biblioteca.obtener_usuario_por_id("U001")
+        self.assertEqual(len(self.biblioteca.obtener_historial_usuario("U001")), 0)
+        
+        ids = [self.biblioteca.realizar_prestamo(isbn, "U001") for isbn in isbns[:2]]
+        self.biblioteca.devolver_libro(ids[0])
+        id_nuevo = self.biblioteca.realizar_prestamo(isbns[0], "U002")
+        
+        # El préstamo devuelto solo queda en el archivo y se reconstruye al consultarlo
+        self.assertEqual(len(self.biblioteca.archivo_prestamos), 3)
+        historial = self.biblioteca.obtener_historial_usuario("U001")
+        devuelto = historial[0]
+        self.assertEqual((devuelto.id_prestamo, devuelto.isbn_libro, devuelto.estado),
+                         (ids[0], isbns[0], "devuelto"))
+        self.assertIsNotNone(devuelto.fecha_devolucion)
+        self.assertIs(historial[1], self.biblioteca.prestamos_activos[ids[1]])
+        self.assertEqual(self.biblioteca.obtener_info_usuario("U001")['total_prestamos'], 2)
+        self.assertIsNone(self.biblioteca.obtener_info_usuario("U999"))
+        # El usuario del manager cuenta sus préstamos sin pasar por el manager
+        self.assertEqual(usuario.obtener_info_completa()['total_prestamos'], 2)
+        self.assertEqual(self.biblioteca.obtener_usuario_por_id("U002").obtener_info_completa(),
+                         self.biblioteca.obtener_info_usuario("U002"))
+        self.assertEqual(self.biblioteca.obtener_info_usuario("U002")['total_prestamos'], 1)
+        self.assertEqual(self.biblioteca.verificar_estadisticas(), {})
+        usuario.total_prestamos += 1
+        self.assertEqual(self.biblioteca.verificar_estadisticas(),
+                         {'total_prestamos[U001]': (3, 2)})
+        usuario.total_prestamos -= 1
+        
+        # Los usuarios del manager se siguen pudiendo serializar
+        self.assertEqual(pickle.loads(pickle.dumps(usuario)).id_usuario, "U001")
+        
+        historial_libro = self.biblioteca.obtener_historial_libro(isbns[0])
+        self.assertEqual([(p.id_prestamo, p.id_usuario) for p in historial_libro],
+                         [(ids[0], "U001"), (id_nuevo, "U002")])
+        self.assertEqual(len(self.biblioteca.obtener_historial_libro("978-0")), 0)
+        
+        # El historial global se lee del archivo, del más reciente al más antiguo
+        self.assertEqual([p.id_prestamo for p in self.biblioteca.iterar_historial_prestamos()],
+                         [id_nuevo, ids[1], ids[0]])
+        self.assertEqual([p.id_prestamo for p in self.biblioteca.obtener_historial_prestamos(1, 2)],
+                         [ids[0]])
+        # Un desplazamiento negativo se trata como 0
+        self.assertEqual([p.id_prestamo for p in self.biblioteca.obtener_historial_prestamos(5, -2)],
+                         [id_nuevo, ids[1], ids[0]])
+        self.assertEqual(self.biblioteca.verificar_estadisticas(), {})
+        
+        print("✓ Archivo de préstamos: Vistas por usuario, libro e historial global verificadas")
+    
+    def test_archivo_prestamos_en_disco(self):
+        """Prueba que el archivo de préstamos envía las filas antiguas a disco."""
+        print("\n=== PRUEBAS DE ARCHIVO DE PRÉSTAMOS EN DISCO ===")
+        
+        biblioteca = BibliotecaManager(archivo_prestamos=ArchivoPrestamos(filas_en_memoria=2))
+        archivo = biblioteca.archivo_prestamos
+        libros = biblioteca.obtener_todos_los_libros()
+        ids = []
+        for ronda in range(3):
+            for i, libro in enumerate(libros):
+                id_usuario = f"U00{i % 2 + 1}"
+                ids.append(biblioteca.realizar_prestamo(libro.isbn, id_usuario))
+            # Se devuelven todos menos el último, cuya fila queda en disco
+            for id_prestamo in ids[-len(libros):]:
+                if ronda < 2 or id_prestamo != ids[-1]:
+                    biblioteca.devolver_libro(id_prestamo)
+        for libro in libros[:2]:
+            ids.append(biblioteca.realizar_prestamo(libro.isbn, "U003"))
+        
+        # Solo las filas más recientes quedan en memoria
+        self.assertLessEqual(len(archivo.numeros), 2)
+        self.assertEqual(len(archivo), len(ids))
+        self.assertEqual(archivo.filas_en_disco + len(archivo.numeros), len(ids))
+        
+        # Las filas en disco se buscan, se cierran y se reconstruyen
+        id_en_disco = ids[len(libros) * 3 - 1]
+        self.assertLess(archivo.buscar_fila(id_en_disco), archivo.filas_en_disco)
+        self.assertIsNone(archivo.buscar_fila("P999"))
+        self.assertEqual(biblioteca.obtener_historial_prestamos(1, len(ids) - 1)[0].id_prestamo, ids[0])
+        self.assertTrue(biblioteca.devolver_libro(id_en_disco))
+        self.assertEqual(archivo.obtener(archivo.buscar_fila(id_en_disco)).estado, "devuelto")
+        
+        # Las vistas por usuario y por libro recorren las cadenas de filas
+        historial = biblioteca.obtener_historial_usuario("U001")
+        esperados = [id_prestamo for j, id_prestamo in enumerate(ids[:len(libros) * 3])
+                     if (j % len(libros)) % 2 == 0]
+        self.assertEqual([p.id_prestamo for p in historial], esperados)
+        self.assertEqual(biblioteca.obtener_info_usuario("U001")['total_prestamos'], len(esperados))
+        self.assertEqual(len(biblioteca.obtener_historial_libro(libros[0].isbn)), 4)
+        self.assertEqual([p.id_usuario for p in biblioteca.obtener_historial_libro(libros[1].isbn)],
+                         ["U002", "U002", "U002", "U003"])
+        self.assertEqual([p.id_prestamo for p in biblioteca.iterar_historial_prestamos()], ids[::-1])
+        self.assertEqual(biblioteca.verificar_estadisticas(), {})
+        
+        print("✓ Archivo en disco: Volcado por bloques, cierre y cadenas por clave verificados")
+    
+    def test_historial_limitado(self):
+        """Prueba que el historial respeta el límite en orden del más reciente."""
+        print("\n=== PRUEBAS DE HISTORIAL LIMITADO ===")
+        
+        usuario = self.biblioteca.obtener_todos_los_usuarios()[0]
+        ids = [self.biblioteca.realizar_prestamo(libro.isbn, usuario.id_usuario)
+               for libro in self.biblioteca.obtener_todos_los_libros()]
+        
+        historial = self.biblioteca.obtener_historial_prestamos(2)
+        self.assertEqual([p.id_prestamo for p in historial], ids[::-1][:2])
+        self.assertEqual(len(list(self.biblioteca.iterar_historial_prestamos())), len(ids))
+        
+        print("✓ Historial: Límite y orden LIFO verificados")
+    
+    def test_historial_acotado_paginado(self):
+        """Prueba la paginación del historial con una pila acotada."""
+        print("\n=== PRUEBAS DE HISTORIAL ACOTADO ===")
+        
+        biblioteca = BibliotecaManager(historial_prestamos=PilaAcotada(2))
+        usuario = biblioteca.obtener_todos_los_usuarios()[0]
+        ids = [biblioteca.realizar_prestamo(libro.isbn, usuario.id_usuario)
+               for libro in biblioteca.obtener_todos_los_libros()]
+        ids.reverse()
+        
+        self.assertEqual([p.id_prestamo for p in biblioteca.obtener_historial_prestamos(2)], ids[:2])
+        pagina = biblioteca.obtener_historial_prestamos(2, desplazamiento=3)
+        self.assertEqual([p.id_prestamo for p in pagina], ids[3:5])
+        self.assertEqual([p.id_prestamo for p in biblioteca.obtener_historial_prestamos(2, -2)],
+                         ids[:2])
+        
+        # Los préstamos en disco reflejan su estado actual, no el de cuando se volcaron
+        biblioteca.devolver_libro(ids[-1])
+        antiguo = biblioteca.obtener_historial_prestamos(1, desplazamiento=len(ids) - 1)[0]
+        self.assertEqual((antiguo.id_prestamo, antiguo.estado), (ids[-1], "devuelto"))
+        self.assertIs(biblioteca.obtener_historial_prestamos(1)[0],
+                      biblioteca.prestamos_activos[ids[0]])
+        biblioteca.historial_prestamos.cerrar()
+        
+        print("✓ Historial acotado: Páginas recientes y profundas verificadas")
 
 def demostrar_estructuras_datos():
     """
@@ -361,7 +1698,7 @@ def demostrar_estructuras_datos():
     print("DEMOSTRACIÓN DEL USO DE ESTRUCTURAS DE DATOS LINEALES")
     print("="*60)
     
-    biblioteca = BibliotecaManager()
+    biblioteca = BibliotecaManager(historial_prestamos=Pila())
     
     print("\n1. LISTA ENLAZADA (Gestión de Libros)")
     print("-" * 40)